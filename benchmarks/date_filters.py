@@ -0,0 +1,123 @@
+"""
+Compare the plans of date filters wrapping the column in a function against the
+half-open ranges `DAO.apply_filters` builds on `asset_prices`.
+
+Runs against the database configured in `DSN`, `--seed` fills `asset_prices` with
+fake ticks of a single asset spread over the last years first. Needs the indexes
+on `date_added` and `price_date`.
+
+Usage:
+    python -m benchmarks.date_filters --seed 1000000 --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+from datetime import date, timedelta
+
+from sqlalchemy import func, select, text
+from sqlalchemy.sql import Select
+
+from src.app.investments.domain.repository.daos import dao_asset_prices
+from src.app.investments.domain.repository.models import AssetPrice
+from src.core.db import session
+from src.core.utils import deserialize_object
+from src.core.utils.filters import BeforeAfter, DateAdded, MonthlyFilter
+
+from .get_multi_count import SEED_ASSET
+
+
+SEED_PRICES = text(
+    "INSERT INTO asset_prices "
+    "(asset_id, price, price_date, currency, source, date_added) "
+    "SELECT :asset_id, random() * 1000, ts, 'USD', 'bench', ts "
+    "FROM generate_series(1, :rows) AS n, now() - make_interval(mins => n * 5) AS ts"
+)
+
+
+async def seed(rows: int) -> None:
+    async with session() as db:
+        asset_id = (await db.execute(SEED_ASSET)).scalar_one()
+        await db.execute(SEED_PRICES, {"asset_id": asset_id, "rows": rows})
+        await db.commit()
+        await db.execute(text("ANALYZE asset_prices"))
+
+
+def cases(day: date) -> dict[str, tuple[Select, Select]]:
+    """Legacy and current statement of each filter."""
+    base = select(AssetPrice.id)
+    month = day.replace(day=1)
+
+    return {
+        "day": (
+            base.where(func.date(AssetPrice.date_added) == day),
+            dao_asset_prices.apply_filters([DateAdded(date_added=day)], base),
+        ),
+        "week": (
+            base.where(
+                func.date(AssetPrice.date_added) >= day - timedelta(days=6),
+                func.date(AssetPrice.date_added) <= day,
+            ),
+            dao_asset_prices.apply_filters(
+                [BeforeAfter(date_before=day, date_after=day - timedelta(days=6))],
+                base,
+            ),
+        ),
+        "month": (
+            base.where(
+                func.date_trunc("MONTH", AssetPrice.price_date)
+                == func.date_trunc("MONTH", month)
+            ),
+            dao_asset_prices.apply_filters(
+                [MonthlyFilter(field_name="price_date", month=month)], base
+            ),
+        ),
+    }
+
+
+async def explain(statement: Select) -> tuple[str, float]:
+    """Top scan node and execution time (ms) of `statement`."""
+    async with session() as db:
+        connection = await db.connection()
+        compiled = statement.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+        plan = (
+            await connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}"
+            )
+        ).scalar_one()
+
+    if isinstance(plan, str | bytes):
+        plan = deserialize_object(plan)
+
+    node = plan[0]["Plan"]
+    while "Plans" in node and "Scan" not in node["Node Type"]:
+        node = node["Plans"][0]
+
+    return node["Node Type"], plan[0]["Execution Time"]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0, help="rows to insert first")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.seed:
+        await seed(args.seed)
+
+    day = date.today() - timedelta(days=3)
+
+    print(f"{'filter':<8}{'version':<10}{'scan':<20}{'p50 ms':>10}")
+    for name, statements in cases(day).items():
+        for version, statement in zip(("function", "range"), statements):
+            runs = [await explain(statement) for _ in range(args.runs)]
+            p50 = statistics.median(elapsed for _, elapsed in runs)
+            print(f"{name:<8}{version:<10}{runs[0][0]:<20}{p50:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
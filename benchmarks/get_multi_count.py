@@ -0,0 +1,86 @@
+"""
+Compare the count strategies of `DAO.get_multi` on `asset_prices`.
+
+Runs against the database configured in `DSN`, `--seed` fills `asset_prices` with
+fake ticks of a single asset first.
+
+Usage:
+    python -m benchmarks.get_multi_count --seed 1000000 --runs 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+from time import perf_counter
+from typing import get_args
+
+from sqlalchemy import text
+
+from src.app.investments.domain.repository.daos import dao_asset_prices
+from src.core.db import session
+from src.core.types import CountStrategy
+
+
+SEED_ASSET = text(
+    "INSERT INTO investment_assets (symbol, name, asset_type, is_active) "
+    "VALUES ('BENCH', 'Benchmark asset', 'OTHER', true) RETURNING id"
+)
+SEED_PRICES = text(
+    "INSERT INTO asset_prices (asset_id, price, price_date, currency, source) "
+    "SELECT :asset_id, random() * 1000, now() - make_interval(mins => n), 'USD', 'bench' "
+    "FROM generate_series(1, :rows) AS n"
+)
+
+
+async def seed(rows: int) -> int:
+    async with session() as db:
+        asset_id = (await db.execute(SEED_ASSET)).scalar_one()
+        await db.execute(SEED_PRICES, {"asset_id": asset_id, "rows": rows})
+        await db.commit()
+        await db.execute(text("ANALYZE asset_prices"))
+
+    return asset_id
+
+
+async def run(strategy: CountStrategy, runs: int, asset_id: int | None) -> list[float]:
+    where = {"asset_id": asset_id} if asset_id is not None else None
+    timings = []
+
+    for i in range(runs):
+        async with session() as db:
+            start = perf_counter()
+            await dao_asset_prices.get_multi(
+                db,
+                where=where,
+                page=(i % 50) * 100,
+                shows=100,
+                ordering=[("price_date", True)],
+                count_strategy=strategy,
+            )
+            timings.append(perf_counter() - start)
+
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0, help="rows to insert first")
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    asset_id = await seed(args.seed) if args.seed else None
+    # The count cache would hide the cost of `exact` after the first run.
+    dao_asset_prices.count_cache_ttl = 0
+
+    print(f"{'strategy':<12}{'p50 ms':>10}{'p95 ms':>10}")
+    for strategy in get_args(CountStrategy):
+        timings = sorted(await run(strategy, args.runs, asset_id))
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(len(timings) * 0.95) - 1] * 1000
+        print(f"{strategy:<12}{p50:>10.2f}{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
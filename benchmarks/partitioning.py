@@ -0,0 +1,166 @@
+"""
+Compare inserts and range scans of prices in a plain table and in one partitioned by
+month, as `asset_prices` is.
+
+Both tables get the same `--rows` fake prices of `--assets` assets spread over
+`--months`, inserted in batches, in the database configured in `DSN` (tables
+`bench_prices_plain` and `bench_prices_partitioned`, dropped at the end). The scans
+are the ones of the price endpoints: the prices of an asset over a week and the
+daily candles of an asset over a month.
+
+Usage:
+    python -m benchmarks.partitioning --rows 50000000 --months 24 --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+from datetime import date, datetime, timedelta, timezone
+from time import perf_counter
+
+from sqlalchemy import text
+
+from src.core.db import session
+from src.core.db.partitions import create_partitions
+
+
+COLUMNS = """
+    id bigint GENERATED ALWAYS AS IDENTITY,
+    asset_id bigint NOT NULL,
+    price numeric(19, 8) NOT NULL,
+    price_date timestamptz NOT NULL,
+    source varchar,
+    PRIMARY KEY (id, price_date)
+"""
+# Evenly spaced prices over the months, the assets taking turns.
+INSERT = """
+    INSERT INTO {table} (asset_id, price, price_date, source)
+    SELECT n % :assets + 1, 100 + random() * 10,
+        CAST(:start AS timestamptz) + CAST(:span AS interval) * (n::float8 / :rows),
+        'bench'
+    FROM generate_series(:first, :last) AS n
+"""
+WEEK_OF_PRICES = """
+    SELECT price_date, price FROM {table}
+    WHERE asset_id = :asset_id AND price_date >= :start AND price_date < :end
+    ORDER BY price_date
+"""
+MONTH_OF_CANDLES = """
+    SELECT date_bin('1 day', price_date, '2000-01-03'), min(price), max(price), count(*)
+    FROM {table}
+    WHERE asset_id = :asset_id AND price_date >= :start AND price_date < :end
+    GROUP BY 1 ORDER BY 1
+"""
+TABLES = {
+    "plain": "bench_prices_plain",
+    "partitioned": "bench_prices_partitioned",
+}
+
+
+async def create_tables(start: date, months: int) -> None:
+    async with session() as db:
+        await db.execute(text(f"CREATE TABLE {TABLES['plain']} ({COLUMNS})"))
+        await db.execute(
+            text(
+                f"CREATE TABLE {TABLES['partitioned']} ({COLUMNS}) "
+                "PARTITION BY RANGE (price_date)"
+            )
+        )
+        for table in TABLES.values():
+            await db.execute(text(f"CREATE INDEX ON {table} (asset_id, price_date)"))
+        await db.commit()
+
+        await create_partitions(db, TABLES["partitioned"], start, months)
+
+
+async def drop_tables() -> None:
+    async with session() as db:
+        for table in TABLES.values():
+            await db.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        await db.commit()
+
+
+async def insert(table: str, args: argparse.Namespace, start: datetime) -> float:
+    statement = text(INSERT.format(table=table))
+    began = perf_counter()
+
+    async with session() as db:
+        for first in range(0, args.rows, args.batch_size):
+            params = {
+                "assets": args.assets,
+                "rows": args.rows,
+                "start": start,
+                "span": timedelta(days=30 * args.months),
+                "first": first,
+                "last": min(first + args.batch_size, args.rows) - 1,
+            }
+            await db.execute(statement, params)
+            await db.commit()
+
+        await db.execute(text(f"ANALYZE {table}"))
+
+    return perf_counter() - began
+
+
+async def scan(
+    table: str, query: str, span: timedelta, args: argparse.Namespace, start: datetime
+) -> list[float]:
+    statement = text(query.format(table=table))
+    end = start + timedelta(days=30 * args.months) - span
+    # The same ranges for both tables.
+    rng = random.Random(0)
+    timings = []
+
+    async with session() as db:
+        for _ in range(args.runs):
+            since = start + (end - start) * rng.random()
+            params = {
+                "asset_id": rng.randint(1, args.assets),
+                "start": since,
+                "end": since + span,
+            }
+            began = perf_counter()
+            await db.execute(statement, params)
+            timings.append(perf_counter() - began)
+
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--assets", type=int, default=1_000)
+    parser.add_argument("--months", type=int, default=24)
+    parser.add_argument("--batch-size", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await drop_tables()
+    await create_tables(start.date(), args.months + 1)
+
+    try:
+        for name, table in TABLES.items():
+            seconds = await insert(table, args, start)
+            print(f"{name}: {args.rows:,} inserts in {seconds:.1f} s, ", end="")
+            print(f"{args.rows / seconds:,.0f} rows/s")
+
+        for label, query, span in (
+            ("week of prices", WEEK_OF_PRICES, timedelta(weeks=1)),
+            ("month of daily candles", MONTH_OF_CANDLES, timedelta(days=30)),
+        ):
+            for name, table in TABLES.items():
+                timings = await scan(table, query, span, args, start)
+                print(
+                    f"{name}: {label} p50 {statistics.median(timings) * 1000:.2f} ms, "
+                    f"max {max(timings) * 1000:.2f} ms"
+                )
+    finally:
+        await drop_tables()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
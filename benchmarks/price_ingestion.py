@@ -0,0 +1,116 @@
+"""
+Measure the throughput of `PriceIngestionEngine` polling a local stub price API.
+
+The stub answers `GET /prices?symbols=A,B` with a fresh price of every symbol after
+`--latency` ms. Prices go to the database configured in `DSN`, for the active assets
+in it, `--seed` adds that many fake ones first.
+
+Usage:
+    python -m benchmarks.price_ingestion --seed 500 --batch-size 50 --polls 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+from datetime import datetime, timezone
+from time import perf_counter
+from urllib.parse import parse_qs, urlsplit
+
+from sqlalchemy import text
+
+from src.app.investments.application.price_ingestion import (
+    PriceIngestionEngine,
+    ingestion_lag_seconds,
+)
+from src.app.investments.domain.repository.models import PriceSource
+from src.core.db import session
+from src.core.http import http_client
+from src.core.utils.serialization import encode_json
+
+
+SEED_ASSETS = text(
+    "INSERT INTO investment_assets (symbol, name, asset_type, is_active) "
+    "SELECT 'BENCH' || n, 'Benchmark asset ' || n, 'OTHER', true "
+    "FROM generate_series(1, :rows) AS n"
+)
+
+
+async def seed(rows: int) -> None:
+    async with session() as db:
+        await db.execute(SEED_ASSETS, {"rows": rows})
+        await db.commit()
+
+
+def stub_handler(latency: float):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        request_line = (await reader.readline()).decode()
+        while await reader.readline() not in (b"\r\n", b""):
+            pass
+
+        query = parse_qs(urlsplit(request_line.split()[1]).query)
+        now = datetime.now(timezone.utc).isoformat()
+        body = encode_json(
+            [
+                {"symbol": symbol, "price": random.uniform(1, 1000), "timestamp": now}
+                for symbol in query.get("symbols", [""])[0].split(",")
+            ]
+        )
+
+        await asyncio.sleep(latency)
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+        )
+        await writer.drain()
+        writer.close()
+
+    return handle
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seed", type=int, default=0, help="assets to insert first")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests/min")
+    parser.add_argument("--latency", type=float, default=20, help="stub ms")
+    parser.add_argument("--polls", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.seed:
+        await seed(args.seed)
+
+    server = await asyncio.start_server(stub_handler(args.latency / 1000), "127.0.0.1")
+    port = server.sockets[0].getsockname()[1]
+    source = PriceSource(
+        name="benchmark-stub",
+        base_url=f"http://127.0.0.1:{port}",
+        rate_limit=args.rate_limit,
+        config={"batchSize": args.batch_size, "concurrency": args.concurrency},
+    )
+    source.id = 0
+    engine = PriceIngestionEngine()
+    await http_client.start()
+
+    timings = []
+    stored = 0
+    async with server:
+        for _ in range(args.polls):
+            start = perf_counter()
+            stored += await engine.poll(source)
+            timings.append(perf_counter() - start)
+
+        await engine.stop()
+        await http_client.close()
+
+    total = sum(timings)
+    lag = ingestion_lag_seconds.samples()[0][2] if stored else float("nan")
+    print(f"{stored:,} prices in {args.polls} polls, {stored / total:,.0f} prices/s")
+    print(f"poll p50 {statistics.median(timings) * 1000:.2f} ms, lag {lag:.3f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
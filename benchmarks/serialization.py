@@ -0,0 +1,93 @@
+"""
+Compare encoding a page of `asset_prices` entities to a JSON response body the
+`model_validate` way against `json_response`'s precompiled field maps.
+
+Doesn't need a database, the entities are built in memory.
+
+Usage:
+    python -m benchmarks.serialization --rows 1000 --runs 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+from collections.abc import Callable
+from datetime import timedelta
+from decimal import Decimal
+from time import perf_counter
+from typing import Any
+
+from litestar.serialization import encode_json
+
+from src.app.investments.domain.entities.asset_prices import AssetPriceResponse
+from src.app.investments.domain.repository.models import AssetPrice
+from src.core.schema import encoder_for
+from src.core.utils import datetime_now
+
+
+def entities(rows: int) -> list[AssetPrice]:
+    now = datetime_now()
+    prices = []
+
+    for n in range(rows):
+        price = AssetPrice(
+            asset_id=1,
+            price=Decimal(f"{random.uniform(1, 1000):.8f}"),
+            price_date=now - timedelta(minutes=n),
+            currency="USD",
+            source="bench",
+            volume_24h=Decimal(f"{random.uniform(1, 1e9):.2f}"),
+            market_cap=None,
+            date_updated=None,
+        )
+        price.id = n + 1
+        prices.append(price)
+
+    return prices
+
+
+def validated(items: list[AssetPrice]) -> bytes:
+    """What the handlers did: validate every row, then Litestar encodes the models."""
+    return encode_json(
+        [AssetPriceResponse.model_validate(item) for item in items],
+        serializer=lambda model: model.model_dump(mode="json", by_alias=True),
+    )
+
+
+def precompiled(items: list[AssetPrice]) -> bytes:
+    return encoder_for(AssetPriceResponse).encode_many(items)
+
+
+def timings(encode: Callable[[list[AssetPrice]], Any], items, runs: int) -> list[float]:
+    result = []
+
+    for _ in range(runs):
+        start = perf_counter()
+        encode(items)
+        result.append(perf_counter() - start)
+
+    return sorted(result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000, help="entities per body")
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+
+    items = entities(args.rows)
+
+    print(f"{'path':<14}{'p50 ms':>10}{'p95 ms':>10}{'rows/s':>14}")
+    for name, encode in (("validate", validated), ("precompiled", precompiled)):
+        runs = timings(encode, items, args.runs)
+        p50 = statistics.median(runs)
+        p95 = runs[int(len(runs) * 0.95) - 1]
+        print(
+            f"{name:<14}{p50 * 1000:>10.2f}{p95 * 1000:>10.2f}{args.rows / p50:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Compare the `isinstance` chain `serialize_object` used as orjson's `default` hook
+against the type dispatched one, encoding a `PortfolioSnapshot.snapshot_data` payload.
+
+Doesn't need a database, the payload is built in memory. Decoding is timed from a
+`str`, as the text round trip did, and from the `bytes` and `memoryview` asyncpg gives.
+
+Usage:
+    python -m benchmarks.snapshot_data --assets 200 --runs 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from decimal import Decimal
+from time import perf_counter
+from typing import Any
+from uuid import UUID, uuid4
+
+import orjson
+from pydantic import BaseModel
+
+from src.app.investments.domain.entities.portfolio_snapshots import (
+    AssetAllocation,
+    PortfolioPerformance,
+    PortfolioSnapshot,
+)
+from src.core.utils import datetime_now, deserialize_object, encode_json
+from src.core.utils.serialization import add_timezone_to_datetime
+
+
+PERIODS = ("1d", "1w", "1m", "3m", "6m", "1y", "ytd", "all")
+
+
+def _legacy_serialize(value: Any) -> str:
+    """The hook before the type dispatch, asyncpg's UUID aside."""
+    if isinstance(value, BaseModel):
+        return value.model_dump_json(by_alias=True)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return add_timezone_to_datetime(value)
+
+    try:
+        val = str(value)
+    except Exception as exc:
+        raise TypeError from exc
+    else:
+        return val
+
+
+def legacy(obj: Any) -> bytes:
+    return orjson.dumps(
+        obj,
+        default=_legacy_serialize,
+        option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+def _money() -> Decimal:
+    return Decimal(f"{random.uniform(1, 100_000):.2f}")
+
+
+def _ratio() -> Decimal:
+    return Decimal(f"{random.uniform(-50, 50):.4f}")
+
+
+def payload(assets: int) -> dict[str, Any]:
+    """What a snapshot stores: the snapshot itself plus positions and performance."""
+    now = datetime_now()
+    snapshot = PortfolioSnapshot(
+        user_id=str(uuid4()),
+        snapshot_date=now,
+        total_value=_money(),
+        cash_balance=_money(),
+        invested_amount=_money(),
+        total_return=_money(),
+        return_percentage=_ratio(),
+        annualized_return=_ratio(),
+        asset_allocations=[
+            AssetAllocation(
+                asset_id=n,
+                allocation_percentage=_ratio(),
+                current_value=_money(),
+            )
+            for n in range(assets)
+        ],
+        performance_data={
+            period: PortfolioPerformance(
+                time_period=period,
+                return_percentage=_ratio(),
+                absolute_return=_money(),
+                benchmark_return=_ratio(),
+                benchmark_symbol="SPY",
+            )
+            for period in PERIODS
+        },
+        risk_metrics={"volatility": _ratio(), "sharpe": _ratio(), "beta": _ratio()},
+        currency="USD",
+    )
+
+    return {
+        **snapshot.model_dump(),
+        "positions": [
+            {
+                "asset_id": n,
+                "quantity": _money(),
+                "average_price": _money(),
+                "last_price": _money(),
+                "last_price_date": now - timedelta(minutes=n),
+                "lots": [{"id": uuid4(), "quantity": _money()} for _ in range(3)],
+            }
+            for n in range(assets)
+        ],
+    }
+
+
+def p50(call: Callable[[], Any], runs: int) -> float:
+    timings = []
+
+    for _ in range(runs):
+        start = perf_counter()
+        call()
+        timings.append(perf_counter() - start)
+
+    return statistics.median(timings) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--assets", type=int, default=100, help="positions per payload")
+    parser.add_argument("--runs", type=int, default=1000)
+    args = parser.parse_args()
+
+    data = payload(args.assets)
+    encoded = encode_json(data)
+    print(f"payload: {len(encoded):,} bytes")
+
+    cases = {
+        "encode isinstance": lambda: legacy(data),
+        "encode dispatch": lambda: encode_json(data),
+        "encode float": lambda: encode_json(data, decimals="float"),
+        "decode str": lambda: deserialize_object(encoded.decode()),
+        "decode bytes": lambda: deserialize_object(encoded),
+        "decode memoryview": lambda: deserialize_object(memoryview(encoded)),
+    }
+
+    print(f"{'case':<20}{'p50 us':>10}")
+    for name, call in cases.items():
+        print(f"{name:<20}{p50(call, args.runs):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare decoding `timestamptz` values with the codecs set on connect: the `text` one
+(`fromisoformat` and `astimezone`), the first `tuple` one and the current
+`timestamptz_codec`.
+
+Doesn't need a database, the values are built in memory the way asyncpg hands them
+to each codec.
+
+Usage:
+    python -m benchmarks.timestamptz --rows 1000000 --tz Europe/Madrid
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone, tzinfo
+from time import perf_counter
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from src.core.constants import TZ
+from src.core.db.session import timestamptz_codec
+
+
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def text_decoder(tz: tzinfo) -> Callable[[str], datetime]:
+    return lambda x: datetime.fromisoformat(x).astimezone(tz)
+
+
+def tuple_decoder(tz: tzinfo) -> Callable[[tuple[int]], datetime]:
+    def decoder(v: tuple[int]) -> datetime:
+        return (_PG_EPOCH + timedelta(microseconds=v[0])).astimezone(tz)
+
+    return decoder
+
+
+def elapsed(decoder: Callable[[Any], datetime], values: list[Any]) -> float:
+    start = perf_counter()
+    for value in values:
+        decoder(value)
+
+    return perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--tz", default=None, help="IANA name, `TZ` by default")
+    args = parser.parse_args()
+
+    tz = ZoneInfo(args.tz) if args.tz else TZ
+    # Ticks spread over the last 25 years, both sides of every DST change.
+    microseconds = [
+        (random.randrange(0, 25 * 365 * 86_400 * 10**6),) for _ in range(args.rows)
+    ]
+    texts = [
+        (_PG_EPOCH + timedelta(microseconds=v[0])).isoformat() for v in microseconds
+    ]
+
+    _, decoder = timestamptz_codec(tz)
+    previous = tuple_decoder(tz)
+    cases = (
+        ("text", text_decoder(tz), texts),
+        ("tuple", previous, microseconds),
+        ("codec", decoder, microseconds),
+    )
+
+    for value in microseconds[:10_000]:
+        assert decoder(value).isoformat() == previous(value).isoformat(), value
+
+    print(f"{args.rows:,} values in {tz}")
+    print(f"{'codec':<8}{'total s':>10}{'ns/value':>12}")
+    for name, decode, values in cases:
+        total = elapsed(decode, values)
+        print(f"{name:<8}{total:>10.2f}{total / args.rows * 1e9:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+from src.app.banks.application.balance_history_cases import sync_balance_history
+from src.app.banks.application.movements_cases import import_bank_movements
+
+
+__all__ = [
+    # Balance History
+    "sync_balance_history",
+    # Bank Movements
+    "import_bank_movements",
+]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from src.app.banks.domain.entities import BalanceHistoryCreate
+from src.app.banks.domain.repository.daos import dao_balance_history
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.core.db.bulk import UpsertResult
+
+
+async def sync_balance_history(
+    db: AsyncSession,
+    balances: Iterable[BalanceHistoryCreate | dict[str, Any]],
+) -> UpsertResult:
+    """
+    Insert or update daily balances keyed by `(account_id, balance_date)`, so the
+    nightly re-sync of an account is a single pass.
+
+    Args:
+        db: The database session
+        balances: The balances to sync
+
+    Returns:
+        How many balances were inserted, updated or left unchanged
+    """
+    result = await dao_balance_history.upsert_many(
+        db,
+        objs_in=balances,
+        conflict_columns=["account_id", "balance_date"],
+    )
+    return result
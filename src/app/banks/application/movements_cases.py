@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from src.app.banks.domain.entities import BankMovementCreate
+from src.app.banks.domain.repository.daos import dao_bank_movements
+
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def import_bank_movements(
+    db: AsyncSession,
+    movements: Iterable[BankMovementCreate | dict[str, Any]],
+    trusted: bool = False,
+) -> list[int]:
+    """
+    Bulk load the movements of a bank statement through `COPY`.
+
+    Args:
+        db: The database session
+        movements: The movements of the statement, consumed lazily
+        trusted: Skip the validation of dict rows coming from internal sources
+
+    Returns:
+        The ids of the created movements, in the order they were given
+    """
+    result = await dao_bank_movements.bulk_create(
+        db, objs_in=movements, validate=not trusted, return_ids=True
+    )
+    return result
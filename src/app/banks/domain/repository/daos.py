@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 from src.app.banks.domain.entities import (
     AccountCreate,
     AccountLinkCreate,
@@ -11,6 +13,7 @@ from src.app.banks.domain.entities import (
     InstitutionUpdate,
 )
 from src.core.db import DAO
+from src.core.db.search import FullTextSearch, SearchBackend, TrigramSearch
 
 from .models import (
     AccountLink,
@@ -24,7 +27,7 @@ from .models import (
 class DAOFinancialInstitution(
     DAO[FinancialInstitution, InstitutionCreate, InstitutionUpdate]
 ):
-    pass
+    entity_cache_ttl = 300
 
 
 class DAOInstitutionAccount(DAO[InstitutionAccount, AccountCreate, AccountUpdate]):
@@ -32,7 +35,12 @@ class DAOInstitutionAccount(DAO[InstitutionAccount, AccountCreate, AccountUpdate
 
 
 class DAOBankMovement(DAO[BankMovement, BankMovementCreate, BankMovementUpdate]):
-    pass
+    count_cache_ttl = 5
+    search_fields: ClassVar[dict[str, SearchBackend]] = {
+        "description": FullTextSearch(),
+        "merchant_name": TrigramSearch(),
+        "reference": TrigramSearch(),
+    }
 
 
 class DAOBalanceHistory(
@@ -3,11 +3,21 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Numeric, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Numeric,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, MappedAsDataclass, mapped_column, relationship
 
 from src.core.db import Base, Date
+from src.core.db.search import search_index, search_vector, trigram_index
 
 
 if TYPE_CHECKING:
@@ -130,7 +140,7 @@ class BankMovement(MappedAsDataclass, Base, Date, kw_only=True):
 
     # Movement details
     amount: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=2))
-    date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    date: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Balance information
@@ -151,6 +161,7 @@ class BankMovement(MappedAsDataclass, Base, Date, kw_only=True):
         JSONB, nullable=True
     )  # Original transaction data
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    search_vector: Mapped[str | None] = search_vector("description", "merchant_name")
 
     # Relationships
     account: Mapped["InstitutionAccount"] = relationship(
@@ -162,6 +173,12 @@ class BankMovement(MappedAsDataclass, Base, Date, kw_only=True):
         viewonly=True,
     )
 
+    __table_args__ = (
+        search_index("bank_movements"),
+        trigram_index("bank_movements", "merchant_name"),
+        trigram_index("bank_movements", "reference"),
+    )
+
 
 class BalanceHistory(MappedAsDataclass, Base, Date, kw_only=True):
     """Historical balance records for accounts"""
@@ -184,6 +201,9 @@ class BalanceHistory(MappedAsDataclass, Base, Date, kw_only=True):
     # Account relationship
     account: Mapped["InstitutionAccount"] = relationship("InstitutionAccount")
 
+    # One balance per account and day, target of the upserts.
+    __table_args__ = (UniqueConstraint("account_id", "balance_date"),)
+
 
 class AccountLink(MappedAsDataclass, Base, Date, kw_only=True):
     """Secure credentials and connection details for account sync"""
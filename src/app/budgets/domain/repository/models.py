@@ -191,7 +191,7 @@ class BudgetExpense(MappedAsDataclass, Base, BaseDate, kw_only=True):
     amount: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=2))
     currency: Mapped[str] = mapped_column(String(3), default="USD")
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    expense_date: Mapped[date] = mapped_column(Date)
+    expense_date: Mapped[date] = mapped_column(Date, index=True)
 
     # Classification
     is_planned: Mapped[bool] = mapped_column(
@@ -6,10 +6,19 @@ from src.app.investments.application.asset_holdings_cases import (
     update_asset_holding,
 )
 from src.app.investments.application.asset_prices_cases import (
+    PriceRangeError,
     create_asset_price,
+    create_asset_prices,
     get_asset_price,
     get_asset_prices,
+    get_asset_prices_by_cursor,
+    get_latest_prices,
+    get_price_candles,
+    get_price_series,
+    partition_asset_prices,
+    refresh_latest_prices,
     remove_asset_price,
+    sync_asset_prices,
     update_asset_price,
 )
 from src.app.investments.application.assets_cases import (
@@ -38,9 +47,18 @@ __all__ = [
     # Asset Prices
     "get_asset_price",
     "get_asset_prices",
+    "get_asset_prices_by_cursor",
+    "get_latest_prices",
+    "get_price_candles",
+    "get_price_series",
+    "refresh_latest_prices",
+    "partition_asset_prices",
     "create_asset_price",
+    "create_asset_prices",
     "update_asset_price",
     "remove_asset_price",
+    "sync_asset_prices",
+    "PriceRangeError",
     # Asset Benchmarks
     "get_asset_benchmark",
     "get_asset_benchmarks",
@@ -1,17 +1,53 @@
 from __future__ import annotations
 
+from contextlib import aclosing
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
+from sqlalchemy import text
+
+from src.app.investments.application.price_maintenance import retention_cutoff
 from src.app.investments.domain.entities.asset_prices import (
     AssetPrice,
     AssetPriceCreate,
+    AssetPriceResponse,
     AssetPriceUpdate,
+    CandleInterval,
 )
 from src.app.investments.domain.repository.daos import dao_asset_prices
+from src.app.investments.domain.repository.models import (
+    REFRESH_LATEST_PRICES,
+    DailyAssetPrice,
+    LatestAssetPrice,
+)
+from src.core.constants import TZ
+from src.core.db.partitions import partition_table
+from src.core.types import EMPTY
+from src.core.utils.downsampling import LTTB
 
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+    from sqlalchemy.engine import Row
     from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import Session
+
+    from src.core.db.bulk import UpsertResult
+
+
+CANDLE_INTERVALS: dict[CandleInterval, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+    "1w": timedelta(weeks=1),
+}
+MAX_CANDLES = 10_000
+
+
+class PriceRangeError(ValueError):
+    """The requested range of prices is empty or too long for its interval."""
 
 
 async def get_asset_price(db: AsyncSession, price_id: int) -> AssetPrice:
@@ -34,7 +70,7 @@ async def get_asset_prices(
     page: int = 1,
     shows: int = 100,
     filters: dict[str, Any] | None = None,
-) -> list[AssetPrice]:
+) -> tuple[list[AssetPrice], int | None]:
     """
     Retrieve multiple asset prices with pagination and filtering.
 
@@ -45,18 +81,199 @@ async def get_asset_prices(
         filters: Optional filters to apply to the query
 
     Returns:
-        A list of asset prices matching the criteria
+        The asset prices of the page and the total of them matching the criteria
     """
-    data = await dao_asset_prices.get_multi(
+    data, total = await dao_asset_prices.get_multi(
         db,
         where=filters,
         page=(page - 1) * shows,
         shows=shows,
+        fields=AssetPriceResponse,
+        count_strategy="window",
     )
 
+    return ([] if data is EMPTY else data), total
+
+
+async def get_asset_prices_by_cursor(
+    db: AsyncSession,
+    cursor: str | None = None,
+    shows: int = 100,
+    filters: dict[str, Any] | None = None,
+) -> tuple[list[AssetPrice], str | None]:
+    """
+    Retrieve asset prices with keyset pagination, newest first.
+
+    Args:
+        db: The database session
+        cursor: The cursor returned with the previous page, `None` for the first one
+        shows: The number of items per page
+        filters: Optional filters to apply to the query
+
+    Returns:
+        The asset prices of the page and the cursor of the next page
+    """
+    data, next_cursor = await dao_asset_prices.get_multi_by_cursor(
+        db,
+        where=filters,
+        cursor=cursor,
+        shows=shows,
+        fields=AssetPriceResponse,
+        ordering=[("price_date", True)],
+    )
+
+    return ([] if data is EMPTY else data), next_cursor
+
+
+async def get_latest_prices(
+    db: AsyncSession, asset_ids: Iterable[int]
+) -> dict[int, Row[Any]]:
+    """
+    Retrieve the current price of many assets at once, e.g. to value a portfolio.
+
+    Args:
+        db: The database session
+        asset_ids: The IDs of the assets
+
+    Returns:
+        The latest price of each asset that has any, by asset ID
+    """
+    data = await dao_asset_prices.get_latest(db, asset_ids)
     return data
 
 
+async def get_price_candles(
+    db: AsyncSession,
+    asset_id: int,
+    interval: CandleInterval,
+    start: datetime,
+    end: datetime,
+    source: str | None = None,
+) -> list[Row[Any]]:
+    """
+    Retrieve the OHLC candles of an asset, e.g. for a candlestick chart.
+
+    Args:
+        db: The database session
+        asset_id: The ID of the asset
+        interval: The time span of each candle
+        start: The start of the range, included
+        end: The end of the range, excluded
+        source: Only the prices of this source, all of them by default
+
+    Returns:
+        The candles of the range that have prices, oldest first
+    """
+    step = CANDLE_INTERVALS[interval]
+    start, end = _aware(start), _aware(end)
+
+    if end <= start:
+        raise PriceRangeError("The end must be after the start.")
+    if (end - start) / step > MAX_CANDLES:
+        raise PriceRangeError(
+            f"More than {MAX_CANDLES} candles, use a longer interval."
+        )
+
+    # Daily and longer candles are also built from the daily rollups, past the
+    # retention of the raw prices.
+    rollups_before = retention_cutoff() if step >= timedelta(days=1) else None
+
+    data = await dao_asset_prices.get_candles(
+        db, asset_id, step, start, end, source=source, rollups_before=rollups_before
+    )
+    return data
+
+
+async def get_price_series(
+    db: AsyncSession,
+    asset_id: int,
+    start: datetime,
+    end: datetime,
+    points: int = 500,
+    source: str | None = None,
+) -> list[Row[Any]]:
+    """
+    Retrieve the prices of an asset downsampled to at most `points` with LTTB, e.g.
+    for a line chart, whatever the length of the range.
+
+    Args:
+        db: The database session
+        asset_id: The ID of the asset
+        start: The start of the range, included
+        end: The end of the range, excluded
+        points: The maximum number of prices to return
+        source: Only the prices of this source, all of them by default
+
+    Returns:
+        The `(price_date, price)` rows kept, oldest first
+    """
+    start, end = _aware(start), _aware(end)
+
+    if end <= start:
+        raise PriceRangeError("The end must be after the start.")
+
+    sampler = LTTB(
+        points,
+        start.timestamp(),
+        end.timestamp(),
+        x=lambda row: row.price_date.timestamp(),
+        y=lambda row: float(row.price),
+    )
+
+    async with aclosing(
+        dao_asset_prices.stream_prices(db, asset_id, start, end, source=source)
+    ) as rows:
+        async for row in rows:
+            sampler.add(row)
+
+    return sampler.result()
+
+
+async def refresh_latest_prices(db: AsyncSession) -> None:
+    """
+    Rebuild `latest_asset_prices` from the whole price history, only needed for
+    prices stored before its triggers existed.
+
+    Args:
+        db: The database session
+    """
+    await db.execute(text(REFRESH_LATEST_PRICES))
+    await db.commit()
+
+
+async def partition_asset_prices(db: AsyncSession) -> int:
+    """
+    Move the prices of a database created before `asset_prices` was partitioned by
+    month into the partitioned table, see `partition_table`. Run it once, in a
+    maintenance window, and restart the app afterwards.
+
+    Databases that old miss `daily_asset_prices`, `latest_asset_prices` and the
+    triggers keeping the latter too: the tables are created first (the triggers
+    come with the new `asset_prices`) and the latest prices rebuilt, all in the
+    same transaction.
+
+    Args:
+        db: The database session
+
+    Returns:
+        The number of moved asset prices
+    """
+
+    def create_tables(session: Session) -> None:
+        for model in (DailyAssetPrice, LatestAssetPrice):
+            model.__table__.create(session.connection(), checkfirst=True)
+
+    await db.run_sync(create_tables)
+
+    moved = await partition_table(
+        db, dao_asset_prices.model.__table__, "price_date", commit=False
+    )
+    await db.execute(text(REFRESH_LATEST_PRICES))
+    await db.commit()
+
+    return moved
+
+
 async def create_asset_price(
     db: AsyncSession, obj_in: AssetPriceCreate
 ) -> AssetPrice | None:
@@ -74,6 +291,51 @@ async def create_asset_price(
     return result
 
 
+async def create_asset_prices(
+    db: AsyncSession,
+    objs_in: Iterable[AssetPriceCreate | dict[str, Any]],
+    trusted: bool = False,
+) -> int:
+    """
+    Bulk load asset prices (e.g. a price feed window) through `COPY`.
+
+    Args:
+        db: The database session
+        objs_in: The asset prices to create, consumed lazily
+        trusted: Skip the validation of dict rows coming from internal sources
+
+    Returns:
+        The number of created asset prices
+    """
+    result = await dao_asset_prices.bulk_create(
+        db, objs_in=objs_in, validate=not trusted
+    )
+    return result
+
+
+async def sync_asset_prices(
+    db: AsyncSession,
+    objs_in: Iterable[AssetPriceCreate | dict[str, Any]],
+) -> UpsertResult:
+    """
+    Insert or update asset prices keyed by `(asset_id, price_date, source)`, so
+    re-importing an overlapping price window is idempotent.
+
+    Args:
+        db: The database session
+        objs_in: The asset prices to sync
+
+    Returns:
+        How many prices were inserted, updated or left unchanged
+    """
+    result = await dao_asset_prices.upsert_many(
+        db,
+        objs_in=objs_in,
+        conflict_columns=["asset_id", "price_date", "source"],
+    )
+    return result
+
+
 async def update_asset_price(
     db: AsyncSession,
     price_id: int,
@@ -106,3 +368,8 @@ async def remove_asset_price(db: AsyncSession, price_id: int) -> None:
     await dao_asset_prices.delete(db, asset_price)
 
     return
+
+
+def _aware(date: datetime) -> datetime:
+    # Naive datetimes are in the app timezone, as everywhere else.
+    return date if date.tzinfo is not None else date.replace(tzinfo=TZ)
@@ -2,8 +2,14 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
-from src.app.investments.domain.entities.assets import Asset, AssetCreate, AssetUpdate
+from src.app.investments.domain.entities.assets import (
+    Asset,
+    AssetCreate,
+    AssetResponse,
+    AssetUpdate,
+)
 from src.app.investments.domain.repository.daos import dao_assets
+from src.core.types import EMPTY
 
 
 if TYPE_CHECKING:
@@ -30,7 +36,7 @@ async def get_assets(
     page: int = 1,
     shows: int = 100,
     filters: dict[str, Any] | None = None,
-) -> list[Asset]:
+) -> tuple[list[Asset], int | None]:
     """
     Retrieve multiple assets with pagination and filtering.
 
@@ -41,16 +47,17 @@ async def get_assets(
         filters: Optional filters to apply to the query
 
     Returns:
-        A list of assets matching the criteria
+        The assets of the page and the total of them matching the criteria
     """
-    data = await dao_assets.get_multi(
+    data, total = await dao_assets.get_multi(
         db,
         where=filters,
         page=(page - 1) * shows,
         shows=shows,
+        fields=AssetResponse,
     )
 
-    return data
+    return ([] if data is EMPTY else data), total
 
 
 async def create_asset(db: AsyncSession, obj_in: AssetCreate) -> Asset | None:
@@ -5,9 +5,11 @@ from typing import TYPE_CHECKING, Any
 from src.app.investments.domain.entities.benchmarks import (
     AssetBenchmark,
     AssetBenchmarkCreate,
+    AssetBenchmarkResponse,
     AssetBenchmarkUpdate,
 )
 from src.app.investments.domain.repository.daos import dao_asset_benchmarks
+from src.core.types import EMPTY
 
 
 if TYPE_CHECKING:
@@ -34,7 +36,7 @@ async def get_asset_benchmarks(
     page: int = 1,
     shows: int = 100,
     filters: dict[str, Any] | None = None,
-) -> list[AssetBenchmark]:
+) -> tuple[list[AssetBenchmark], int | None]:
     """
     Retrieve multiple asset benchmarks with pagination and filtering.
 
@@ -45,16 +47,17 @@ async def get_asset_benchmarks(
         filters: Optional filters to apply to the query
 
     Returns:
-        A list of asset benchmarks matching the criteria
+        The asset benchmarks of the page and the total of them matching the criteria
     """
-    data = await dao_asset_benchmarks.get_multi(
+    data, total = await dao_asset_benchmarks.get_multi(
         db,
         where=filters,
         page=(page - 1) * shows,
         shows=shows,
+        fields=AssetBenchmarkResponse,
     )
 
-    return data
+    return ([] if data is EMPTY else data), total
 
 
 async def create_asset_benchmark(
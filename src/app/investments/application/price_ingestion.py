@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any
+
+from httpx import AsyncClient, HTTPError
+
+from src.app.investments.application.asset_prices_cases import (
+    create_asset_prices,
+    sync_asset_prices,
+)
+from src.app.investments.domain.repository.daos import dao_assets, dao_price_sources
+from src.core.db import session
+from src.core.db.bulk import chunked
+from src.core.db.exceptions import DatabaseConstraintError
+from src.core.http import INTEGRATION, http_client
+from src.core.metrics import LATENCY_BUCKETS, registry
+from src.core.types import MISSING
+from src.core.utils.rate_limit import TokenBucket
+from src.core.utils.serialization import deserialize_object
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.app.investments.domain.repository.models import PriceSource
+
+
+logger = logging.getLogger(__name__)
+
+prices_ingested = registry.counter(
+    "price_ingestion_prices", "Prices stored by the ingestion engine."
+)
+ingestion_requests = registry.counter(
+    "price_ingestion_requests", "Requests made to the price sources, by outcome."
+)
+poll_seconds = registry.histogram(
+    "price_ingestion_poll_seconds",
+    "Time of a whole poll of a source, fetching and storing included.",
+    LATENCY_BUCKETS,
+)
+ingestion_lag_seconds = registry.gauge(
+    "price_ingestion_lag_seconds",
+    "Age of the newest price stored from the source at the end of its last poll.",
+)
+
+# Keys of the price items, by `AssetPrice` column, `SourceConfig.fields` overrides.
+_FIELDS = {
+    "symbol": "symbol",
+    "price": "price",
+    "price_date": "timestamp",
+    "currency": "currency",
+    "volume_24h": "volume_24h",
+    "market_cap": "market_cap",
+}
+# `PriceSource.config` is written through the camelCase API.
+_CONFIG_KEYS = {
+    "batchSize": "batch_size",
+    "symbolsParam": "symbols_param",
+    "itemsPath": "items_path",
+    "apiKeyHeader": "api_key_header",
+}
+
+
+@dataclass(frozen=True)
+class SourceConfig:
+    """
+    How to query a price source, read from `PriceSource.config`, e.g.
+    `{"endpoint": "/v1/quotes", "batchSize": 50, "itemsPath": "data"}`.
+
+    Requests are `GET {base_url}{endpoint}?{symbols_param}=A,B,C` with up to
+    `batch_size` symbols. The items are found at `items_path` (dotted) of the JSON
+    response, either a list of objects or an object keyed by symbol, and `fields`
+    maps the `AssetPrice` columns to the keys of each item.
+    """
+
+    endpoint: str = "/prices"
+    symbols_param: str = "symbols"
+    separator: str = ","
+    batch_size: int = 1
+    # Requests of a poll in flight at once, the rate limit applies on top.
+    concurrency: int = 4
+    items_path: str | None = None
+    currency: str = "USD"
+    api_key_header: str = "X-API-Key"
+    fields: dict[str, str] = field(default_factory=lambda: dict(_FIELDS))
+
+    @classmethod
+    def from_source(cls, source: PriceSource) -> SourceConfig:
+        config = {}
+
+        for key, value in (source.config or {}).items():
+            key = _CONFIG_KEYS.get(key, key)
+            if key in cls.__dataclass_fields__:
+                config[key] = value
+
+        config["fields"] = {**_FIELDS, **config.get("fields", {})}
+
+        return cls(**config)
+
+    def items(self, payload: Any) -> Iterator[dict[str, Any]]:
+        for key in self.items_path.split(".") if self.items_path else ():
+            payload = payload.get(key) if isinstance(payload, dict) else None
+
+        if isinstance(payload, list):
+            yield from (item for item in payload if isinstance(item, dict))
+        elif isinstance(payload, dict):
+            symbol = self.fields["symbol"]
+            for key, item in payload.items():
+                if isinstance(item, dict):
+                    yield {symbol: key, **item}
+
+
+class PriceIngestionEngine:
+    """
+    Polls every active `PriceSource` on its own `update_frequency`, fetching the
+    prices of the active assets it supports in batches of symbols, at most
+    `rate_limit` requests per minute, and stores them through `COPY`.
+
+    Each source runs in its own task, re-reading the source before every poll, so
+    deactivating it stops its task and configuration changes apply on the next poll.
+    Sources activated later are picked up every `refresh_interval` seconds.
+
+    Requests go through the shared `http_client` unless a `client` is given, with
+    its retries and circuit breakers, labelled `price_source:{name}` in its metrics.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient | None = None,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = session,
+        default_frequency: float = 60,
+        refresh_interval: float = 60,
+    ) -> None:
+        self._client = client
+        self._session = session_factory
+        self.default_frequency = default_frequency
+        self.refresh_interval = refresh_interval
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+        self._supervisor: asyncio.Task[None] | None = None
+        self._buckets: dict[int, TokenBucket] = {}
+        # Newest price stored per `(source id, asset id)`, older ones are dropped.
+        self._latest: dict[tuple[int, int], datetime] = {}
+
+    @property
+    def client(self) -> AsyncClient:
+        return self._client or http_client.client("price_sources")
+
+    async def start(self) -> None:
+        if self._supervisor is None:
+            await self.refresh()
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        tasks = [*self._tasks.values(), *filter(None, [self._supervisor])]
+        for task in tasks:
+            task.cancel()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._supervisor = None
+
+    async def refresh(self) -> None:
+        """Start polling the active sources that aren't polled yet."""
+        async with self._session() as db:
+            sources = [
+                source
+                async for source in dao_price_sources.stream(
+                    db, where={"is_active": True}, columns=["id", "name"]
+                )
+            ]
+
+        for source in sources:
+            task = self._tasks.get(source.id)
+            if task is None or task.done():
+                self._tasks[source.id] = asyncio.create_task(
+                    self._run(source.id), name=f"price-ingestion-{source.name}"
+                )
+
+    async def _supervise(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Couldn't refresh the price sources")
+
+    async def _run(self, source_id: int) -> None:
+        next_poll = monotonic()
+
+        while True:
+            async with self._session() as db:
+                source = await dao_price_sources.get(db, source_id)
+
+            if source is MISSING or not source.is_active:
+                return
+
+            try:
+                await self.poll(source)
+            except Exception:
+                logger.exception("Polling the price source %s failed", source.name)
+
+            # Missed polls are skipped, not run back to back to catch up.
+            next_poll = max(
+                next_poll + (source.update_frequency or self.default_frequency),
+                monotonic(),
+            )
+            await asyncio.sleep(next_poll - monotonic())
+
+    async def poll(self, source: PriceSource) -> int:
+        """Fetch and store the prices of `source` once, returns the prices stored."""
+        start = perf_counter()
+        config = SourceConfig.from_source(source)
+        assets = await self._assets(source)
+        semaphore = asyncio.Semaphore(config.concurrency)
+
+        batches = await asyncio.gather(
+            *(
+                self._fetch(source, config, symbols, semaphore)
+                for symbols in chunked(assets, config.batch_size)
+            )
+        )
+        rows = self._rows(source, config, assets, batches)
+        stored = await self._store(rows) if rows else 0
+
+        # Only once stored, prices that couldn't be are fetched again next poll.
+        for row in rows:
+            self._latest[(source.id, row["asset_id"])] = row["price_date"]
+
+        prices_ingested.inc(stored, source=source.name)
+        poll_seconds.observe(perf_counter() - start, source=source.name)
+        self._report_lag(source)
+
+        return stored
+
+    async def _assets(self, source: PriceSource) -> dict[str, int]:
+        """Ids of the assets to poll, by the symbol the source knows them by."""
+        supported = set(source.supported_asset_types or ())
+        mappings = source.asset_mappings or {}
+
+        async with self._session() as db:
+            return {
+                str(mappings.get(asset.symbol, asset.symbol)): asset.id
+                async for asset in dao_assets.stream(
+                    db,
+                    where={"is_active": True},
+                    columns=["id", "symbol", "asset_type"],
+                )
+                if not supported or asset.asset_type.value in supported
+            }
+
+    def _bucket(self, source: PriceSource) -> TokenBucket | None:
+        if not source.rate_limit:
+            return None
+
+        bucket = self._buckets.get(source.id)
+        if bucket is None or bucket.capacity != source.rate_limit:
+            bucket = self._buckets[source.id] = TokenBucket.per_minute(
+                source.rate_limit
+            )
+
+        return bucket
+
+    async def _fetch(
+        self,
+        source: PriceSource,
+        config: SourceConfig,
+        symbols: list[str],
+        semaphore: asyncio.Semaphore,
+    ) -> list[dict[str, Any]]:
+        headers = {config.api_key_header: source.api_key} if source.api_key else None
+
+        if (bucket := self._bucket(source)) is not None:
+            await bucket.acquire()
+
+        async with semaphore:
+            try:
+                response = await self.client.get(
+                    f"{source.base_url.rstrip('/')}{config.endpoint}",
+                    params={config.symbols_param: config.separator.join(symbols)},
+                    headers=headers,
+                    extensions={INTEGRATION: f"price_source:{source.name}"},
+                )
+                response.raise_for_status()
+                items = list(config.items(deserialize_object(response.content)))
+            except (HTTPError, ValueError) as e:
+                ingestion_requests.inc(source=source.name, outcome="error")
+                logger.warning("Request to %s failed: %r", source.name, e)
+                return []
+
+        ingestion_requests.inc(source=source.name, outcome="ok")
+        return items
+
+    def _rows(
+        self,
+        source: PriceSource,
+        config: SourceConfig,
+        assets: dict[str, int],
+        batches: Iterable[list[dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """The prices newer than the last stored of each asset, as `COPY` rows."""
+        fields = config.fields
+        fetched_at = datetime.now(timezone.utc)
+        rows: dict[tuple[int, int], dict[str, Any]] = {}
+
+        for item in (item for batch in batches for item in batch):
+            asset_id = assets.get(str(item.get(fields["symbol"])))
+            price = item.get(fields["price"])
+            if asset_id is None or price is None:
+                continue
+
+            try:
+                price_date = _timestamp(item.get(fields["price_date"])) or fetched_at
+            except ValueError:
+                logger.warning("Bad price date from %s: %r", source.name, item)
+                continue
+
+            key = (source.id, asset_id)
+            latest = self._latest.get(key)
+            if latest is not None and price_date <= latest:
+                continue
+
+            row = rows.get(key)
+            if row is None or price_date > row["price_date"]:
+                rows[key] = {
+                    "asset_id": asset_id,
+                    "price": _decimal(price),
+                    "price_date": price_date,
+                    "currency": item.get(fields["currency"]) or config.currency,
+                    "source": source.name,
+                    "volume_24h": _decimal(item.get(fields["volume_24h"])),
+                    "market_cap": _decimal(item.get(fields["market_cap"])),
+                }
+
+        return list(rows.values())
+
+    async def _store(self, rows: list[dict[str, Any]]) -> int:
+        async with self._session() as db:
+            try:
+                return await create_asset_prices(db, rows, trusted=True)
+            except DatabaseConstraintError:
+                # Already stored, e.g. by a previous process, upsert the window.
+                await db.rollback()
+                result = await sync_asset_prices(db, rows)
+                return result.inserted + result.updated
+
+    def _report_lag(self, source: PriceSource) -> None:
+        newest = max(
+            (date for (id_, _), date in self._latest.items() if id_ == source.id),
+            default=None,
+        )
+        if newest is not None:
+            lag = (datetime.now(timezone.utc) - newest).total_seconds()
+            ingestion_lag_seconds.set(lag, source=source.name)
+
+
+def _timestamp(value: Any) -> datetime | None:
+    """ISO 8601 strings or epoch seconds (milliseconds past year 5138)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, int | float):
+        seconds = value / 1000 if value > 1e11 else value
+        return datetime.fromtimestamp(seconds, timezone.utc)
+
+    date = datetime.fromisoformat(str(value))
+    return date if date.tzinfo is not None else date.replace(tzinfo=timezone.utc)
+
+
+def _decimal(value: Any) -> Decimal | None:
+    # Through `str`, so floats keep the digits they print with.
+    return None if value is None else Decimal(str(value))
+
+
+price_ingestion = PriceIngestionEngine()
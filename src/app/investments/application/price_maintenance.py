@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import text
+
+from src.app.investments.domain.repository.daos import dao_asset_prices
+from src.core.db import session
+from src.core.db.partitions import (
+    create_partitions,
+    drop_partition,
+    get_partitions,
+    is_partitioned,
+)
+from src.core.db.session import engine
+from src.core.metrics import registry
+from src.settings import api_settings
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+logger = logging.getLogger(__name__)
+
+PARENT = "asset_prices"
+# Held by the process running the maintenance, so only one of the workers does.
+TRY_LOCK = text("SELECT pg_try_advisory_lock(hashtext('price_maintenance'))")
+UNLOCK = text("SELECT pg_advisory_unlock(hashtext('price_maintenance'))")
+
+candles_rolled_up = registry.counter(
+    "price_maintenance_candles",
+    "Daily candles written to `daily_asset_prices` by the price maintenance.",
+)
+partitions_dropped = registry.counter(
+    "price_maintenance_dropped_partitions",
+    "Monthly `asset_prices` partitions dropped by the retention policy.",
+)
+
+
+def retention_cutoff(
+    months: int | None = None, now: datetime | None = None
+) -> datetime | None:
+    """
+    Start (UTC) of the oldest month whose raw prices are kept, `months` before the
+    current one (`PRICE_RETENTION_MONTHS` by default). None when they are kept forever.
+    """
+    months = api_settings.PRICE_RETENTION_MONTHS if months is None else months
+    if not months:
+        return None
+
+    now = now or datetime.now(timezone.utc)
+    year, month = divmod(now.year * 12 + now.month - 1 - months, 12)
+
+    return datetime(year, month + 1, 1, tzinfo=timezone.utc)
+
+
+class PriceMaintenance:
+    """
+    Keeps the monthly partitions of `asset_prices` every `interval` seconds:
+
+    - creates the partitions of the current month and `ahead` more (inserts of a
+      month without partition fail),
+    - rolls the whole days of prices up into `daily_asset_prices`,
+    - drops the partitions older than the `retention_months` policy, once their
+      days are rolled up, detaching them concurrently so writers aren't blocked.
+
+    Dropping a partition is instant and leaves no dead rows behind, unlike deleting
+    the old prices. Only one process runs it at a time (advisory lock).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[
+            [], AbstractAsyncContextManager[AsyncSession]
+        ] = session,
+        db_engine: AsyncEngine = engine,
+        interval: float = 6 * 3600,
+        ahead: int | None = None,
+        retention_months: int | None = None,
+    ) -> None:
+        self._session = session_factory
+        self._engine = db_engine
+        self.interval = interval
+        self.ahead = api_settings.PRICE_PARTITIONS_AHEAD if ahead is None else ahead
+        self.retention_months = retention_months
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="price-maintenance")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self) -> bool:
+        """Run the maintenance now, False if another process is running it."""
+        async with self._engine.connect() as lock:
+            lock = await lock.execution_options(isolation_level="AUTOCOMMIT")
+            if not (await lock.execute(TRY_LOCK)).scalar():
+                return False
+
+            try:
+                await self._maintain()
+            finally:
+                await lock.execute(UNLOCK)
+
+        return True
+
+    async def _maintain(self) -> None:
+        now = datetime.now(timezone.utc)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = retention_cutoff(self.retention_months, now)
+
+        async with self._session() as db:
+            if not await is_partitioned(db, PARENT):
+                logger.error(
+                    "%s isn't partitioned, it needs partition_asset_prices first",
+                    PARENT,
+                )
+                return
+
+            created = await create_partitions(db, PARENT, today.date(), self.ahead)
+            if created:
+                logger.info("Created %d %s partitions", created, PARENT)
+
+            candles_rolled_up.inc(await dao_asset_prices.roll_up_daily(db, None, today))
+            expired = [
+                partition
+                for partition in await get_partitions(db, PARENT)
+                if cutoff is not None and partition.upper <= cutoff
+            ]
+            await db.commit()
+
+            for partition in expired:
+                # Again, in case prices of the month came after the last rollup.
+                candles_rolled_up.inc(
+                    await dao_asset_prices.roll_up_daily(
+                        db, partition.lower, partition.upper
+                    )
+                )
+                await drop_partition(self._engine, PARENT, partition.name)
+                partitions_dropped.inc()
+                logger.info("Dropped the %s partition %s", PARENT, partition.name)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("The price maintenance failed")
+
+            await asyncio.sleep(self.interval)
+
+
+price_maintenance = PriceMaintenance()
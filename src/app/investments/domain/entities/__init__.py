@@ -1,8 +1,12 @@
 from src.app.investments.domain.entities.asset_prices import (
     AssetPrice,
+    AssetPriceCandle,
     AssetPriceCreate,
+    AssetPricePoint,
     AssetPriceResponse,
     AssetPriceUpdate,
+    CandleInterval,
+    LatestAssetPriceResponse,
 )
 from src.app.investments.domain.entities.assets import (
     Asset,
@@ -57,6 +61,10 @@ __all__ = [
     "AssetPriceCreate",
     "AssetPriceUpdate",
     "AssetPriceResponse",
+    "LatestAssetPriceResponse",
+    "AssetPriceCandle",
+    "AssetPricePoint",
+    "CandleInterval",
     # Benchmarks
     "AssetBenchmark",
     "AssetBenchmarkCreate",
@@ -1,5 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
+from typing import Literal
 
 from src.core.schema import BaseModel
 
@@ -32,3 +33,25 @@ class AssetPriceUpdate(BaseModel):
 
 class AssetPriceResponse(AssetPrice):
     id: int
+
+
+class LatestAssetPriceResponse(AssetPrice):
+    price_id: int
+
+
+CandleInterval = Literal["1m", "1h", "1d", "1w"]
+
+
+class AssetPriceCandle(BaseModel):
+    time: datetime
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    volume: Decimal | None = None
+    ticks: int
+
+
+class AssetPricePoint(BaseModel):
+    price_date: datetime
+    price: Decimal
@@ -1,3 +1,26 @@
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Any
+
+from sqlalchemy import (
+    DateTime,
+    Interval,
+    String,
+    any_,
+    bindparam,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array_agg, insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.app.investments.domain.entities import (
     AssetBenchmarkCreate,
     AssetBenchmarkUpdate,
@@ -15,24 +38,354 @@ from src.app.investments.domain.entities import (
     PriceSourceUpdate,
 )
 from src.core.db import DAO
+from src.core.db.cache import table_versions
+from src.core.db.partitions import MonthlyPartitions
 
 from .models import (
     AssetBenchmark,
     AssetPrice,
+    DailyAssetPrice,
     Investment,
     InvestmentAsset,
     InvestmentTransaction,
+    LatestAssetPrice,
     PortfolioSnapshot,
     PriceSource,
 )
 
 
+LATEST_PRICES = select(*LatestAssetPrice.__table__.c).where(
+    LatestAssetPrice.asset_id
+    == any_(bindparam("asset_ids", type_=ARRAY(LatestAssetPrice.asset_id.type)))
+)
+
+# Prices of an asset in `[start, end)`, from every source unless `source` is given.
+_IN_RANGE = (
+    AssetPrice.asset_id == bindparam("asset_id"),
+    AssetPrice.price_date >= bindparam("start"),
+    AssetPrice.price_date < bindparam("end"),
+    or_(
+        bindparam("source", type_=String).is_(None),
+        AssetPrice.source == bindparam("source", type_=String),
+    ),
+)
+_binned = (
+    select(
+        func.date_bin(
+            bindparam("interval", type_=Interval),
+            AssetPrice.price_date,
+            bindparam("origin", type_=DateTime(timezone=True)),
+        ).label("time"),
+        AssetPrice.price,
+        AssetPrice.price_date,
+        AssetPrice.volume_24h,
+    )
+    .where(*_IN_RANGE)
+    .subquery("binned")
+)
+CANDLES = (
+    select(
+        _binned.c.time,
+        array_agg(aggregate_order_by(_binned.c.price, _binned.c.price_date.asc()))[
+            1
+        ].label("open"),
+        func.max(_binned.c.price).label("high"),
+        func.min(_binned.c.price).label("low"),
+        array_agg(aggregate_order_by(_binned.c.price, _binned.c.price_date.desc()))[
+            1
+        ].label("close"),
+        # `volume_24h` is a rolling 24h volume, the last one of the bucket is kept.
+        array_agg(
+            aggregate_order_by(_binned.c.volume_24h, _binned.c.price_date.desc())
+        )[1].label("volume"),
+        func.count().label("ticks"),
+    )
+    .group_by(_binned.c.time)
+    .order_by(_binned.c.time)
+)
+PRICE_SERIES = (
+    select(AssetPrice.price_date, AssetPrice.price)
+    .where(*_IN_RANGE)
+    .order_by(AssetPrice.price_date)
+)
+# Raw prices from `rollups_before` on and the daily candles of `daily_asset_prices`
+# before, as one-price candles and day candles merged into `interval` candles.
+_candle_parts = union_all(
+    select(
+        func.date_bin(
+            bindparam("interval", type_=Interval),
+            AssetPrice.price_date,
+            bindparam("origin", type_=DateTime(timezone=True)),
+        ).label("time"),
+        AssetPrice.price.label("open"),
+        AssetPrice.price.label("high"),
+        AssetPrice.price.label("low"),
+        AssetPrice.price.label("close"),
+        AssetPrice.volume_24h.label("volume"),
+        literal(1).label("ticks"),
+        AssetPrice.price_date.label("opened_at"),
+        AssetPrice.price_date.label("closed_at"),
+    ).where(*_IN_RANGE, AssetPrice.price_date >= bindparam("rollups_before")),
+    select(
+        func.date_bin(
+            bindparam("interval", type_=Interval),
+            DailyAssetPrice.time,
+            bindparam("origin", type_=DateTime(timezone=True)),
+        ).label("time"),
+        DailyAssetPrice.open,
+        DailyAssetPrice.high,
+        DailyAssetPrice.low,
+        DailyAssetPrice.close,
+        DailyAssetPrice.volume,
+        DailyAssetPrice.ticks,
+        DailyAssetPrice.opened_at,
+        DailyAssetPrice.closed_at,
+    ).where(
+        DailyAssetPrice.asset_id == bindparam("asset_id"),
+        DailyAssetPrice.time >= bindparam("start"),
+        DailyAssetPrice.time < bindparam("end"),
+        DailyAssetPrice.time < bindparam("rollups_before"),
+        or_(
+            bindparam("source", type_=String).is_(None),
+            DailyAssetPrice.source == bindparam("source", type_=String),
+        ),
+    ),
+).subquery("parts")
+CANDLES_WITH_ROLLUPS = (
+    select(
+        _candle_parts.c.time,
+        array_agg(
+            aggregate_order_by(_candle_parts.c.open, _candle_parts.c.opened_at.asc())
+        )[1].label("open"),
+        func.max(_candle_parts.c.high).label("high"),
+        func.min(_candle_parts.c.low).label("low"),
+        array_agg(
+            aggregate_order_by(_candle_parts.c.close, _candle_parts.c.closed_at.desc())
+        )[1].label("close"),
+        array_agg(
+            aggregate_order_by(_candle_parts.c.volume, _candle_parts.c.closed_at.desc())
+        )[1].label("volume"),
+        func.sum(_candle_parts.c.ticks).label("ticks"),
+    )
+    .group_by(_candle_parts.c.time)
+    .order_by(_candle_parts.c.time)
+)
+# `date_bin` origin, a Monday, so weeks start on Mondays (UTC).
+CANDLES_ORIGIN = datetime(2000, 1, 3, tzinfo=timezone.utc)
+# Inlined, grouping by an expression with parameters fails in Postgres.
+_day = func.date_bin(
+    literal_column("interval '1 day'"),
+    AssetPrice.price_date,
+    literal_column(f"timestamptz '{CANDLES_ORIGIN.isoformat()}'"),
+).label("time")
+_daily = (
+    select(
+        AssetPrice.asset_id,
+        _day,
+        AssetPrice.source,
+        array_agg(aggregate_order_by(AssetPrice.price, AssetPrice.price_date.asc()))[
+            1
+        ].label("open"),
+        func.max(AssetPrice.price).label("high"),
+        func.min(AssetPrice.price).label("low"),
+        array_agg(aggregate_order_by(AssetPrice.price, AssetPrice.price_date.desc()))[
+            1
+        ].label("close"),
+        array_agg(
+            aggregate_order_by(AssetPrice.volume_24h, AssetPrice.price_date.desc())
+        )[1].label("volume"),
+        func.count().label("ticks"),
+        func.min(AssetPrice.price_date).label("opened_at"),
+        func.max(AssetPrice.price_date).label("closed_at"),
+    )
+    .where(
+        AssetPrice.price_date >= bindparam("start"),
+        AssetPrice.price_date < bindparam("end"),
+    )
+    .group_by(AssetPrice.asset_id, _day, AssetPrice.source)
+)
+_roll_up = insert(DailyAssetPrice).from_select(
+    [column.name for column in _daily.selected_columns], _daily
+)
+# Daily candles of the whole days of `[start, end)`, replacing the ones rolled up
+# before from fewer prices (e.g. late prices, or the last run cut short).
+ROLL_UP_DAILY_PRICES = _roll_up.on_conflict_do_update(
+    index_elements=["asset_id", "time", "source"],
+    set_={
+        name: _roll_up.excluded[name]
+        for name in (
+            "open",
+            "high",
+            "low",
+            "close",
+            "volume",
+            "ticks",
+            "opened_at",
+            "closed_at",
+        )
+    },
+)
+LAST_ROLLUP = select(func.max(DailyAssetPrice.time))
+FIRST_PRICE = select(func.min(AssetPrice.price_date))
+
+
 class DAOInvestmentAsset(DAO[InvestmentAsset, AssetCreate, AssetUpdate]):
-    pass
+    entity_cache_ttl = 60
 
 
 class DAOAssetPrice(DAO[AssetPrice, AssetPriceCreate, AssetPriceUpdate]):
-    pass
+    count_cache_ttl = 5
+    # Seconds the latest prices stay in `_latest`, writes of this process to
+    # `asset_prices` invalidate them before.
+    latest_cache_ttl = 5
+    # Assets kept in `_latest`, the least recently read go first. Ids without any
+    # price are cached too (as `None`), so any id callers send takes a slot.
+    latest_cache_size = 10_000
+
+    def __init__(self, model: type[AssetPrice]) -> None:
+        super().__init__(model)
+        # Hot cache of `get_latest`, `(expires at, table version, row)` by asset id.
+        self._latest: OrderedDict[int, tuple[float, int, Row[Any] | None]] = (
+            OrderedDict()
+        )
+        self.partitions = MonthlyPartitions(self._table)
+
+    async def _before_write(self, db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        # Prices of months without partition, e.g. imported history, can't be stored.
+        dates = [
+            datetime.fromisoformat(date) if isinstance(date, str) else date
+            for row in rows
+            if (date := row.get("price_date")) is not None
+        ]
+        if dates:
+            await self.partitions.ensure(db, dates)
+
+    async def get_latest(
+        self, db: AsyncSession, asset_ids: Iterable[int]
+    ) -> dict[int, Row[Any]]:
+        """
+        Latest price of each asset in `asset_ids` that has any, by asset id.
+
+        Read from `latest_asset_prices` (primary key lookups, one query for every asset
+        missing from the in-process cache) instead of looking for the newest
+        `price_date` of each asset in `asset_prices`.
+        """
+        now = monotonic()
+        version = table_versions.get(self._table)
+        prices: dict[int, Row[Any]] = {}
+        missing = []
+
+        for asset_id in dict.fromkeys(asset_ids):
+            entry = self._latest.get(asset_id)
+
+            if entry is None or entry[0] < now or entry[1] != version:
+                missing.append(asset_id)
+                continue
+
+            self._latest.move_to_end(asset_id)
+            if entry[2] is not None:
+                prices[asset_id] = entry[2]
+
+        if missing:
+            rows = await db.execute(
+                LATEST_PRICES, {"asset_ids": missing}, **self._read_kwargs({})
+            )
+            found = {row.asset_id: row for row in rows}
+            expires_at = now + self.latest_cache_ttl
+
+            for asset_id in missing:
+                row = found.get(asset_id)
+                self._latest[asset_id] = (expires_at, version, row)
+                self._latest.move_to_end(asset_id)
+                if row is not None:
+                    prices[asset_id] = row
+
+            while len(self._latest) > self.latest_cache_size:
+                self._latest.popitem(last=False)
+
+        return prices
+
+    async def get_candles(
+        self,
+        db: AsyncSession,
+        asset_id: int,
+        interval: timedelta,
+        start: datetime,
+        end: datetime,
+        source: str | None = None,
+        rollups_before: datetime | None = None,
+    ) -> list[Row[Any]]:
+        """
+        OHLC candles of an asset in `[start, end)`, one per `interval` with prices,
+        aggregated by Postgres (`date_bin`), so only the candles leave the database.
+
+        Before `rollups_before`, a day boundary, they come from the daily candles of
+        `daily_asset_prices` (those raw prices may be gone), so `interval` must then
+        be whole days. Either way only the monthly partitions of `asset_prices` that
+        overlap the range are read.
+        """
+        params = {
+            "asset_id": asset_id,
+            "interval": interval,
+            "origin": CANDLES_ORIGIN,
+            "start": start,
+            "end": end,
+            "source": source,
+        }
+        statement = CANDLES
+
+        if rollups_before is not None and start < rollups_before:
+            params["rollups_before"] = rollups_before
+            statement = CANDLES_WITH_ROLLUPS
+
+        result = await db.execute(statement, params, **self._read_kwargs({}))
+
+        return list(result)
+
+    async def roll_up_daily(
+        self, db: AsyncSession, start: datetime | None, end: datetime
+    ) -> int:
+        """
+        Upsert the daily candles of the prices in `[start, end)` into
+        `daily_asset_prices`, `end` being a day boundary. Without `start`, from the
+        last day rolled up, again as it may have got more prices since, or from the
+        first price. Returns how many candles were written.
+        """
+        if start is None:
+            start = (await db.execute(LAST_ROLLUP)).scalar()
+        if start is None:
+            start = (await db.execute(FIRST_PRICE)).scalar()
+
+        if start is None or start >= end:
+            return 0
+
+        result = await db.execute(ROLL_UP_DAILY_PRICES, {"start": start, "end": end})
+        await db.commit()
+
+        return result.rowcount
+
+    async def stream_prices(
+        self,
+        db: AsyncSession,
+        asset_id: int,
+        start: datetime,
+        end: datetime,
+        source: str | None = None,
+        batch_size: int = 10_000,
+    ) -> AsyncIterator[Row[Any]]:
+        """`(price_date, price)` of an asset in `[start, end)`, oldest first."""
+        params = {"asset_id": asset_id, "start": start, "end": end, "source": source}
+        result = await db.stream(
+            PRICE_SERIES.execution_options(yield_per=batch_size),
+            params,
+            **self._read_kwargs({}),
+        )
+
+        try:
+            async for row in result:
+                yield row
+        finally:
+            await result.close()
 
 
 class DAOAssetBenchmark(
@@ -52,7 +405,7 @@ class DAOInvestmentTransaction(
 
 
 class DAOPriceSource(DAO[PriceSource, PriceSourceCreate, PriceSourceUpdate]):
-    pass
+    entity_cache_ttl = 60
 
 
 class DAOPortfolioSnapshot(
@@ -4,6 +4,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import (
+    DDL,
     BigInteger,
     Boolean,
     DateTime,
@@ -12,11 +13,15 @@ from sqlalchemy import (
     Integer,
     Numeric,
     Text,
+    UniqueConstraint,
+    event,
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, MappedAsDataclass, mapped_column, relationship
 
 from src.core.db import Base, Date
+from src.core.db.partitions import partition_monthly
+from src.settings import api_settings
 
 
 if TYPE_CHECKING:
@@ -111,7 +116,10 @@ class AssetPrice(MappedAsDataclass, Base, Date, kw_only=True):
         BigInteger, ForeignKey("investment_assets.id", ondelete="CASCADE")
     )
     price: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=8))
-    price_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # Partition key, so part of every unique constraint, the primary key included.
+    price_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, index=True
+    )
     currency: Mapped[str]  # USD, EUR, etc.
     source: Mapped[str | None]  # API or data source name
 
@@ -128,6 +136,156 @@ class AssetPrice(MappedAsDataclass, Base, Date, kw_only=True):
         "InvestmentAsset", back_populates="price_history"
     )
 
+    # A source publishes one price per asset and instant, target of the upserts.
+    __table_args__ = (
+        UniqueConstraint(
+            "asset_id", "price_date", "source", postgresql_nulls_not_distinct=True
+        ),
+        # Monthly partitions (see `src.core.db.partitions`), so range scans only read
+        # the months they cover and old months are dropped instead of deleted.
+        {"postgresql_partition_by": "RANGE (price_date)"},
+    )
+    # `id` alone still identifies a price for the ORM.
+    __mapper_args__ = {"primary_key": ["id"]}
+
+
+# `PriceMaintenance` keeps creating the following months.
+partition_monthly(AssetPrice.__table__, api_settings.PRICE_PARTITIONS_AHEAD)
+
+
+class DailyAssetPrice(MappedAsDataclass, Base, kw_only=True):
+    """
+    Daily candles of `asset_prices` per asset and source, kept after the raw prices
+    of their month are dropped by the retention policy (see `PriceMaintenance`).
+    """
+
+    id: Mapped[int] = mapped_column(
+        BigInteger, init=False, autoincrement=True, primary_key=True
+    )
+    asset_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("investment_assets.id", ondelete="CASCADE")
+    )
+    # Start of the UTC day.
+    time: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    source: Mapped[str | None]
+    open: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=8))
+    high: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=8))
+    low: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=8))
+    close: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=8))
+    volume: Mapped[Decimal | None] = mapped_column(
+        Numeric(precision=19, scale=2), nullable=True
+    )
+    ticks: Mapped[int] = mapped_column(Integer)
+    # First and last price of the day, to merge days of several sources in order.
+    opened_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    closed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint(
+            "asset_id", "time", "source", postgresql_nulls_not_distinct=True
+        ),
+    )
+
+
+class LatestAssetPrice(MappedAsDataclass, Base, kw_only=True):
+    """
+    Latest price of each asset, copy of its newest `asset_prices` row.
+
+    Kept by statement triggers on `asset_prices` (see `LATEST_PRICE_DDL`), so every
+    write path (ORM, `COPY`, upserts) maintains it, once per statement.
+    """
+
+    asset_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("investment_assets.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # No foreign key, old `asset_prices` rows are compacted and dropped.
+    price_id: Mapped[int] = mapped_column(BigInteger)
+    price: Mapped[Decimal] = mapped_column(Numeric(precision=19, scale=8))
+    price_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    currency: Mapped[str]
+    source: Mapped[str | None]
+    volume_24h: Mapped[Decimal | None] = mapped_column(
+        Numeric(precision=19, scale=2), nullable=True
+    )
+    market_cap: Mapped[Decimal | None] = mapped_column(
+        Numeric(precision=19, scale=2), nullable=True
+    )
+
+
+_LATEST_COLUMNS = (
+    "asset_id, price_id, price, price_date, currency, source, volume_24h, market_cap"
+)
+# Newest row per asset of `{rows}` upserted into `latest_asset_prices`, never
+# replacing a newer price (concurrent writers, backfills of old prices).
+_UPSERT_LATEST = f"""
+    INSERT INTO latest_asset_prices AS latest ({_LATEST_COLUMNS})
+    SELECT DISTINCT ON (asset_id)
+        asset_id, id, price, price_date, currency, source, volume_24h, market_cap
+    FROM {{rows}}
+    ORDER BY asset_id, price_date DESC, id DESC
+    ON CONFLICT (asset_id) DO UPDATE SET
+        price_id = EXCLUDED.price_id,
+        price = EXCLUDED.price,
+        price_date = EXCLUDED.price_date,
+        currency = EXCLUDED.currency,
+        source = EXCLUDED.source,
+        volume_24h = EXCLUDED.volume_24h,
+        market_cap = EXCLUDED.market_cap
+    WHERE (latest.price_date, latest.price_id)
+        <= (EXCLUDED.price_date, EXCLUDED.price_id)
+"""
+_CHANGED_ASSETS_PRICES = (
+    "asset_prices WHERE asset_id IN (SELECT asset_id FROM changed_prices)"
+)
+# Rebuild of every asset, for databases created before the triggers.
+REFRESH_LATEST_PRICES = _UPSERT_LATEST.format(rows="asset_prices")
+LATEST_PRICE_DDL = (
+    # Inserts only add prices, the new rows decide.
+    f"""
+    CREATE OR REPLACE FUNCTION asset_prices_upsert_latest() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        {_UPSERT_LATEST.format(rows="changed_prices")};
+        RETURN NULL;
+    END
+    $$
+    """,
+    # Updates and deletes may touch the latest price, those assets are recomputed.
+    f"""
+    CREATE OR REPLACE FUNCTION asset_prices_recompute_latest() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        DELETE FROM latest_asset_prices
+        WHERE asset_id IN (SELECT asset_id FROM changed_prices);
+        {_UPSERT_LATEST.format(rows=_CHANGED_ASSETS_PRICES)};
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER asset_prices_latest_insert AFTER INSERT ON asset_prices
+    REFERENCING NEW TABLE AS changed_prices
+    FOR EACH STATEMENT EXECUTE FUNCTION asset_prices_upsert_latest()
+    """,
+    """
+    CREATE TRIGGER asset_prices_latest_update AFTER UPDATE ON asset_prices
+    REFERENCING NEW TABLE AS changed_prices
+    FOR EACH STATEMENT EXECUTE FUNCTION asset_prices_recompute_latest()
+    """,
+    """
+    CREATE TRIGGER asset_prices_latest_delete AFTER DELETE ON asset_prices
+    REFERENCING OLD TABLE AS changed_prices
+    FOR EACH STATEMENT EXECUTE FUNCTION asset_prices_recompute_latest()
+    """,
+)
+
+for ddl in LATEST_PRICE_DDL:
+    event.listen(
+        AssetPrice.__table__, "after_create", DDL(ddl).execute_if(dialect="postgresql")
+    )
+
 
 class InvestmentGoal(enum.Enum):
     """Purpose of the investment"""
@@ -8,14 +8,24 @@ from src.app.investments.infrastructure.asset_holdings import (
     read_multi as read_asset_holdings,
 )
 from src.app.investments.infrastructure.asset_prices import add as add_asset_price
+from src.app.investments.infrastructure.asset_prices import add_many as add_asset_prices
 from src.app.investments.infrastructure.asset_prices import edit as edit_asset_price
 from src.app.investments.infrastructure.asset_prices import (
     eliminate as eliminate_asset_price,
 )
 from src.app.investments.infrastructure.asset_prices import read as read_asset_price
+from src.app.investments.infrastructure.asset_prices import (
+    read_candles as read_asset_price_candles,
+)
+from src.app.investments.infrastructure.asset_prices import (
+    read_latest as read_latest_asset_prices,
+)
 from src.app.investments.infrastructure.asset_prices import (
     read_multi as read_asset_prices,
 )
+from src.app.investments.infrastructure.asset_prices import (
+    read_series as read_asset_price_series,
+)
 from src.app.investments.infrastructure.assets import add as add_asset
 from src.app.investments.infrastructure.assets import edit as edit_asset
 from src.app.investments.infrastructure.assets import eliminate as eliminate_asset
@@ -41,10 +51,14 @@ __all__ = [
     "read_assets",
     # Asset Prices
     "add_asset_price",
+    "add_asset_prices",
     "edit_asset_price",
     "eliminate_asset_price",
     "read_asset_price",
     "read_asset_prices",
+    "read_latest_asset_prices",
+    "read_asset_price_candles",
+    "read_asset_price_series",
     # Asset Benchmarks
     "add_asset_benchmark",
     "edit_asset_benchmark",
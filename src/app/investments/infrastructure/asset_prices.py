@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Annotated
 
-from litestar import delete, get, post, put
+from litestar import Response, delete, get, post, put
 from litestar.datastructures import ImmutableState
 from litestar.exceptions import HTTPException
 from litestar.params import Body, Parameter
@@ -8,23 +9,39 @@ from litestar.status_codes import (
     HTTP_200_OK,
     HTTP_201_CREATED,
     HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
     HTTP_404_NOT_FOUND,
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.investments.application import (
+    PriceRangeError,
     create_asset_price,
+    create_asset_prices,
     get_asset_price,
     get_asset_prices,
+    get_asset_prices_by_cursor,
+    get_latest_prices,
+    get_price_candles,
+    get_price_series,
     remove_asset_price,
     update_asset_price,
 )
 from src.app.investments.domain.entities.asset_prices import (
+    AssetPriceCandle,
     AssetPriceCreate,
+    AssetPricePoint,
     AssetPriceResponse,
     AssetPriceUpdate,
+    CandleInterval,
+    LatestAssetPriceResponse,
 )
+from src.core.constants import TZ
+from src.core.db.pagination import InvalidCursorError
+from src.core.middlewares.http_cache import CACHE_TABLES
+from src.core.schema import json_response
+from src.core.utils.filters import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 
 
 @get("/{price_id:int}", summary="Get one Asset Price", status_code=HTTP_200_OK)
@@ -39,7 +56,13 @@ async def read(
     return AssetPriceResponse.model_validate(data, context=state.settings)
 
 
-@get("/", summary="Get asset prices", status_code=HTTP_200_OK)
+@get(
+    "/",
+    summary="Get asset prices",
+    status_code=HTTP_200_OK,
+    cache=10,
+    opt={CACHE_TABLES: ("asset_prices",)},
+)
 async def read_multi(
     db: AsyncSession,
     page: Annotated[int, Parameter(default=1, gt=0, query="page")],
@@ -47,18 +70,119 @@ async def read_multi(
     asset_id: Annotated[
         int | None, Parameter(query="asset_id", default=None, required=False)
     ],
+    cursor: Annotated[
+        str | None, Parameter(query="cursor", default=None, required=False)
+    ],
     state: ImmutableState,
-) -> list[AssetPriceResponse]:
+) -> Response[list[AssetPriceResponse]]:
+    """
+    Offset pagination by default. Sending `cursor` (empty for the first page) switches
+    to keyset pagination, the next page cursor comes in the `X-Next-Cursor` header.
+    Offset pages carry the total of prices in the `X-Total-Count` header.
+    """
     filters = {}
+    headers = {}
 
     if asset_id:
         filters["asset_id"] = asset_id
 
-    data = await get_asset_prices(db, page=page, shows=shows, filters=filters)
+    if cursor is not None:
+        try:
+            data, next_cursor = await get_asset_prices_by_cursor(
+                db, cursor=cursor or None, shows=shows, filters=filters
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(detail=str(e), status_code=HTTP_400_BAD_REQUEST) from e
+
+        if next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+    else:
+        data, total = await get_asset_prices(
+            db, page=page, shows=shows, filters=filters
+        )
+        headers[TOTAL_COUNT_HEADER] = str(total)
+
+    return json_response(
+        AssetPriceResponse, data, context=state.settings, headers=headers
+    )
+
+
+@get("/latest", summary="Get the latest price of many assets", status_code=HTTP_200_OK)
+async def read_latest(
+    db: AsyncSession,
+    asset_ids: Annotated[
+        list[int], Parameter(query="asset_ids", min_items=1, max_items=1_000)
+    ],
+) -> Response[list[LatestAssetPriceResponse]]:
+    """Assets without any price are left out."""
+    data = await get_latest_prices(db, asset_ids)
+
+    return json_response(LatestAssetPriceResponse, list(data.values()))
+
+
+@get(
+    "/candles",
+    summary="Get OHLC candles of an asset",
+    status_code=HTTP_200_OK,
+    cache=10,
+    opt={CACHE_TABLES: ("asset_prices",)},
+)
+async def read_candles(
+    db: AsyncSession,
+    asset_id: Annotated[int, Parameter(query="asset_id")],
+    start: Annotated[datetime, Parameter(query="start")],
+    end: Annotated[
+        datetime | None, Parameter(query="end", default=None, required=False)
+    ],
+    interval: Annotated[
+        CandleInterval, Parameter(query="interval", default="1h", required=False)
+    ],
+    source: Annotated[
+        str | None, Parameter(query="source", default=None, required=False)
+    ],
+) -> Response[list[AssetPriceCandle]]:
+    """
+    Candles of `[start, end)`, up to now by default. Intervals without prices are
+    left out.
+    """
+    try:
+        data = await get_price_candles(
+            db, asset_id, interval, start, end or datetime.now(TZ), source=source
+        )
+    except PriceRangeError as e:
+        raise HTTPException(detail=str(e), status_code=HTTP_400_BAD_REQUEST) from e
+
+    return json_response(AssetPriceCandle, data)
+
+
+@get(
+    "/series",
+    summary="Get the prices of an asset downsampled for line charts",
+    status_code=HTTP_200_OK,
+    cache=10,
+    opt={CACHE_TABLES: ("asset_prices",)},
+)
+async def read_series(
+    db: AsyncSession,
+    asset_id: Annotated[int, Parameter(query="asset_id")],
+    start: Annotated[datetime, Parameter(query="start")],
+    end: Annotated[
+        datetime | None, Parameter(query="end", default=None, required=False)
+    ],
+    points: Annotated[int, Parameter(query="points", default=500, ge=3, le=5_000)],
+    source: Annotated[
+        str | None, Parameter(query="source", default=None, required=False)
+    ],
+) -> Response[list[AssetPricePoint]]:
+    """At most `points` prices of `[start, end)`, keeping the shape of the line."""
+    try:
+        data = await get_price_series(
+            db, asset_id, start, end or datetime.now(TZ), points, source=source
+        )
+    except PriceRangeError as e:
+        raise HTTPException(detail=str(e), status_code=HTTP_400_BAD_REQUEST) from e
 
-    return [
-        AssetPriceResponse.model_validate(item, context=state.settings) for item in data
-    ]
+    return json_response(AssetPricePoint, data)
 
 
 @post("/", summary="Create Asset Price", status_code=HTTP_201_CREATED)
@@ -78,6 +202,14 @@ async def add(
     return AssetPriceResponse.model_validate(result, context=state.settings)
 
 
+@post("/bulk", summary="Bulk load Asset Prices", status_code=HTTP_201_CREATED)
+async def add_many(
+    data: Annotated[list[AssetPriceCreate], Body()],
+    db: AsyncSession,
+) -> int:
+    return await create_asset_prices(db, data)
+
+
 @put("/{price_id:int}", summary="Update Asset Price", status_code=HTTP_200_OK)
 async def edit(
     price_id: int,
@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from litestar import delete, get, post, put
+from litestar import Response, delete, get, post, put
 from litestar.datastructures import ImmutableState
 from litestar.exceptions import HTTPException
 from litestar.params import Body, Parameter
@@ -25,6 +25,9 @@ from src.app.investments.domain.entities.assets import (
     AssetResponse,
     AssetUpdate,
 )
+from src.core.middlewares.http_cache import CACHE_TABLES
+from src.core.schema import json_response
+from src.core.utils.filters import TOTAL_COUNT_HEADER
 
 
 @get("/{asset_id:int}", summary="Get one Asset", status_code=HTTP_200_OK)
@@ -37,7 +40,14 @@ async def read(asset_id: int, db: AsyncSession, state: ImmutableState) -> AssetR
     return AssetResponse.model_validate(data, context=state.settings)
 
 
-@get("/", summary="Get assets", status_code=HTTP_200_OK)
+@get(
+    "/",
+    summary="Get assets",
+    status_code=HTTP_200_OK,
+    cache=60,
+    # The nested `price_history` and `benchmarks` are part of the cached body too.
+    opt={CACHE_TABLES: ("investment_assets", "asset_prices", "asset_benchmarks")},
+)
 async def read_multi(
     db: AsyncSession,
     page: Annotated[int, Parameter(default=1, gt=0, query="page")],
@@ -46,15 +56,20 @@ async def read_multi(
         str | None, Parameter(query="asset_type", default=None, required=False)
     ],
     state: ImmutableState,
-) -> list[AssetResponse]:
+) -> Response[list[AssetResponse]]:
     filters = {}
 
     if asset_type:
         filters["asset_type"] = asset_type
 
-    data = await get_assets(db, page=page, shows=shows, filters=filters)
+    data, total = await get_assets(db, page=page, shows=shows, filters=filters)
 
-    return [AssetResponse.model_validate(item, context=state.settings) for item in data]
+    return json_response(
+        AssetResponse,
+        data,
+        context=state.settings,
+        headers={TOTAL_COUNT_HEADER: str(total)},
+    )
 
 
 @post("/", summary="Create Asset", status_code=HTTP_201_CREATED)
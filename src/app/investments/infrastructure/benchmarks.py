@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from litestar import delete, get, post, put
+from litestar import Response, delete, get, post, put
 from litestar.datastructures import ImmutableState
 from litestar.exceptions import HTTPException
 from litestar.params import Body, Parameter
@@ -25,6 +25,8 @@ from src.app.investments.domain.entities.benchmarks import (
     AssetBenchmarkResponse,
     AssetBenchmarkUpdate,
 )
+from src.core.schema import json_response
+from src.core.utils.filters import TOTAL_COUNT_HEADER
 
 
 @get("/{benchmark_id:int}", summary="Get one Asset Benchmark", status_code=HTTP_200_OK)
@@ -48,18 +50,22 @@ async def read_multi(
         int | None, Parameter(query="asset_id", default=None, required=False)
     ],
     state: ImmutableState,
-) -> list[AssetBenchmarkResponse]:
+) -> Response[list[AssetBenchmarkResponse]]:
     filters = {}
 
     if asset_id:
         filters["asset_id"] = asset_id
 
-    data = await get_asset_benchmarks(db, page=page, shows=shows, filters=filters)
+    data, total = await get_asset_benchmarks(
+        db, page=page, shows=shows, filters=filters
+    )
 
-    return [
-        AssetBenchmarkResponse.model_validate(item, context=state.settings)
-        for item in data
-    ]
+    return json_response(
+        AssetBenchmarkResponse,
+        data,
+        context=state.settings,
+        headers={TOTAL_COUNT_HEADER: str(total)},
+    )
 
 
 @post("/", summary="Create Asset Benchmark", status_code=HTTP_201_CREATED)
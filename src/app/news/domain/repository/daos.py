@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 from src.app.news.domain.entities import (
     NewsletterSubscriptionCreate,
     NewsletterSubscriptionUpdate,
@@ -7,12 +9,13 @@ from src.app.news.domain.entities import (
     SavedArticleUpdate,
 )
 from src.core.db import DAO
+from src.core.db.search import FullTextSearch, SearchBackend
 
 from .models import NewsletterSubscription, NewsSource, SavedArticle
 
 
 class DAONewsSource(DAO[NewsSource, NewsSourceCreate, NewsSourceUpdate]):
-    pass
+    entity_cache_ttl = 300
 
 
 class DAONewsletterSubscription(
@@ -26,7 +29,10 @@ class DAONewsletterSubscription(
 
 
 class DAOSavedArticle(DAO[SavedArticle, SavedArticleCreate, SavedArticleUpdate]):
-    pass
+    search_fields: ClassVar[dict[str, SearchBackend]] = {
+        "title": FullTextSearch(),
+        "summary": FullTextSearch(),
+    }
 
 
 dao_news_sources = DAONewsSource(NewsSource)
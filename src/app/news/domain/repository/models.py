@@ -6,6 +6,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, MappedAsDataclass, mapped_column, relationship
 
 from src.core.db import Base, Date
+from src.core.db.search import search_index, search_vector
 
 
 class NewsSource(MappedAsDataclass, Base, Date, kw_only=True):
@@ -65,8 +66,11 @@ class SavedArticle(MappedAsDataclass, Base, Date, kw_only=True):
     summary: Mapped[str | None] = mapped_column(Text)
     is_read: Mapped[bool] = mapped_column(Boolean, default=False)
     notes: Mapped[str | None] = mapped_column(Text)
+    search_vector: Mapped[str | None] = search_vector("title", "summary")
 
     subscription: Mapped["NewsletterSubscription"] = relationship(
         "NewsletterSubscription",
         backref="saved_articles",
     )
+
+    __table_args__ = (search_index("saved_articles"),)
@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 from httpx import RequestError
 
 from src.app.transactions.domain import TransactionFileCreate, dao_transaction_files
-from src.core.aws import s3_client
+from src.core.aws import get_s3_client
 from src.core.utils import randomized_name
 
 
@@ -37,7 +37,7 @@ async def upload_file(file: UploadFile, transaction_id: int) -> str:
     name = randomized_name()
 
     try:
-        await s3_client.upload(
+        await get_s3_client().upload(
             f"transactions/{transaction_id}/{name}.{ext}",
             await file.read(),
             content_type=file.content_type,
@@ -92,6 +92,6 @@ async def remove_file(db: AsyncSession, file_id: int) -> None:
     await dao_transaction_files.delete(db, file)
 
     try:
-        await s3_client.delete(file.file)
+        await get_s3_client().delete(file.file)
     except RequestError:
         raise
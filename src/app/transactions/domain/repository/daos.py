@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 from src.app.transactions.domain.entities import (
     TransactionCreate,
     TransactionFileCreate,
@@ -7,6 +9,7 @@ from src.app.transactions.domain.entities import (
     TransactionUpdate,
 )
 from src.core.db import DAO
+from src.core.db.search import FullTextSearch, SearchBackend, TrigramSearch
 
 from .models import Transaction, TransactionFile, TransactionType
 
@@ -14,11 +17,16 @@ from .models import Transaction, TransactionFile, TransactionType
 class DAOTransactionType(
     DAO[TransactionType, TransactionTypeCreate, TransactionTypeUpdate]
 ):
-    pass
+    entity_cache_ttl = 300
 
 
 class DAOTransaction(DAO[Transaction, TransactionCreate, TransactionUpdate]):
-    pass
+    count_cache_ttl = 5
+    search_fields: ClassVar[dict[str, SearchBackend]] = {
+        "concept": FullTextSearch(),
+        "note": FullTextSearch(),
+        "payment_reference": TrigramSearch(),
+    }
 
 
 class DAOTransactionFiles(
@@ -8,6 +8,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, MappedAsDataclass, mapped_column, relationship
 
 from src.core.db import Base, Date
+from src.core.db.search import search_index, search_vector, trigram_index
 
 
 if TYPE_CHECKING:
@@ -60,8 +61,11 @@ class Transaction(MappedAsDataclass, Base, Date, kw_only=True):
     currency: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     concept: Mapped[str | None] = mapped_column(Text)
     payment_reference: Mapped[str | None]
-    transaction_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    transaction_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), index=True
+    )
     note: Mapped[str | None] = mapped_column(Text)
+    search_vector: Mapped[str | None] = search_vector("concept", "note")
 
     # Relationships
     transaction_type: Mapped[TransactionType] = relationship(
@@ -85,6 +89,11 @@ class Transaction(MappedAsDataclass, Base, Date, kw_only=True):
         lazy="joined",
     )
 
+    __table_args__ = (
+        search_index("transactions"),
+        trigram_index("transactions", "payment_reference"),
+    )
+
 
 class TransactionFile(MappedAsDataclass, Base, Date, kw_only=True):
     """Files attached to transactions"""
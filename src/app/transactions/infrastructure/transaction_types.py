@@ -23,9 +23,16 @@ from src.app.transactions.domain import (
     TransactionTypeResponse,
     TransactionTypeUpdate,
 )
+from src.core.middlewares.http_cache import CACHE_TABLES
 
 
-@get("/types/", summary="Get transaction types", status_code=HTTP_200_OK)
+@get(
+    "/types/",
+    summary="Get transaction types",
+    status_code=HTTP_200_OK,
+    cache=300,
+    opt={CACHE_TABLES: ("transaction_types",)},
+)
 async def read_multi(
     db: AsyncSession,
     page: Annotated[int, Parameter(default=1, gt=0, query="page")],
@@ -1,16 +1,39 @@
-from litestar import Litestar, get
+from litestar import Litestar, Response, get
 from litestar.config.cors import CORSConfig
+from litestar.config.response_cache import ResponseCacheConfig
 from litestar.contrib.pydantic import PydanticPlugin
 from litestar.di import Provide
+from litestar.status_codes import HTTP_200_OK, HTTP_503_SERVICE_UNAVAILABLE
 from litestar.stores.memory import MemoryStore
 from litestar.stores.registry import StoreRegistry
 
+from src.app.investments.application.price_ingestion import price_ingestion
+from src.app.investments.application.price_maintenance import price_maintenance
 from src.core.db import get_db
-from src.core.utils.filters import filter_dependencies
+from src.core.db.cache import ENTITY_STORE, LRUMemoryStore, entity_cache
+from src.core.db.pool import check_health
+from src.core.db.session import engine, warm_connections
+from src.core.http import http_client
+from src.core.metrics import PROMETHEUS_CONTENT_TYPE, registry
+from src.core.middlewares.http_cache import ETagMiddleware, versioned_cache_key
+from src.core.security import api_key_guard
+from src.core.utils.filters import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    filter_dependencies,
+)
 from src.settings import api_settings, docs_config
 
 
-cors_config = CORSConfig(expose_headers=["Content-Disposition"])
+cors_config = CORSConfig(
+    expose_headers=[
+        "Content-Disposition",
+        "ETag",
+        NEXT_CURSOR_HEADER,
+        TOTAL_COUNT_HEADER,
+    ]
+)
+response_cache_config = ResponseCacheConfig(key_builder=versioned_cache_key)
 plugin = PydanticPlugin(prefer_alias=True)
 
 
@@ -19,13 +42,65 @@ async def index() -> str:
     return "Finance API"
 
 
+@get(
+    "/metrics",
+    media_type=PROMETHEUS_CONTENT_TYPE,
+    include_in_schema=False,
+    guards=None if api_settings.METRICS_PUBLIC else [api_key_guard],
+)
+async def metrics() -> str:
+    """
+    Internal, process metrics in the Prometheus text format. Asks for the `API_KEY`
+    unless `METRICS_PUBLIC` is set.
+    """
+    return registry.render()
+
+
+@get("/health/db", include_in_schema=False)
+async def health_db() -> Response[dict]:
+    health = await check_health(engine)
+    status_code = HTTP_200_OK if health["ok"] else HTTP_503_SERVICE_UNAVAILABLE
+
+    return Response(health, status_code=status_code)
+
+
+def configure_caches(app: Litestar) -> None:
+    entity_cache.configure(app.stores.get(ENTITY_STORE))
+
+
+async def start_price_ingestion() -> None:
+    if api_settings.PRICE_INGESTION:
+        await price_ingestion.start()
+
+
+async def start_price_maintenance() -> None:
+    if api_settings.PRICE_MAINTENANCE:
+        await price_maintenance.start()
+
+
 app = Litestar(
-    route_handlers=[index],
+    route_handlers=[index, metrics, health_db],
     openapi_config=docs_config,
     docs_url=api_settings.DOCS_URL,
     dependencies={"db": Provide(get_db), **filter_dependencies},
     debug=api_settings.DEV_MODE,
     plugins=[plugin],
     cors_config=cors_config,
-    stores=StoreRegistry({"store": MemoryStore()}),
+    stores=StoreRegistry(
+        {
+            "store": MemoryStore(),
+            ENTITY_STORE: LRUMemoryStore(maxsize=10_000),
+            response_cache_config.store: LRUMemoryStore(maxsize=1_000),
+        }
+    ),
+    response_cache_config=response_cache_config,
+    middleware=[ETagMiddleware],
+    on_startup=[
+        configure_caches,
+        warm_connections,
+        http_client.start,
+        start_price_ingestion,
+        start_price_maintenance,
+    ],
+    on_shutdown=[price_ingestion.stop, price_maintenance.stop, http_client.close],
 )
@@ -1 +1 @@
-from .s3 import s3_client
+from .s3 import get_s3_client
@@ -1,14 +1,11 @@
-from functools import partial
-
 from aioaws.s3 import S3Client, S3Config
-from httpx import AsyncClient
+
+from src.core.http import http_client
+
+
+def get_s3_client() -> S3Client:
+    """S3 client on the shared HTTP client, available once the app has started."""
+    return S3Client(http_client=http_client.client("s3"), config=S3Config())
 
 
-http_client = AsyncClient(verify=False)
-AWSClient = partial(
-    S3Client,
-    http_client=http_client,
-    config=S3Config(),
-)
-s3_client = AWSClient()
 # TODO: install aioaws and add settings
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from itertools import islice
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from sqlalchemy import Column, Table, text
+
+
+if TYPE_CHECKING:
+    from asyncpg import Connection
+    from sqlalchemy.engine import Dialect
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+_T = TypeVar("_T")
+# asyncpg (the Postgres protocol) can't bind more parameters in one statement.
+MAX_PARAMETERS = 32_767
+NEXTVAL = text(
+    "SELECT nextval(pg_get_serial_sequence(:table, 'id')) "
+    "FROM generate_series(1, :rows)"
+)
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0  # conflicting rows with nothing to update, or `DO NOTHING`
+
+
+def chunked(iterable: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    """Split an iterable in lists of `size` items without materializing it."""
+    iterator = iter(iterable)
+
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def driver_connection(connection: AsyncConnection) -> Connection:
+    """
+    Get the asyncpg connection behind a SQLAlchemy one.
+
+    The SQLAlchemy adapter only sends `BEGIN` with the first statement it runs, so one
+    is run first, otherwise anything executed directly on the driver would be
+    autocommitted outside of the session transaction.
+    """
+    await connection.exec_driver_sql("SELECT 1")
+    raw_connection = await connection.get_raw_connection()
+
+    return raw_connection.driver_connection
+
+
+async def copy_rows(
+    driver: Connection,
+    table: Table,
+    rows: list[dict[str, Any]],
+    dialect: Dialect,
+) -> int:
+    """
+    Insert `rows` with binary `COPY ... FROM STDIN`, returns the number of rows copied.
+
+    Values go through the same bind processors SQLAlchemy uses for `INSERT` (enums to
+    names, JSON to text...) and columns left out get their python side default, which
+    `COPY` knows nothing about. Rows are copied in groups with the same keys, so a
+    column some rows leave out still gets its server default in those instead of NULL.
+    """
+    groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+
+    copied = 0
+    for given, group in groups.items():
+        columns = insert_columns(table, given)
+        processors = [_bind_processor(column, dialect) for column in columns]
+        records = []
+
+        for row in group:
+            record = []
+
+            for column, process in zip(columns, processors):
+                value = row[column.key] if column.key in row else _default(column)
+                record.append(
+                    process(value) if process and value is not None else value
+                )
+
+            records.append(record)
+
+        status = await driver.copy_records_to_table(
+            table.name,
+            records=records,
+            columns=[column.name for column in columns],
+            schema_name=table.schema,
+        )
+        copied += int(status.split()[-1])  # e.g. "COPY 5000"
+
+    return copied
+
+
+def insert_columns(table: Table, given: Iterable[str]) -> list[Column]:
+    """
+    Columns an insert of rows with the `given` keys sends values for, the ones left
+    out with a python side default get it.
+    """
+    given = set(given)
+    return [c for c in table.columns if c.key in given or _has_python_default(c)]
+
+
+def _has_python_default(column: Column) -> bool:
+    default = column.default
+    return (
+        default is not None
+        and not column.primary_key
+        and (default.is_scalar or default.is_callable)
+    )
+
+
+def _default(column: Column) -> Any:
+    default = column.default
+
+    if default is None:
+        return None
+    if default.is_callable:
+        return default.arg(None)  # SQLAlchemy wraps them to take the context
+
+    return default.arg
+
+
+def _bind_processor(column: Column, dialect: Dialect) -> Callable[[Any], Any] | None:
+    return column.type.dialect_impl(dialect).bind_processor(dialect)
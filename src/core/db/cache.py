@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import pickle
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from datetime import timedelta
+from time import monotonic
+from typing import TYPE_CHECKING, Any, TypeVar
+from weakref import WeakKeyDictionary
+
+from litestar.stores.memory import MemoryStore
+from sqlalchemy.sql import Select
+
+from src.core.types import MISSING, MISSING_TYPE
+
+
+if TYPE_CHECKING:
+    from litestar.stores.base import Store
+
+
+_S = TypeVar("_S", bound=Select)
+# Name of the store of `entity_cache` in the app `StoreRegistry`.
+ENTITY_STORE = "entities"
+
+
+class TableVersions:
+    """
+    Per table write counters.
+
+    Every DAO write bumps the version of its table, caches derived from a table keep
+    the version they were built with in their key so a write invalidates them without
+    having to track which entries belong to which table.
+
+    NOTE: The counters live in the process, other workers only see their own writes,
+    that's why everything keyed by them must also have a short TTL.
+    """
+
+    __slots__ = ("_versions", "_written_at")
+
+    def __init__(self) -> None:
+        self._versions: dict[str, int] = {}
+        self._written_at: dict[str, float] = {}
+
+    def get(self, table: str) -> int:
+        return self._versions.get(table, 0)
+
+    def bump(self, table: str) -> int:
+        version = self._versions.get(table, 0) + 1
+        self._versions[table] = version
+        self._written_at[table] = monotonic()
+
+        return version
+
+    def written_within(self, table: str, seconds: float) -> bool:
+        """Whether this process wrote to `table` in the last `seconds`."""
+        written_at = self._written_at.get(table)
+        return written_at is not None and monotonic() - written_at < seconds
+
+
+class CountCache:
+    """Size bounded cache of `SELECT count(*)` results with a TTL per entry."""
+
+    __slots__ = ("_data", "maxsize")
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, int | None]] = OrderedDict()
+
+    def key(
+        self,
+        table: str,
+        statement: Select,
+        params: Mapping[str, Any] | None = None,
+    ) -> Hashable | None:
+        """
+        Key of a statement: its SQLAlchemy cache key (the statement shape), the values
+        bound to it, the ones given at execution (`params`) and the current version of
+        the table.
+        Returns `None` for statements that SQLAlchemy itself can't cache.
+        """
+        cache_key = statement._generate_cache_key()
+
+        if cache_key is None:
+            return None
+
+        bound = [bind.effective_value for bind in cache_key.bindparams]
+        params = repr((bound, sorted(params.items()) if params else None))
+        return table, table_versions.get(table), cache_key.key, params
+
+    def get(self, key: Hashable) -> int | None | MISSING_TYPE:
+        entry = self._data.get(key)
+
+        if entry is None:
+            return MISSING
+
+        expires_at, value = entry
+        if expires_at < monotonic():
+            self._data.pop(key, None)
+            return MISSING
+
+        return value
+
+    def set(self, key: Hashable, value: int | None, ttl: float) -> None:
+        self._data[key] = (monotonic() + ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class StatementCache:
+    """
+    Size bounded cache of prebuilt statements.
+
+    Statements are keyed by their shape (model, filtered columns, ordering, options...)
+    and use `bindparam` for every value, so the same object is executed again with
+    different parameters. Besides skipping the building, SQLAlchemy memoizes the cache
+    key on the statement object, which otherwise is computed on every execution.
+
+    Statements derived from another one (its count, a page of it...) are kept while
+    the one they come from is alive. Only from statements of the cache, others (e.g.
+    built for `complex_filters`) are new on every call, their derived ones are built
+    without being cached or counted.
+    """
+
+    __slots__ = ("_data", "_derived", "hits", "maxsize", "misses")
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Select] = OrderedDict()
+        self._derived: WeakKeyDictionary[Select, dict[Hashable, Select]] = (
+            WeakKeyDictionary()
+        )
+
+    def get(self, key: Hashable, build: Callable[[], _S]) -> _S:
+        """Get the statement of `key`, building it with `build` on a miss."""
+        statement = self._data.get(key)
+
+        if statement is not None:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return statement  # type: ignore[return-value]
+
+        self.misses += 1
+        statement = self._data[key] = build()
+        self._derived[statement] = {}
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+        return statement
+
+    def derive(self, statement: Select, key: Hashable, build: Callable[[], _S]) -> _S:
+        """Get the statement derived from `statement` under `key`."""
+        derived = self._derived.get(statement)
+
+        if derived is None:
+            return build()
+        if key in derived:
+            self.hits += 1
+            return derived[key]  # type: ignore[return-value]
+
+        self.misses += 1
+        derived[key] = result = build()
+        self._derived[result] = {}
+
+        return result
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def clear(self) -> None:
+        self.hits = self.misses = 0
+        self._data.clear()
+        self._derived.clear()
+
+
+class LRUMemoryStore(MemoryStore):
+    """`MemoryStore` holding up to `maxsize` values, the least recently used go first."""
+
+    __slots__ = ("maxsize",)
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+
+    async def set(
+        self,
+        key: str,
+        value: str | bytes,
+        expires_in: int | timedelta | None = None,
+    ) -> None:
+        await super().set(key, value, expires_in)
+
+        async with self._lock:
+            if key in self._store:
+                self._store.move_to_end(key)
+
+            while len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+
+    async def get(
+        self, key: str, renew_for: int | timedelta | None = None
+    ) -> bytes | None:
+        value = await super().get(key, renew_for)
+
+        if value is not None:
+            async with self._lock:
+                if key in self._store:
+                    self._store.move_to_end(key)
+
+        return value
+
+
+class EntityCache:
+    """
+    Read-through cache of the column values of entities by id, see
+    `DAO.entity_cache_ttl`.
+
+    It lives on a Litestar store (`ENTITY_STORE` of the app `StoreRegistry`), so the
+    in-process one can be swapped for a shared one without touching the DAOs. Until
+    the app gives it its store it is disabled, DAOs used elsewhere (scripts, jobs...)
+    always hit the database.
+    """
+
+    __slots__ = ("_tasks", "store")
+
+    def __init__(self) -> None:
+        self.store: Store | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def configure(self, store: Store | None) -> None:
+        self.store = store
+
+    async def get(self, table: str, _id: int) -> dict[str, Any] | None:
+        if self.store is None:
+            return None
+
+        value = await self.store.get(f"{table}:{_id}")
+        return None if value is None else pickle.loads(value)
+
+    async def set(self, table: str, _id: int, values: dict[str, Any], ttl: int) -> None:
+        if self.store is not None:
+            await self.store.set(f"{table}:{_id}", pickle.dumps(values), ttl)
+
+    async def delete(self, table: str, ids: Iterable[int]) -> None:
+        if self.store is not None:
+            for _id in ids:
+                await self.store.delete(f"{table}:{_id}")
+
+    def delete_soon(self, table: str, ids: Iterable[int]) -> None:
+        """`delete` from synchronous code, e.g. session events, in a task."""
+        if self.store is not None:
+            task = asyncio.get_running_loop().create_task(self.delete(table, ids))
+            # Keep a reference to the task, the loop only holds weak ones.
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+
+table_versions = TableVersions()
+count_cache = CountCache()
+statement_cache = StatementCache()
+entity_cache = EntityCache()
@@ -1,26 +1,57 @@
 from __future__ import annotations
 
-from typing import Any, Generic, TypeVar, Unpack, cast
+import asyncio
+import datetime as dt
+from collections.abc import AsyncIterator, Iterable
+from functools import cache, cached_property
+from typing import (
+    Any,
+    ClassVar,
+    Generic,
+    TypeVar,
+    Unpack,
+    cast,
+    get_args,
+    get_origin,
+)
 
 from pydantic import BaseModel
-from sqlalchemy import asc
+from sqlalchemy import Date, Integer, Table, any_, asc, bindparam
 from sqlalchemy import delete as sql_delete
-from sqlalchemy import desc
+from sqlalchemy import desc, event
 from sqlalchemy import func as sql_func
-from sqlalchemy import insert
+from sqlalchemy import insert, inspect, literal_column, text, tuple_
 from sqlalchemy import update as sql_update
+from sqlalchemy.dialects.postgresql import ARRAY, Insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import InstrumentedAttribute, RelationshipProperty, strategy_options
-from sqlalchemy.sql import Select, select
-
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    RelationshipProperty,
+    load_only,
+    make_transient_to_detached,
+    strategy_options,
+)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import ColumnElement, Select, select
+from sqlalchemy.sql.base import Executable, ExecutableOption
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+from src.core.constants import TZ
 from src.core.types import (
     EMPTY,
     EMPTY_TYPE,
     MISSING,
     MISSING_TYPE,
+    CountStrategy,
     Kwargs,
     StrategyOptions,
 )
+from src.core.utils import deserialize_object
 from src.core.utils.filters import (
     After,
     AnyFieldFilter,
@@ -34,13 +65,92 @@ from src.core.utils.filters import (
     Search,
 )
 
-from .exceptions import catch_sqlalchemy_exception
+from .bulk import (
+    MAX_PARAMETERS,
+    NEXTVAL,
+    UpsertResult,
+    chunked,
+    copy_rows,
+    driver_connection,
+    insert_columns,
+)
+from .cache import count_cache, entity_cache, statement_cache, table_versions
+from .exceptions import catch_driver_exception, catch_sqlalchemy_exception
+from .loader import BatchLoader
 from .model import Base
+from .pagination import decode_cursor, encode_cursor, keyset_predicate
+from .routing import REPLICA, async_engine
+from .search import ILikeSearch, SearchBackend
 
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchema = TypeVar("CreateSchema", bound=BaseModel)
 UpdateSchema = TypeVar("UpdateSchema", bound=BaseModel)
+# Attributes to load: their names or a schema, which reads its `__columns__` or fields.
+Fields = Iterable[str] | type[BaseModel]
+
+_EAGER_LAZY = {"joined", "selectin", "subquery", "immediate"}
+_EAGER_STRATEGIES = {"joinedload", "selectinload", "subqueryload", "immediateload"}
+_ILIKE = ILikeSearch()
+_RELTUPLES = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"
+)
+
+
+class _Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a statement, keeping its bound parameters."""
+
+    inherit_cache = True
+    _traverse_internals = [("statement", InternalTraversal.dp_clauseelement)]
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element: _Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def _day_start(column: InstrumentedAttribute, day: dt.date) -> dt.date | dt.datetime:
+    """First instant of `day` in `TZ`, or the day itself for `DATE` columns."""
+    if isinstance(day, dt.datetime):
+        day = day.date()
+    if isinstance(column.type, Date):
+        return day
+
+    return dt.datetime.combine(day, dt.time.min, tzinfo=TZ)
+
+
+def _date_range(
+    column: InstrumentedAttribute,
+    start: dt.date | None = None,
+    end: dt.date | None = None,
+) -> list[ColumnElement[bool]]:
+    """
+    Half-open `[start, end)` predicates of whole days on `column`.
+
+    Same rows as comparing `date(column)`, but the column is left bare so Postgres can
+    use a B-tree index on it instead of scanning the whole table.
+    """
+    clauses = []
+
+    if start is not None:
+        clauses.append(column >= _day_start(column, start))
+    if end is not None:
+        clauses.append(column < _day_start(column, end))
+
+    return clauses
+
+
+def _next_month(day: dt.date) -> dt.date:
+    return (day.replace(day=1) + dt.timedelta(days=32)).replace(day=1)
+
+
+@cache
+def _schema_fields(schema: type[BaseModel]) -> tuple[str, ...]:
+    declared = getattr(schema, "__columns__", None)
+    return tuple(declared if declared is not None else schema.model_fields)
 
 
 class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
@@ -53,48 +163,199 @@ class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
     https://github.com/fastapi/full-stack-fastapi-template/blob/490c554e23343eec0736b06e59b2108fdd057fdc/%7B%7Bcookiecutter.project_slug%7D%7D/backend/app/app/crud/base.py
     """
 
+    # Seconds exact counts of `get_multi` are cached for, `0` disables the cache.
+    count_cache_ttl: float = 0
+    # Seconds items read by id are kept in `entity_cache` for, `0` disables it. Meant
+    # for reference data, only column values are cached, not relationships, so models
+    # with eager relationships are never cached.
+    entity_cache_ttl: int = 0
+    # How `Search` filters match each field, the rest use a plain `ILIKE`.
+    search_fields: ClassVar[dict[str, SearchBackend]] = {}
+    # Every DAO created, their hottest statements are prepared on new connections.
+    instances: ClassVar[list[DAO]] = []
+
     def __init__(self, model: type[ModelType]):
         self.model = model
+        DAO.instances.append(self)
 
     async def get(
         self,
         db: AsyncSession,
         _id: int,
         options: list[tuple[str, StrategyOptions]] | None = None,
+        fields: Fields | None = None,
         **kwargs: Unpack[Kwargs],
     ) -> ModelType | MISSING_TYPE:
-        """Get single item by id."""
-        statement = select(self.model).where(self.model.id == _id)
-
-        if options is not None:
-            statement = self.options(statement, options)
-
-        result = (await db.execute(statement, **kwargs)).unique().scalar_one_or_none()
+        """Get single item by id, with `fields` only those columns are loaded."""
+        cached = self._entity_cached and options is None and fields is None
+        kwargs = self._read_kwargs(kwargs)
+
+        if cached:
+            if (obj := self._from_identity_map(db, _id)) is not None:
+                return obj
+            if (values := await entity_cache.get(self._table, _id)) is not None:
+                return await self._from_cache(db, values)
+
+        statement, params = self._cached_select({"id": _id}, options, fields)
+        result = (
+            (await db.execute(statement, params, **kwargs))
+            .unique()
+            .scalar_one_or_none()
+        )
 
         if not result:
             return MISSING
 
+        if cached:
+            await self._cache(result)
+
         return result
 
-    async def get_by(
+    async def get_many(
         self,
         db: AsyncSession,
-        where: dict[str, Any],
+        ids: list[int],
         options: list[tuple[str, StrategyOptions]] | None = None,
         **kwargs: Unpack[Kwargs],
-    ) -> ModelType | MISSING_TYPE:
-        """Get single item by multiple filters."""
-        statement = select(self.model)
+    ) -> list[ModelType | MISSING_TYPE]:
+        """
+        Get many items by id in a single `WHERE id = ANY(:ids)` query.
+
+        Results follow the order of `ids`, with `MISSING` for the ones that don't exist.
+        Items already in the session identity map (or `entity_cache`) are not queried
+        again, unless `options` asks for loading something else.
+        """
+        found: dict[int, ModelType] = {}
+        cached = self._entity_cached and options is None
+        kwargs = self._read_kwargs(kwargs)
+
+        if options is None:
+            for _id in ids:
+                if (obj := self._from_identity_map(db, _id)) is not None:
+                    found[_id] = obj
+
+        if cached:
+            for _id in dict.fromkeys(_id for _id in ids if _id not in found):
+                if (values := await entity_cache.get(self._table, _id)) is not None:
+                    found[_id] = await self._from_cache(db, values)
+
+        if missing := list(dict.fromkeys(_id for _id in ids if _id not in found)):
+            statement = statement_cache.get(
+                (self.model, "get_many", self._options_key(options)),
+                lambda: self.options(
+                    select(self.model).where(
+                        self.model.id
+                        == any_(bindparam("ids", type_=ARRAY(self.model.id.type)))
+                    ),
+                    options,
+                ),
+            )
+            results = (
+                (await db.execute(statement, {"ids": missing}, **kwargs))
+                .unique()
+                .scalars()
+                .all()
+            )
+            found.update((obj.id, obj) for obj in results)
+
+            if cached:
+                for obj in results:
+                    await self._cache(obj)
+
+        return [found.get(_id, MISSING) for _id in ids]
+
+    def _from_identity_map(self, db: AsyncSession, _id: int) -> ModelType | None:
+        """The item `_id` if it's already loaded in the session."""
+        key = inspect(self.model).identity_key_from_primary_key((_id,))
+        obj = db.identity_map.get(key)
+
+        if obj is None or inspect(obj).expired:
+            return None
+
+        return obj
+
+    async def _from_cache(self, db: AsyncSession, values: dict[str, Any]) -> ModelType:
+        """Rebuild a cached item and attach it to the session without querying."""
+        obj = inspect(self.model).class_manager.new_instance()
+
+        for key, value in values.items():
+            set_committed_value(obj, key, value)
+
+        make_transient_to_detached(obj)
+        return await db.merge(obj, load=False)
+
+    async def _cache(self, obj: ModelType) -> None:
+        values = {
+            column.key: getattr(obj, column.key)
+            for column in inspect(self.model).column_attrs
+            if column.key in obj.__dict__  # deferred columns stay out
+        }
+        await entity_cache.set(self._table, obj.id, values, self.entity_cache_ttl)
+
+    @cached_property
+    def _entity_cached(self) -> bool:
+        """
+        Whether `get` reads through `entity_cache`. Rebuilt items only have their
+        columns, the eager relationships a query would load would be missing.
+        """
+        return bool(self.entity_cache_ttl) and not any(
+            rel.lazy in _EAGER_LAZY for rel in inspect(self.model).relationships
+        )
 
-        if where is not None:
-            statement = statement.where(
-                *[getattr(self.model, k) == v for k, v in where.items()],
+    async def _evict(self, db: AsyncSession, ids: Iterable[int], commit: bool) -> None:
+        """
+        Drop items from `entity_cache` after the commit. Without `commit` the caller
+        commits later, until then other sessions still read the old rows and may cache
+        them, so they are dropped again then.
+        """
+        if not self._entity_cached:
+            return
+
+        ids = list(ids)
+        await entity_cache.delete(self._table, ids)
+
+        if not commit:
+            event.listen(
+                db.sync_session,
+                "after_commit",
+                lambda _: entity_cache.delete_soon(self._table, ids),
+                once=True,
             )
 
-        if options is not None:
-            statement = self.options(statement, options)
+    @property
+    def _table(self) -> str:
+        return self.model.__tablename__
+
+    def _read_kwargs(self, kwargs: Kwargs) -> Kwargs:
+        """`kwargs` of a read, marked so a `RoutingSession` may run it on a replica."""
+        bind_arguments = {REPLICA: self._table, **kwargs.get("bind_arguments", {})}
+        return {**kwargs, "bind_arguments": bind_arguments}
+
+    def loader(self, db: AsyncSession) -> BatchLoader[ModelType]:
+        """The `BatchLoader` of this DAO for the session (request) `db`."""
+        loaders = db.info.setdefault("loaders", {})
 
-        result = (await db.execute(statement, **kwargs)).unique().scalar_one_or_none()
+        if self not in loaders:
+            loaders[self] = BatchLoader(self, db)
+
+        return loaders[self]
+
+    async def get_by(
+        self,
+        db: AsyncSession,
+        where: dict[str, Any],
+        options: list[tuple[str, StrategyOptions]] | None = None,
+        fields: Fields | None = None,
+        **kwargs: Unpack[Kwargs],
+    ) -> ModelType | MISSING_TYPE:
+        """Get single item by multiple filters."""
+        kwargs = self._read_kwargs(kwargs)
+        statement, params = self._cached_select(where, options, fields)
+        result = (
+            (await db.execute(statement, params, **kwargs))
+            .unique()
+            .scalar_one_or_none()
+        )
 
         if not result:
             return MISSING
@@ -111,32 +372,241 @@ class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
         ordering: list[tuple[str, bool]] | None = None,
         options: list[tuple[str, StrategyOptions]] | None = None,
         complex_filters: list[FilterTypes] | None = None,
+        count_strategy: CountStrategy = "exact",
+        fields: Fields | None = None,
+        columns: list[str] | None = None,
         **kwargs: Unpack[Kwargs],
-    ) -> tuple[list[ModelType] | EMPTY_TYPE, int]:
-        """Get multiple items."""
-        statement = select(self.model)
+    ) -> tuple[list[ModelType] | list[Row[Any]] | EMPTY_TYPE, int | None]:
+        """
+        Get multiple items.
+
+        With `fields` only those columns of the items are loaded (`load_only`), with
+        `columns` only those columns are selected and rows are returned as named tuples
+        instead of entities (with `window` they also carry the `total`).
+
+        `count_strategy` chooses how the total is computed:
+        - `exact`: runs `count(*)` after the page, cached with `count_cache_ttl`.
+        - `concurrent`: runs `count(*)` on a second pooled connection at the same time
+          as the page, it doesn't see uncommitted changes of `db`.
+        - `window`: a single statement with a `count(*) OVER ()` column, `exact` when
+          collections are joined in (`joinedload`), their rows would be counted.
+        - `estimated`: uses the planner estimates.
+        - `skip`: doesn't count at all, returning `None`.
+
+        Without `complex_filters` the statements come prebuilt from the statement cache.
+        """
+        kwargs = self._read_kwargs(kwargs)
+
+        if columns is not None:
+            # Loader options only apply to entities.
+            options = fields = None
+
+        if complex_filters is None:
+            statement, params = self._cached_select(where, options, fields)
+        else:
+            statement = self._select_multi(where, complex_filters, options, fields)
+            params = {}
+
+        if columns is not None:
+            statement = self._project(statement, columns)
 
-        if where is not None:
-            statement = statement.where(
-                *[getattr(self.model, k) == v for k, v in where.items()],
+        if ordering is None:
+            ordering = [("date_added", True)]
+        elif statement._order_by_clauses:
+            # Search ranks only order the items when no ordering is asked for. Only
+            # ranked statements are reset, the cached ones keep their derived pages.
+            statement = statement.order_by(None)
+
+        # `count(*) OVER ()` would count the joined rows instead of the items.
+        if count_strategy == "window" and self._joins_collections(options):
+            count_strategy = "exact"
+
+        if count_strategy == "window":
+            return await self._get_multi_window(
+                db, statement, params, ordering, page, shows, columns, **kwargs
             )
 
-        if complex_filters is not None:
-            statement = self.apply_filters(complex_filters, statement)
+        paginated = self._paginate(statement, ordering)
+        page_params = {**params, "offset": page, "limit": shows}
+
+        if count_strategy == "concurrent":
+            count, result = await asyncio.gather(
+                self._count_on_new_connection(db, statement, params),
+                db.execute(paginated, page_params, **kwargs),
+            )
+            results = result.all() if columns else result.unique().scalars().all()
+            return results or EMPTY, count
+
+        count = None
+        if count_strategy == "exact":
+            count = await self.count(db, statement, params)
+        elif count_strategy == "estimated":
+            count = await self.estimate_count(db, statement, params)
+
+        result = await db.execute(paginated, page_params, **kwargs)
+        results = result.all() if columns else result.unique().scalars().all()
+
+        return results or EMPTY, count
+
+    async def _get_multi_window(
+        self,
+        db: AsyncSession,
+        statement: Select[tuple[ModelType]],
+        params: dict[str, Any],
+        ordering: list[tuple[str, bool]],
+        page: int,
+        shows: int,
+        columns: list[str] | None = None,
+        **kwargs: Unpack[Kwargs],
+    ) -> tuple[list[ModelType] | list[Row[Any]] | EMPTY_TYPE, int | None]:
+        """
+        Page and total in one round trip, the window function is evaluated before
+        `LIMIT` so every row carries the count of the whole filtered set.
+        """
+        windowed = statement_cache.derive(
+            statement,
+            "window",
+            lambda: statement.add_columns(sql_func.count().over().label("total")),
+        )
+        paginated = self._paginate(windowed, ordering)
+        page_params = {**params, "offset": page, "limit": shows}
+        rows = (await db.execute(paginated, page_params, **kwargs)).unique().all()
+
+        # A page past the end has no rows to read the total from.
+        if not rows:
+            return EMPTY, await self.count(db, statement, params)
+
+        if columns:
+            return list(rows), rows[0].total
+
+        return [row[0] for row in rows], rows[0].total
+
+    def _joins_collections(
+        self, options: list[tuple[str, StrategyOptions]] | None
+    ) -> bool:
+        """Whether collections are eager loaded with a join, one row per child."""
+        strategies: dict[str, str] = {
+            rel.key: rel.lazy
+            for rel in inspect(self.model).relationships
+            if rel.uselist
+        }
+        for attr, strat_op in options or []:
+            if attr in strategies:
+                strategies[attr] = strat_op
+
+        return any(
+            strategy in ("joined", "joinedload", "contains_eager")
+            for strategy in strategies.values()
+        )
+
+    async def get_multi_by_cursor(
+        self,
+        db: AsyncSession,
+        *,
+        where: dict[str, Any] | None = None,
+        cursor: str | None = None,
+        shows: int = 100,
+        ordering: list[tuple[str, bool]] | None = None,
+        options: list[tuple[str, StrategyOptions]] | None = None,
+        complex_filters: list[FilterTypes] | None = None,
+        fields: Fields | None = None,
+        **kwargs: Unpack[Kwargs],
+    ) -> tuple[list[ModelType] | EMPTY_TYPE, str | None]:
+        """
+        Get multiple items using keyset (cursor) pagination.
+
+        Instead of skipping `OFFSET` rows, the page starts right after the row encoded
+        in `cursor`, so deep pages cost the same as the first one as long as there is
+        an index on the ordering columns. `id` is always appended as the tiebreaker.
+        With `fields` only those columns (plus the ordering ones) are loaded.
+        Returns the page and the cursor of the next one (`None` on the last page).
+        """
+        kwargs = self._read_kwargs(kwargs)
 
         if ordering is None:
             ordering = [("date_added", True)]
 
-        if options is not None:
-            statement = self.options(statement, options)
+        if not any(attr == "id" for attr, _ in ordering):
+            ordering = [*ordering, ("id", ordering[-1][1] if ordering else True)]
+
+        columns = [self._column(attr) for attr, _ in ordering]
+        directions = [is_desc for _, is_desc in ordering]
 
-        ordered = cast("Select[tuple[ModelType]]", self.order_by(statement, ordering))
-        paginated = ordered.offset(page).limit(shows)
+        if fields is not None:
+            names = _schema_fields(fields) if isinstance(fields, type) else fields
+            fields = [*names, *(column.key for column in columns)]
 
-        count = await self.count(db, statement)
+        statement = self._select_multi(where, complex_filters, options, fields)
+
+        if cursor:
+            values = decode_cursor(cursor, columns)
+            statement = statement.where(keyset_predicate(columns, directions, values))
+
+        # Keyset pages can only follow `ordering`, search ranks are dropped.
+        paginated = self.order_by(statement.order_by(None), ordering).limit(shows + 1)
         results = (await db.execute(paginated, **kwargs)).unique().scalars().all()
 
-        return results or EMPTY, count
+        next_cursor = None
+        if len(results) > shows:
+            results = results[:shows]
+            next_cursor = encode_cursor(
+                [getattr(results[-1], column.key) for column in columns]
+            )
+
+        return results or EMPTY, next_cursor
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        where: dict[str, Any] | None = None,
+        complex_filters: list[FilterTypes] | None = None,
+        ordering: list[tuple[str, bool]] | None = None,
+        options: list[tuple[str, StrategyOptions]] | None = None,
+        columns: list[str] | None = None,
+        fields: Fields | None = None,
+        batch_size: int = 1_000,
+        **kwargs: Unpack[Kwargs],
+    ) -> AsyncIterator[ModelType | Row[Any]]:
+        """
+        Iterate over every matching item through a server-side cursor.
+
+        Rows are fetched `batch_size` at a time, so memory stays bounded no matter how
+        big the table is, meant for full scans of analytics jobs instead of `get_multi`
+        with growing offsets. Unordered unless `ordering` is given. With `columns` only
+        those columns are selected and rows are yielded as named tuples instead of
+        entities, with `fields` entities only have those columns loaded.
+        """
+        statement = self._select_multi(where, complex_filters)
+
+        if columns is not None:
+            statement = statement.with_only_columns(
+                *[getattr(self.model, column) for column in columns]
+            )
+        else:
+            statement = statement.options(
+                *self._selectin_loaders(options),
+                *self._load_only(self._fields_key(fields)),
+            )
+
+        if ordering is not None:
+            statement = self.order_by(statement.order_by(None), ordering)
+
+        result = await db.stream(
+            statement.execution_options(yield_per=batch_size), **kwargs
+        )
+
+        # Closes the server-side cursor when the consumer stops early or raises too,
+        # `contextlib.aclosing` makes that happen right away instead of on collection.
+        try:
+            if columns is not None:
+                async for row in result:
+                    yield row
+            else:
+                async for obj in result.scalars():
+                    yield obj
+        finally:
+            await result.close()
 
     async def create(
         self,
@@ -152,15 +622,23 @@ class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
             obj_in: dict[str, Any] = obj_in.model_dump(mode="python", exclude=exclude)
 
         obj_in = cast("dict[str, Any]", obj_in)  # Redefinition because of type hinting
-        stmt = insert(self.model).values(**obj_in).returning(self.model.id)
+        stmt = (
+            insert(self.model)
+            .values(**obj_in)
+            .returning(self.model)
+            .options(*self._selectin_loaders(options))
+        )
 
         with catch_sqlalchemy_exception():
-            obj_id = cast("int", (await db.execute(stmt)).unique().scalar_one())
+            await self._before_write(db, [obj_in])
+            obj = cast("ModelType", (await db.execute(stmt)).unique().scalar_one())
 
             if commit:
                 await db.commit()
 
-        return await self.get(db, obj_id, options)
+        self._bump_version(db, commit)
+
+        return obj
 
     async def create_many(
         self,
@@ -178,13 +656,206 @@ class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
         )
 
         with catch_sqlalchemy_exception():
+            await self._before_write(db, objs_in_data)
             ids = (await db.execute(stmnt)).unique().scalars().all()
 
             if commit:
                 await db.commit()
 
+        self._bump_version(db, commit)
+
         return ids
 
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Iterable[CreateSchema | dict[str, Any]],
+        chunk_size: int = 5_000,
+        validate: bool = True,
+        return_ids: bool = False,
+        commit: bool = True,
+    ) -> list[int] | int:
+        """
+        Insert many items through `COPY`, for imports too big for `create_many`.
+
+        `objs_in` is consumed lazily and sent `chunk_size` rows at a time, so it can be
+        a generator over a file or an API response. Dicts are validated with the create
+        schema unless `validate` is `False`, meant for trusted internal sources, schema
+        instances are taken as valid either way. Rows may leave different columns out.
+        Returns the number of inserted rows, or their ids with `return_ids` (these are
+        taken from the `id` sequence before copying each chunk, one query per chunk).
+        """
+        table = cast("Table", self.model.__table__)
+        connection = await db.connection()
+        ids: list[int] = []
+        total = 0
+
+        with catch_sqlalchemy_exception(), catch_driver_exception("copying rows"):
+            driver = await driver_connection(connection)
+
+            for chunk in chunked(objs_in, chunk_size):
+                rows = [self._bulk_row(obj_in, validate) for obj_in in chunk]
+                await self._before_write(db, rows)
+
+                if return_ids:
+                    params = {"table": table.fullname, "rows": len(rows)}
+                    chunk_ids = (await connection.execute(NEXTVAL, params)).scalars()
+
+                    for row, row_id in zip(rows, chunk_ids):
+                        row["id"] = row_id
+                        ids.append(row_id)
+
+                total += await copy_rows(driver, table, rows, connection.dialect)
+
+            if commit:
+                await db.commit()
+
+        self._bump_version(db, commit)
+
+        return ids if return_ids else total
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Iterable[CreateSchema | dict[str, Any]],
+        conflict_columns: list[str],
+        update_columns: list[str] | None = None,
+        chunk_size: int = 1_000,
+        validate: bool = True,
+        commit: bool = True,
+    ) -> UpsertResult:
+        """
+        Insert many items, updating the ones that already exist.
+
+        One `INSERT ... ON CONFLICT (conflict_columns)` per chunk, `conflict_columns`
+        must match a unique constraint of the table. `update_columns` defaults to the
+        columns of the model given in the rows, but the conflict ones, the primary key
+        and `date_added`, an empty list means `DO NOTHING`. Rows whose values didn't
+        change aren't rewritten, so re-syncing the same window twice doesn't bloat the
+        table. When a chunk repeats a key the last row wins (Postgres can't update a
+        row twice in one statement), the others count as unchanged. Rows are written
+        in groups with the same keys, a column some rows leave out isn't updated in
+        those.
+        """
+        table = cast("Table", self.model.__table__)
+        result = UpsertResult()
+        updated_ids: list[int] = []
+
+        with catch_sqlalchemy_exception("upserting rows"):
+            for chunk in chunked(objs_in, chunk_size):
+                by_key = {
+                    tuple(row.get(column) for column in conflict_columns): row
+                    for row in (self._bulk_row(obj_in, validate) for obj_in in chunk)
+                }
+                rows = list(by_key.values())
+                result.unchanged += len(chunk) - len(rows)
+                await self._before_write(db, rows)
+
+                # Every row of a multi-row `VALUES` needs the same keys, and columns
+                # some rows leave out must not be updated in those.
+                groups: dict[frozenset[str], list[dict[str, Any]]] = {}
+                for row in rows:
+                    groups.setdefault(frozenset(row), []).append(row)
+
+                for given, group in groups.items():
+                    columns = update_columns
+                    if columns is None:
+                        columns = self._update_columns(group, conflict_columns)
+
+                    # Postgres can't bind more than `MAX_PARAMETERS` values per
+                    # statement, python side defaults of the columns left out too.
+                    bound = len(insert_columns(table, given))
+                    per_statement = max(1, MAX_PARAMETERS // bound)
+
+                    for start in range(0, len(group), per_statement):
+                        batch = group[start : start + per_statement]
+                        stmt = self._upsert_statement(batch, conflict_columns, columns)
+                        written = (await db.execute(stmt)).all()
+                        inserted = sum(row.inserted for row in written)
+                        updated_ids.extend(
+                            row.id for row in written if not row.inserted
+                        )
+
+                        result.inserted += inserted
+                        result.updated += len(written) - inserted
+                        result.unchanged += len(batch) - len(written)
+
+            if commit:
+                await db.commit()
+
+        self._bump_version(db, commit)
+        await self._evict(db, updated_ids, commit)
+
+        return result
+
+    async def _before_write(self, db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+        """
+        Hook run in the transaction of the writes, with the rows about to be inserted
+        or the values of an update, e.g. to create what they need first.
+        """
+
+    def _update_columns(
+        self, rows: list[dict[str, Any]], conflict_columns: list[str]
+    ) -> list[str]:
+        given = set().union(*rows)
+        return [
+            column.key
+            for column in cast("Table", self.model.__table__).columns
+            if column.key in given
+            and column.key not in conflict_columns
+            and not column.primary_key
+            and column.key != "date_added"
+        ]
+
+    def _upsert_statement(
+        self,
+        rows: list[dict[str, Any]],
+        conflict_columns: list[str],
+        update_columns: list[str],
+    ) -> Insert:
+        table = cast("Table", self.model.__table__)
+        stmt = pg_insert(table).values(rows)
+
+        if not update_columns:
+            stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+        else:
+            current = tuple_(*[table.c[column] for column in update_columns])
+            excluded = tuple_(*[stmt.excluded[column] for column in update_columns])
+            set_ = {column: stmt.excluded[column] for column in update_columns}
+
+            if "date_updated" in table.c and "date_updated" not in set_:
+                set_["date_updated"] = sql_func.now()
+
+            stmt = stmt.on_conflict_do_update(
+                index_elements=conflict_columns,
+                set_=set_,
+                where=current.is_distinct_from(excluded),
+            )
+
+        # `xmax` is only 0 for tuples created by this statement.
+        return stmt.returning(table.c.id, literal_column("xmax = 0").label("inserted"))
+
+    def _bulk_row(
+        self, obj_in: CreateSchema | dict[str, Any], validate: bool
+    ) -> dict[str, Any]:
+        if isinstance(obj_in, BaseModel):
+            return obj_in.model_dump(mode="python")
+        if validate:
+            return self.create_schema.model_validate(obj_in).model_dump(mode="python")
+
+        return dict(obj_in)
+
+    @cached_property
+    def create_schema(self) -> type[CreateSchema]:
+        """The `CreateSchema` the DAO subclass was parametrized with."""
+        for base in getattr(type(self), "__orig_bases__", ()):
+            if get_origin(base) is DAO:
+                return get_args(base)[1]
+
+        raise TypeError(f"{type(self).__name__} doesn't declare its create schema.")
+
     async def update(
         self,
         db: AsyncSession,
@@ -204,26 +875,37 @@ class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
             sql_update(self.model)
             .where(self.model.id == db_obj_id)
             .values(**update_data)
-            .returning(self.model.id)
+            .returning(self.model)
+            .options(*self._selectin_loaders(options))
+            .execution_options(populate_existing=True)
         )
 
         with catch_sqlalchemy_exception():
-            obj_id = (await db.execute(stmt)).scalar_one()
+            await self._before_write(db, [update_data])
+            obj = cast("ModelType", (await db.execute(stmt)).unique().scalar_one())
 
             if commit:
                 await db.commit()
 
-        return await self.get(db, obj_id, options)
+        self._bump_version(db, commit)
+        await self._evict(db, [db_obj_id], commit)
+
+        return obj
 
     async def delete(
         self, db: AsyncSession, db_object: ModelType, *, commit: bool = True
     ) -> ModelType:
+        _id = db_object.id
+
         with catch_sqlalchemy_exception():
             deleted = await db.delete(db_object)
 
             if commit:
                 await db.commit()
 
+        self._bump_version(db, commit)
+        await self._evict(db, [_id], commit)
+
         return deleted
 
     async def delete_many(
@@ -241,46 +923,307 @@ class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
             if commit:
                 await db.commit()
 
+        self._bump_version(db, commit)
+        await self._evict(db, deleted, commit)
+
         return deleted
 
-    async def count(self, db: AsyncSession, statement: Select) -> int | None:
+    async def count(
+        self,
+        db: AsyncSession,
+        statement: Select,
+        params: dict[str, Any] | None = None,
+    ) -> int | None:
         """Count the number of rows."""
-        count_statement = statement.with_only_columns(
-            sql_func.count(),
-            maintain_column_froms=True,
+        count_statement = self._count_statement(statement)
+        bind_arguments = {REPLICA: self._table}
+
+        if not self.count_cache_ttl:
+            return (
+                await db.execute(count_statement, params, bind_arguments=bind_arguments)
+            ).scalar_one_or_none()
+
+        # The key is built before running the query so a write that lands meanwhile
+        # bumps the table version and the result is never served under the new one.
+        key = count_cache.key(self.model.__tablename__, count_statement, params)
+        if key is not None and (cached := count_cache.get(key)) is not MISSING:
+            return cached
+
+        count = (
+            await db.execute(count_statement, params, bind_arguments=bind_arguments)
+        ).scalar_one_or_none()
+
+        if key is not None:
+            count_cache.set(key, count, self.count_cache_ttl)
+
+        return count
+
+    async def _count_on_new_connection(
+        self,
+        db: AsyncSession,
+        statement: Select,
+        params: dict[str, Any] | None = None,
+    ) -> int | None:
+        """Count on a connection of its own so it can run alongside a query on `db`."""
+        bind = db.sync_session.get_bind(clause=statement, **{REPLICA: self._table})
+
+        async with AsyncSession(async_engine(bind)) as count_db:
+            return await self.count(count_db, statement, params)
+
+    async def estimate_count(
+        self,
+        db: AsyncSession,
+        statement: Select,
+        params: dict[str, Any] | None = None,
+    ) -> int | None:
+        """
+        Estimate the number of rows without scanning them.
+
+        Unfiltered statements read `pg_class.reltuples`, filtered ones the row estimate
+        of the planner (`EXPLAIN`). Falls back to the exact count when there are no
+        statistics for the table.
+
+        The filter values stay bound parameters, so every value shares the prepared
+        statement of its filter shape instead of preparing a new one.
+        """
+        if statement.whereclause is None:
+            estimate = (
+                await db.execute(_RELTUPLES, {"table": self.model.__table__.fullname})
+            ).scalar_one_or_none()
+
+            # `-1` (or `0` on older Postgres) means the table was never analyzed.
+            if estimate is not None and estimate > 0:
+                return estimate
+
+            return await self.count(db, statement, params)
+
+        rows_statement = statement.with_only_columns(
+            self.model.id, maintain_column_froms=True
         ).order_by(None)
 
-        return (await db.execute(count_statement)).scalar_one_or_none()
+        plan = (
+            await db.execute(
+                _Explain(rows_statement), params, bind_arguments={REPLICA: self._table}
+            )
+        ).scalar_one()
+
+        if isinstance(plan, str | bytes):
+            plan = deserialize_object(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _count_statement(self, statement: Select) -> Select:
+        return statement_cache.derive(
+            statement,
+            "count",
+            lambda: statement.with_only_columns(
+                sql_func.count(),
+                maintain_column_froms=True,
+            ).order_by(None),
+        )
+
+    def warmup_statements(self) -> list[tuple[Select, dict[str, Any]]]:
+        """
+        The statements of `get` and of the page of `get_multi` with its defaults, the
+        same objects the statement cache hands out, with parameters that match no rows.
+        See `StatementWarmup`. Counts are left out, they can't run without scanning.
+        """
+        by_id, _ = self._cached_select({"id": 0})
+        statements = [(by_id, {"where_id": None})]
+
+        if hasattr(self.model, "date_added"):
+            listing, _ = self._cached_select(None)
+            page = self._paginate(listing, [("date_added", True)])
+            statements.append((page, {"offset": 0, "limit": 0}))
+
+        return statements
+
+    def _bump_version(self, db: AsyncSession, commit: bool) -> None:
+        """
+        Invalidate every cache derived from this model's table, after the commit.
+        Without `commit` the caller commits later, until then other sessions still read
+        the old rows and may cache them under the new version, so it's bumped again.
+        """
+        table_versions.bump(self._table)
+
+        if not commit:
+            event.listen(
+                db.sync_session,
+                "after_commit",
+                lambda _: table_versions.bump(self._table),
+                once=True,
+            )
+
+    def _selectin_loaders(
+        self, options: list[tuple[str, StrategyOptions]] | None = None
+    ) -> list[ExecutableOption]:
+        """
+        Turn every eager relationship, requested in `options` or configured on the
+        model, into `selectinload` for statements relationships can't be joined into:
+        `INSERT/UPDATE ... RETURNING` and `yield_per` streams of collections.
+        Models without them get no options, so writes stay a single statement.
+        """
+        strategies = {
+            rel.key: "selectinload"
+            for rel in inspect(self.model).relationships
+            if rel.lazy in _EAGER_LAZY
+        }
+        strategies.update(options or [])
+
+        return [
+            strategy_options.selectinload(getattr(self.model, attr))
+            for attr, strategy in strategies.items()
+            if strategy in _EAGER_STRATEGIES
+        ]
+
+    def _cached_select(
+        self,
+        where: dict[str, Any] | None,
+        options: list[tuple[str, StrategyOptions]] | None = None,
+        fields: Fields | None = None,
+    ) -> tuple[Select[tuple[ModelType]], dict[str, Any]]:
+        """
+        Get the statement filtering by the keys of `where` from the statement cache,
+        along with the parameters to execute it with.
+
+        `None` values are part of the statement shape (`IS NULL`), the rest are bound
+        at execution as `where_<key>`.
+        """
+        where = where or {}
+        shape = tuple((k, v is None) for k, v in where.items())
+        fields_key = self._fields_key(fields)
+
+        def build() -> Select[tuple[ModelType]]:
+            statement = select(self.model).where(
+                *[
+                    getattr(self.model, k).is_(None)
+                    if is_null
+                    else getattr(self.model, k) == bindparam(f"where_{k}")
+                    for k, is_null in shape
+                ]
+            )
+            statement = statement.options(*self._load_only(fields_key))
+            return self.options(statement, options)
+
+        statement = statement_cache.get(
+            (self.model, "select", shape, self._options_key(options), fields_key),
+            build,
+        )
+        params = {f"where_{k}": v for k, v in where.items() if v is not None}
+
+        return statement, params
+
+    def _paginate(self, statement: Select, ordering: list[tuple[str, bool]]) -> Select:
+        """Order `statement` and bind `offset` and `limit` at execution."""
+        return statement_cache.derive(
+            statement,
+            ("page", tuple(ordering)),
+            lambda: (
+                self.order_by(statement, ordering)
+                .offset(bindparam("offset", type_=Integer))
+                .limit(bindparam("limit", type_=Integer))
+            ),
+        )
+
+    def _project(self, statement: Select, columns: list[str]) -> Select:
+        """Select only `columns` of the items of `statement`."""
+        return statement_cache.derive(
+            statement,
+            ("columns", tuple(columns)),
+            lambda: statement.with_only_columns(
+                *[getattr(self.model, column) for column in columns]
+            ),
+        )
+
+    def _fields_key(self, fields: Fields | None) -> tuple[str, ...] | None:
+        """Sorted column names to load for `fields`, `None` to load all of them."""
+        if fields is None:
+            return None
+
+        names = _schema_fields(fields) if isinstance(fields, type) else fields
+        column_attrs = inspect(self.model).column_attrs
+
+        return tuple(sorted({name for name in names if name in column_attrs}))
+
+    def _load_only(self, fields_key: tuple[str, ...] | None) -> list[ExecutableOption]:
+        if fields_key is None:
+            return []
+
+        return [load_only(*[getattr(self.model, name) for name in fields_key])]
+
+    @staticmethod
+    def _options_key(
+        options: list[tuple[str, StrategyOptions]] | None,
+    ) -> tuple[tuple[str, StrategyOptions], ...] | None:
+        return tuple(options) if options else None
+
+    def _select_multi(
+        self,
+        where: dict[str, Any] | None = None,
+        complex_filters: list[FilterTypes] | None = None,
+        options: list[tuple[str, StrategyOptions]] | None = None,
+        fields: Fields | None = None,
+    ) -> Select[tuple[ModelType]]:
+        """Build the filtered, unordered statement shared by the multi item reads."""
+        statement = select(self.model).options(
+            *self._load_only(self._fields_key(fields))
+        )
+
+        if where is not None:
+            statement = statement.where(
+                *[getattr(self.model, k) == v for k, v in where.items()],
+            )
+
+        if complex_filters is not None:
+            statement = self.apply_filters(complex_filters, statement)
+
+        if options is not None:
+            statement = self.options(statement, options)
+
+        return statement
+
+    def _column(self, attr: str) -> InstrumentedAttribute:
+        """Get a column attribute of the model, relationships are not allowed."""
+        field = getattr(self.model, attr, None)
+
+        # A wrong ordering is a bug of the caller, not a bad cursor (a 400).
+        if field is None or isinstance(field.prop, RelationshipProperty):
+            raise ValueError(f"Can't paginate by cursor on {attr!r}.")
+
+        return cast("InstrumentedAttribute", field)
 
     def apply_filters(
         self, filters: list[FilterTypes], statement: Select[ModelType]
     ) -> Select[ModelType]:
         """Apply filters to the statement."""
+        date_added = cast("InstrumentedAttribute", self.model.date_added)
+        day = dt.timedelta(days=1)
+
         for filter_ in filters:
             if isinstance(filter_, DateAdded) and filter_.date_added is not None:
                 statement = statement.where(
-                    sql_func.date(self.model.date_added) == filter_.date_added
+                    *_date_range(
+                        date_added, filter_.date_added, filter_.date_added + day
+                    )
                 )
             elif isinstance(filter_, Before) and filter_.date_added is not None:
                 statement = statement.where(
-                    sql_func.date(self.model.date_added) < filter_.date_added
+                    *_date_range(date_added, end=filter_.date_added)
                 )
             elif isinstance(filter_, After) and filter_.date_added is not None:
                 statement = statement.where(
-                    sql_func.date(self.model.date_added) > filter_.date_added
+                    *_date_range(date_added, start=filter_.date_added + day)
                 )
             elif isinstance(filter_, BeforeAfter) and (
                 filter_.date_after is not None and filter_.date_before is not None
             ):
                 statement = statement.where(
-                    sql_func.date(self.model.date_added) >= filter_.date_after,
-                    sql_func.date(self.model.date_added) <= filter_.date_before,
+                    *_date_range(
+                        date_added, filter_.date_after, filter_.date_before + day
+                    )
                 )
             elif isinstance(filter_, Search) and filter_.field_name is not None:
-                attr = cast(
-                    "InstrumentedAttribute", getattr(self.model, filter_.field_name)
-                )
-                statement = statement.where(attr.ilike(f"%{filter_.value}%"))
+                statement = self.search(statement, filter_.field_name, filter_.value)
             elif (
                 isinstance(filter_, FieldFilter)
                 and filter_.field is not None
@@ -293,15 +1236,28 @@ class DAO(Generic[ModelType, CreateSchema, UpdateSchema]):
                     "InstrumentedAttribute",
                     getattr(self.model, filter_.field_name or "date_added", None),
                 )
+                month = filter_.month.replace(day=1)
                 statement = statement.where(
-                    sql_func.date_trunc("MONTH", attr)
-                    == sql_func.date_trunc("MONTH", filter_.month),
+                    *_date_range(attr, month, _next_month(month))
                 )
             elif isinstance(filter_, AnyFieldFilter) and filter_.any_value is not None:
                 statement = self.any_filter()
 
         return statement
 
+    def search(self, statement: Select, field: str, value: str | None) -> Select:
+        """Filter by `value` on `field` with its backend from `search_fields`."""
+        if not value:
+            return statement
+
+        backend = self.search_fields.get(field, _ILIKE)
+        statement = statement.where(backend.where(self.model, field, value))
+
+        if (rank := backend.rank(self.model, field, value)) is not None:
+            statement = statement.order_by(rank.desc())
+
+        return statement
+
     def order_by(
         self,
         statement: Select,
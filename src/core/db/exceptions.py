@@ -1,6 +1,12 @@
 from contextlib import contextmanager
 from typing import Optional
 
+from asyncpg.exceptions import (
+    ConnectionDoesNotExistError,
+    IntegrityConstraintViolationError,
+    InterfaceError,
+    PostgresError,
+)
 from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 
 
@@ -133,3 +139,28 @@ def catch_sqlalchemy_exception(operation_name: str = "database operation"):
                     f"Unexpected database error while {operation_name}: {str(e)}",
                     original_error=e,
                 )
+
+
+@contextmanager
+def catch_driver_exception(operation_name: str = "database operation"):
+    """
+    Same as `catch_sqlalchemy_exception` for code that talks to asyncpg directly
+    (e.g. `COPY`), whose errors never go through SQLAlchemy.
+    """
+    try:
+        yield
+    except IntegrityConstraintViolationError as e:
+        raise DatabaseConstraintError(
+            f"Constraint violation while {operation_name}: {str(e)}",
+            original_error=e,
+        )
+    except (ConnectionDoesNotExistError, InterfaceError) as e:
+        raise DatabaseConnectionError(
+            f"Database connection error while {operation_name}: {str(e)}",
+            original_error=e,
+        )
+    except PostgresError as e:
+        raise DatabaseError(
+            f"Unexpected database error while {operation_name}: {str(e)}",
+            original_error=e,
+        )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.core.types import MISSING_TYPE
+
+    from .dao import DAO
+
+
+_T = TypeVar("_T")
+
+
+class BatchLoader(Generic[_T]):
+    """
+    DataLoader style batcher for `DAO.get`.
+
+    Every `load` made before the event loop gets back to it (e.g. the coroutines of an
+    `asyncio.gather`) is collected and resolved with a single `DAO.get_many`, repeated
+    ids share the same future. Loaders live in `db.info`, so they are as short lived
+    as the request session, use `DAO.loader(db)` to get one.
+    """
+
+    __slots__ = ("_dao", "_db", "_lock", "_pending", "_tasks")
+
+    def __init__(self, dao: DAO[Any, Any, Any], db: AsyncSession) -> None:
+        self._dao = dao
+        self._db = db
+        # A session runs one statement at a time, batches formed while another one is
+        # being fetched wait for it.
+        self._lock = asyncio.Lock()
+        self._pending: dict[int, asyncio.Future[_T | MISSING_TYPE]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, _id: int) -> _T | MISSING_TYPE:
+        future = self._pending.get(_id)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+
+            if not self._pending:
+                loop.call_soon(self._schedule)
+
+            future = self._pending[_id] = loop.create_future()
+
+        # Shielded, a cancelled caller (e.g. a request timeout) mustn't cancel the
+        # future the other callers of the same id wait for.
+        return await asyncio.shield(future)
+
+    async def load_many(self, ids: list[int]) -> list[_T | MISSING_TYPE]:
+        return list(await asyncio.gather(*[self.load(_id) for _id in ids]))
+
+    def _schedule(self) -> None:
+        # Keep a reference to the task, the loop only holds weak ones.
+        task = asyncio.get_running_loop().create_task(self._dispatch())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+
+        try:
+            async with self._lock:
+                results = await self._dao.get_many(self._db, list(pending))
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future, result in zip(pending.values(), results):
+                if not future.done():
+                    future.set_result(result)
@@ -106,6 +106,7 @@ class Date:
         DateTime(timezone=True),
         default_factory=datetime_now,
         server_default=func.now(),
+        index=True,
     )
     date_updated: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any
+
+import orjson
+from sqlalchemy import and_, false, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+
+from src.core.utils import deserialize_object, serialize_object
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded or doesn't fit the ordering."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the ordering values of the last row of a page into an opaque cursor.
+
+    The cursor is the urlsafe base64 of a JSON array, padding stripped so it can
+    travel in query strings as is.
+    """
+    raw = serialize_object(list(values)).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, columns: Sequence[InstrumentedAttribute]) -> list[Any]:
+    """Decode a cursor back into values typed after the given ordering `columns`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = deserialize_object(raw)
+    except (binascii.Error, orjson.JSONDecodeError, ValueError) as e:
+        raise InvalidCursorError("Invalid pagination cursor.") from e
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise InvalidCursorError("Pagination cursor doesn't match the ordering.")
+
+    try:
+        return [_coerce(column, value) for column, value in zip(columns, values)]
+    except (TypeError, ValueError, ArithmeticError) as e:
+        raise InvalidCursorError("Invalid pagination cursor.") from e
+
+
+def keyset_predicate(
+    columns: Sequence[InstrumentedAttribute],
+    directions: Sequence[bool],
+    values: Sequence[Any],
+) -> ColumnElement[bool]:
+    """
+    Build the `WHERE` clause that selects the rows coming after `values`.
+
+    When every column is sorted in the same direction a row-value comparison is
+    used, e.g. `(price_date, id) < (:v1, :v2)`, which Postgres resolves with a
+    single index range scan. Mixed directions and nullable columns fall back to the
+    expanded form `(a > :a) OR (a = :a AND b < :b) ...`, where NULLs sort as
+    Postgres does by default: last ascending, first descending.
+    """
+    if len(set(directions)) == 1 and not any(map(_nullable, columns)):
+        left, right = tuple_(*columns), tuple(values)
+        return left < right if directions[0] else left > right
+
+    clauses = []
+    for i, (column, is_desc) in enumerate(zip(columns, directions)):
+        equals = [_equals(columns[j], values[j]) for j in range(i)]
+        clauses.append(and_(*equals, _after(column, is_desc, values[i])))
+
+    return or_(*clauses)
+
+
+def _nullable(column: InstrumentedAttribute) -> bool:
+    return bool(getattr(column.expression, "nullable", True))
+
+
+def _equals(column: InstrumentedAttribute, value: Any) -> ColumnElement[bool]:
+    return column.is_(None) if value is None else column == value
+
+
+def _after(
+    column: InstrumentedAttribute, is_desc: bool, value: Any
+) -> ColumnElement[bool]:
+    # NULLs are greater than any value.
+    if value is None:
+        return column.is_not(None) if is_desc else false()
+    if is_desc:
+        return column < value
+    if _nullable(column):
+        return or_(column > value, column.is_(None))
+
+    return column > value
+
+
+def _coerce(column: InstrumentedAttribute, value: Any) -> Any:
+    """Turn a JSON decoded value back into the python type of `column`."""
+    if value is None:
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    if isinstance(value, python_type):
+        return value
+    if python_type in (datetime, date):
+        return python_type.fromisoformat(value)
+
+    return python_type(value)
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DDL, Table, event, text
+
+from src.core.constants import TZ
+
+from .model import Base
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+
+# Creates the monthly partitions `{parent}_YYYY_MM` of a table partitioned by range
+# of a `timestamptz` column, from the month of `since` and `months` more, skipping the
+# existing ones. Bounds are UTC months. Returns how many it created.
+CREATE_PARTITIONS_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION create_monthly_partitions(
+        parent regclass, since date, months int
+    ) RETURNS int LANGUAGE plpgsql AS $$
+    DECLARE
+        month_start date := date_trunc('month', since)::date;
+        month_end date;
+        partition_name text;
+        created int := 0;
+    BEGIN
+        FOR i IN 0..months LOOP
+            month_end := month_start + interval '1 month';
+            partition_name := format(
+                '%%s_%%s', parent, to_char(month_start, 'YYYY_MM')
+            );
+
+            IF to_regclass(partition_name) IS NULL THEN
+                EXECUTE format(
+                    'CREATE TABLE %%I PARTITION OF %%s '
+                    'FOR VALUES FROM (%%L) TO (%%L)',
+                    partition_name,
+                    parent,
+                    month_start::timestamp AT TIME ZONE 'UTC',
+                    month_end::timestamp AT TIME ZONE 'UTC'
+                );
+                created := created + 1;
+            END IF;
+
+            month_start := month_end;
+        END LOOP;
+
+        RETURN created;
+    END
+    $$
+    """
+)
+event.listen(
+    Base.metadata,
+    "before_create",
+    CREATE_PARTITIONS_FUNCTION.execute_if(dialect="postgresql"),
+)
+
+CREATE_PARTITIONS = text("SELECT create_monthly_partitions(:parent, :since, :months)")
+PARTITIONS = text(
+    "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+    "FROM pg_inherits JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+    "WHERE pg_inherits.inhparent = CAST(:parent AS regclass) "
+    "ORDER BY child.relname"
+)
+IS_PARTITIONED = text(
+    "SELECT EXISTS (SELECT FROM pg_partitioned_table "
+    "WHERE partrelid = to_regclass(:parent))"
+)
+# Indexes and sequences of a table, renamed along with it by `partition_table`.
+OWNED_RELATIONS = text(
+    "SELECT 'INDEX', index_rel.relname FROM pg_index "
+    "JOIN pg_class AS index_rel ON index_rel.oid = pg_index.indexrelid "
+    "WHERE pg_index.indrelid = CAST(:table AS regclass) "
+    "UNION ALL "
+    "SELECT 'SEQUENCE', sequence_rel.relname FROM pg_depend "
+    "JOIN pg_class AS sequence_rel ON sequence_rel.oid = pg_depend.objid "
+    "WHERE pg_depend.refobjid = CAST(:table AS regclass) "
+    "AND sequence_rel.relkind = 'S' AND pg_depend.deptype IN ('a', 'i')"
+)
+_BOUNDS = re.compile(r"FROM \('(.+?)'\) TO \('(.+?)'\)")
+
+
+def partition_monthly(table: Table, ahead: int) -> None:
+    """
+    Create the partitions of the current month and `ahead` more along with `table`,
+    declared with `{"postgresql_partition_by": "RANGE (<timestamptz column>)"}`.
+    Later months need `create_partitions` to run periodically.
+    """
+    event.listen(
+        table,
+        "after_create",
+        DDL(
+            f"SELECT create_monthly_partitions('{table.name}', current_date, {ahead})"
+        ).execute_if(dialect="postgresql"),
+    )
+
+
+class MonthlyPartitions:
+    """
+    Creates the missing monthly partitions of `parent` before rows are written to
+    them, e.g. prices of past months, as only the current month and the following
+    ones are created in advance.
+
+    The months known to have a partition are remembered, the recent ones only: the
+    retention policy may drop the older ones, from another process too. Nothing is
+    done while `parent` isn't partitioned yet (see `partition_table`), which is
+    checked once.
+    """
+
+    def __init__(self, parent: str) -> None:
+        self.parent = parent
+        self._months: set[date] = set()
+        self._partitioned: bool | None = None
+
+    async def ensure(self, db: AsyncSession, dates: Iterable[datetime]) -> int:
+        """
+        Create the partitions of the months of `dates` that don't exist, in the
+        transaction of `db` (not committed). Returns how many were created.
+        """
+        if self._partitioned is None:
+            params = {"parent": self.parent}
+            self._partitioned = (await db.execute(IS_PARTITIONED, params)).scalar_one()
+        if not self._partitioned:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        year, month = divmod(now.year * 12 + now.month - 2, 12)
+        # Never dropped, the retention keeps the previous month at least.
+        recent = date(year, month + 1, 1)
+        created = 0
+
+        for month_start in {month_of(value) for value in dates} - self._months:
+            params = {"parent": self.parent, "since": month_start, "months": 0}
+            new = (await db.execute(CREATE_PARTITIONS, params)).scalar_one()
+            created += new
+
+            # New partitions are remembered once seen committed, on the next write.
+            if not new and month_start >= recent:
+                self._months.add(month_start)
+
+        return created
+
+
+def month_of(value: datetime) -> date:
+    """First day of the UTC month of `value`, naive values are in `TZ`."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=TZ)
+
+    value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    lower: datetime
+    upper: datetime
+
+
+async def create_partitions(
+    db: AsyncSession, parent: str, since: date, months: int
+) -> int:
+    """
+    Create the monthly partitions of `parent` from the month of `since` to `months`
+    later, the ones that don't exist yet. Returns how many were created.
+    """
+    params = {"parent": parent, "since": since, "months": months}
+    created = (await db.execute(CREATE_PARTITIONS, params)).scalar_one()
+    await db.commit()
+
+    return created
+
+
+async def is_partitioned(db: AsyncSession, parent: str) -> bool:
+    return (await db.execute(IS_PARTITIONED, {"parent": parent})).scalar_one()
+
+
+async def partition_table(
+    db: AsyncSession, table: Table, column: str, commit: bool = True
+) -> int:
+    """
+    Turn `table`, created before it was partitioned by month of `column`, into the
+    partitioned table, moving its rows. Returns how many were moved, 0 if it was
+    already partitioned.
+
+    The old table is renamed `{name}_old` with its indexes and sequences, `table`
+    created again (with its `after_create` DDL, tables its triggers write to must
+    exist) along with the partitions of the months its rows span, the rows copied
+    with their ids, the id sequence moved past them and the old table dropped. It all
+    runs in one transaction, committed at the end unless `commit` is False, with the
+    table locked until then: run it in a maintenance window and restart the app
+    afterwards.
+    """
+    name, old = table.name, f"{table.name}_old"
+
+    await db.execute(CREATE_PARTITIONS_FUNCTION)
+    if await is_partitioned(db, name):
+        return 0
+
+    relations = (await db.execute(OWNED_RELATIONS, {"table": name})).all()
+    await db.execute(text(f'ALTER TABLE "{name}" RENAME TO "{old}"'))
+    for kind, relation in relations:
+        # Index and sequence names are unique per schema, the new table reuses them.
+        await db.execute(
+            text(f'ALTER {kind} "{relation}" RENAME TO "{relation[:59]}_old"')
+        )
+
+    await db.run_sync(lambda session: table.create(session.connection()))
+
+    first, last = (
+        await db.execute(text(f'SELECT min("{column}"), max("{column}") FROM "{old}"'))
+    ).one()
+    if first is not None:
+        since, until = month_of(first), month_of(last)
+        months = (until.year - since.year) * 12 + until.month - since.month
+        await db.execute(
+            CREATE_PARTITIONS, {"parent": name, "since": since, "months": months}
+        )
+
+    columns = ", ".join(f'"{table_column.name}"' for table_column in table.columns)
+    moved = (
+        await db.execute(
+            text(f'INSERT INTO "{name}" ({columns}) SELECT {columns} FROM "{old}"')
+        )
+    ).rowcount
+
+    if (serial := table.autoincrement_column) is not None:
+        await db.execute(
+            text(
+                "SELECT setval(pg_get_serial_sequence(:table, :column), "
+                f'max("{serial.name}")) FROM "{name}"'
+            ),
+            {"table": name, "column": serial.name},
+        )
+
+    await db.execute(text(f'DROP TABLE "{old}"'))
+    if commit:
+        await db.commit()
+
+    return moved
+
+
+async def get_partitions(db: AsyncSession, parent: str) -> list[Partition]:
+    """The range partitions of `parent`, oldest first (the default one is left out)."""
+    partitions = []
+
+    for name, bound in await db.execute(PARTITIONS, {"parent": parent}):
+        if match := _BOUNDS.search(bound):
+            lower, upper = map(datetime.fromisoformat, match.groups())
+            partitions.append(Partition(name, lower, upper))
+
+    return sorted(partitions, key=lambda partition: partition.lower)
+
+
+async def drop_partition(engine: AsyncEngine, parent: str, partition: str) -> None:
+    """
+    Detach `partition` without blocking the reads and writes of `parent`
+    (`CONCURRENTLY`, which can't run in a transaction) and drop it.
+    """
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.exec_driver_sql(
+            f'ALTER TABLE "{parent}" DETACH PARTITION "{partition}" CONCURRENTLY'
+        )
+        await connection.exec_driver_sql(f'DROP TABLE "{partition}"')
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from asyncio import timeout
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event, exc, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.core.metrics import LATENCY_BUCKETS, Labels, registry
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import ExceptionContext
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.pool import ConnectionPoolEntry, Pool, PoolProxiedConnection
+
+
+# Engines reported by the pool gauges, by the name they are labelled with.
+_engines: dict[str, AsyncEngine] = {}
+
+checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time waiting for a pooled connection, opening it included when needed.",
+    LATENCY_BUCKETS,
+)
+checkout_timeouts = registry.counter(
+    "db_pool_checkout_timeouts",
+    "Checkouts that gave up after `pool_timeout`.",
+)
+connection_age_seconds = registry.histogram(
+    "db_pool_connection_age_seconds",
+    "Age of the connections handed out on checkout.",
+    (1, 10, 60, 300, 900, 1800, 3600, 7200),
+)
+connections_opened = registry.counter(
+    "db_pool_connections_opened", "Connections opened by the pool."
+)
+connections_closed = registry.counter(
+    "db_pool_connections_closed", "Connections closed by the pool."
+)
+connections_invalidated = registry.counter(
+    "db_pool_connections_invalidated",
+    "Connections discarded after an error, a failed pre-ping or `pool_recycle`.",
+)
+pre_ping_failures = registry.counter(
+    "db_pool_pre_ping_failures", "Checkouts whose pre-ping found the connection dead."
+)
+
+
+def _pool_gauge(read: str) -> dict[Labels, float]:
+    values = {}
+
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            values[(("pool", name),)] = getattr(pool, read)()
+
+    return values
+
+
+registry.gauge(
+    "db_pool_size", "Connections the pool keeps.", lambda: _pool_gauge("size")
+)
+registry.gauge(
+    "db_pool_checked_out",
+    "Connections in use.",
+    lambda: _pool_gauge("checkedout"),
+)
+registry.gauge(
+    "db_pool_checked_in",
+    "Idle connections in the pool.",
+    lambda: _pool_gauge("checkedin"),
+)
+registry.gauge(
+    "db_pool_overflow",
+    "Connections over `pool_size`, negative while the pool isn't full yet.",
+    lambda: _pool_gauge("overflow"),
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` that times how long each checkout waits."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = perf_counter()
+
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            checkout_timeouts.inc(pool=_pool_name(self))
+            raise
+        finally:
+            checkout_seconds.observe(perf_counter() - start, pool=_pool_name(self))
+
+
+def instrument(engine: AsyncEngine) -> None:
+    """
+    Record the pool metrics of `engine`, labelled with its `pool_logging_name`. The
+    engine must be created with `poolclass=InstrumentedPool` for the checkout latency.
+    """
+    sync_engine = engine.sync_engine
+    name = _pool_name(engine.pool)
+    _engines[name] = engine
+
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(_: Any, record: ConnectionPoolEntry) -> None:
+        record.info["connected_at"] = monotonic()
+        connections_opened.inc(pool=name)
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(
+        _: Any, record: ConnectionPoolEntry, __: PoolProxiedConnection
+    ) -> None:
+        if (connected_at := record.info.get("connected_at")) is not None:
+            connection_age_seconds.observe(monotonic() - connected_at, pool=name)
+
+    @event.listens_for(sync_engine, "close")
+    def on_close(_: Any, __: ConnectionPoolEntry) -> None:
+        connections_closed.inc(pool=name)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(_: Any, __: ConnectionPoolEntry, ___: Any) -> None:
+        connections_invalidated.inc(pool=name)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def on_error(context: ExceptionContext) -> None:
+        if context.is_pre_ping:
+            pre_ping_failures.inc(pool=name)
+
+
+def _pool_name(pool: Pool) -> str:
+    # Kept by `Pool.recreate`, unlike any attribute set on the pool.
+    return pool._orig_logging_name or "default"
+
+
+async def check_health(engine: AsyncEngine, wait: float = 2) -> dict[str, Any]:
+    """
+    Run `SELECT 1` through the pool of `engine`, giving up after `wait` seconds.
+    Returns whether it worked, how long it took and the state of the pool.
+    """
+    start = perf_counter()
+    error = None
+
+    try:
+        async with timeout(wait), engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        error = repr(e)
+
+    pool = engine.pool
+    health: dict[str, Any] = {
+        "ok": error is None,
+        "latencyMs": round((perf_counter() - start) * 1000, 2),
+        "pool": pool.status(),
+    }
+
+    if error is not None:
+        health["error"] = error
+
+    return health
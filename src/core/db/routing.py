@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+from functools import cache
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Mapper, Session, SessionTransactionOrigin
+from sqlalchemy.sql import ClauseElement
+
+from .cache import table_versions
+
+
+# `bind_arguments` key the DAO reads send with the table they read.
+REPLICA = "replica"
+# `Session.info` key set once the session writes, reads stay on the primary after it.
+_WROTE = "wrote"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads marked with `bind_arguments={REPLICA: table}` (the DAO
+    read methods) to one of `replicas`, everything else goes to the primary `bind`.
+
+    Marked reads still go to the primary:
+    - after the session wrote anything (flush or `INSERT/UPDATE/DELETE`), so a request
+      reads its own writes, even uncommitted ones.
+    - inside transactions begun explicitly (`db.begin()`, `db.begin_nested()`) and
+      for locking reads (`FOR UPDATE/SHARE`), so what is read to be written back
+      isn't lagging behind.
+    - for `replica_window` seconds after this process wrote to the table, covering the
+      replication lag for the requests that follow a write.
+    - when `db.info["primary"]` is set, for reads that can't afford any lag.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        replicas: Sequence[Engine] = (),
+        replica_window: float = 0,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.replica_window = replica_window
+
+    def get_bind(
+        self,
+        mapper: Mapper[Any] | type[Any] | None = None,
+        *,
+        clause: ClauseElement | None = None,
+        replica: str | None = None,
+        **kwargs: Any,
+    ) -> Engine:
+        if (
+            self._flushing
+            or getattr(clause, "is_dml", False)
+            or getattr(clause, "_for_update_arg", None) is not None
+            or self._in_explicit_transaction()
+        ):
+            self.info[_WROTE] = True
+        elif replica is not None and self.replicas and self._may_lag(replica):
+            return random.choice(self.replicas)
+
+        return super().get_bind(mapper, clause=clause, **kwargs)  # type: ignore[return-value]
+
+    def _in_explicit_transaction(self) -> bool:
+        transaction = self.get_nested_transaction() or self.get_transaction()
+        return (
+            transaction is not None
+            and transaction.origin is not SessionTransactionOrigin.AUTOBEGIN
+        )
+
+    def _may_lag(self, table: str) -> bool:
+        return not (
+            self.info.get(_WROTE)
+            or self.info.get("primary")
+            or table_versions.written_within(table, self.replica_window)
+        )
+
+
+@cache
+def async_engine(bind: Engine) -> AsyncEngine:
+    """`AsyncEngine` of an engine `RoutingSession.get_bind` returned, made once."""
+    return AsyncEngine(bind)
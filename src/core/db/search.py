@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any
+
+from sqlalchemy import DDL, Computed, Index, cast, event, func
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.orm import InstrumentedAttribute, MappedColumn, mapped_column
+from sqlalchemy.sql import ColumnElement
+
+from .model import Base
+
+
+# `gin_trgm_ops` indexes need the extension, created along with the tables.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+class SearchBackend(ABC):
+    """
+    How a `Search` filter matches a field, see `DAO.search_fields`.
+
+    `where` builds the predicate, `rank` an optional relevance expression the results
+    are ordered by (descending) when no ordering is asked for, before the default one.
+    """
+
+    @abstractmethod
+    def where(self, model: type[Base], field: str, value: str) -> ColumnElement[bool]:
+        pass
+
+    def rank(self, model: type[Base], field: str, value: str) -> ColumnElement | None:
+        return None
+
+
+class ILikeSearch(SearchBackend):
+    """
+    Case insensitive substring match, `ILIKE '%value%'`.
+
+    Without an index it scans the whole table, with a `trigram_index` on the column
+    Postgres resolves it with a bitmap index scan.
+    """
+
+    def where(self, model: type[Base], field: str, value: str) -> ColumnElement[bool]:
+        return _field(model, field).ilike(f"%{_escape_like(value)}%", escape="/")
+
+
+class TrigramSearch(ILikeSearch):
+    """Substring match served by a `trigram_index`, ranked by trigram similarity."""
+
+    def rank(self, model: type[Base], field: str, value: str) -> ColumnElement:
+        return func.word_similarity(value, _field(model, field))
+
+
+class FullTextSearch(SearchBackend):
+    """
+    Full text match on a `search_vector` column, ranked with `ts_rank_cd`.
+
+    `value` is parsed with `websearch_to_tsquery`, so it accepts quoted phrases, `or`
+    and `-excluded` words. The vector may cover more columns than the searched field.
+    """
+
+    def __init__(self, vector: str = "search_vector", config: str = "simple") -> None:
+        self.vector = vector
+        self.config = config
+
+    def where(self, model: type[Base], field: str, value: str) -> ColumnElement[bool]:
+        return _field(model, self.vector).op("@@")(self._query(value))
+
+    def rank(self, model: type[Base], field: str, value: str) -> ColumnElement:
+        return func.ts_rank_cd(_field(model, self.vector), self._query(value))
+
+    def _query(self, value: str) -> ColumnElement:
+        return func.websearch_to_tsquery(cast(self.config, REGCONFIG), value)
+
+
+def search_vector(*columns: str, config: str = "simple") -> MappedColumn[Any]:
+    """
+    Stored generated `tsvector` of `columns`, kept up to date by Postgres itself.
+    Deferred, it is only read by the search predicates.
+    """
+    document = " || ' ' || ".join(f"coalesce({column}, '')" for column in columns)
+
+    return mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{config}'::regconfig, {document})", persisted=True),
+        init=False,
+        repr=False,
+        deferred=True,
+    )
+
+
+def search_index(table: str, vector: str = "search_vector") -> Index:
+    """GIN index of a `search_vector` column."""
+    return Index(f"ix_{table}_{vector}", vector, postgresql_using="gin")
+
+
+def trigram_index(table: str, column: str) -> Index:
+    """GIN `pg_trgm` index for `ILIKE '%value%'` searches on `column`."""
+    return Index(
+        f"ix_{table}_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    )
+
+
+def _field(model: type[Base], field: str) -> InstrumentedAttribute:
+    return getattr(model, field)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
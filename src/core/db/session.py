@@ -1,60 +1,162 @@
 from asyncio import current_task
-from datetime import datetime
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone, tzinfo
 from typing import Any
 
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     async_scoped_session,
     async_sessionmaker,
     create_async_engine,
 )
 
 from src.core.constants import TZ
+from src.core.db.dao import DAO
+from src.core.db.pool import InstrumentedPool, instrument
+from src.core.db.routing import RoutingSession
+from src.core.db.warmup import statement_name, statement_warmup
 from src.core.utils import deserialize_object, serialize_object
 from src.settings import db_settings
 
 
-engine = create_async_engine(
-    db_settings.url,
-    json_serializer=serialize_object,
-    json_deserializer=deserialize_object,
-    pool_size=db_settings.pool_size,
-    pool_timeout=db_settings.pool_timeout,
-    pool_recycle=db_settings.pool_recycle,
-    max_overflow=db_settings.pool_overflow,
-    pool_use_lifo=True,
-    pool_pre_ping=True,
-)
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
-AsyncScopedSession = async_scoped_session(async_session_factory, scopefunc=current_task)
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        json_serializer=serialize_object,
+        json_deserializer=deserialize_object,
+        pool_size=db_settings.pool_size,
+        pool_timeout=db_settings.pool_timeout,
+        pool_recycle=db_settings.pool_recycle,
+        max_overflow=db_settings.pool_overflow,
+        pool_use_lifo=True,
+        pool_pre_ping=True,
+        poolclass=InstrumentedPool,
+        pool_logging_name=name,
+        connect_args={
+            # SQLAlchemy's cache of prepared statements, per connection.
+            "prepared_statement_cache_size": db_settings.statement_cache_size,
+            "prepared_statement_name_func": statement_name,
+            # asyncpg's own, used by what runs on the driver (`COPY`...).
+            "statement_cache_size": db_settings.statement_cache_size,
+            "max_cached_statement_lifetime": db_settings.statement_cache_lifetime,
+        },
+    )
+    event.listen(engine.sync_engine, "connect", _sqla_on_connect)
+    if db_settings.statement_warmup:
+        event.listen(engine.sync_engine, "connect", statement_warmup.warm)
+    instrument(engine)
+
+    return engine
+
+
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def timestamptz_codec(
+    tz: tzinfo,
+) -> tuple[Callable[[Any], tuple[int]], Callable[[tuple[int]], datetime]]:
+    """
+    Encoder and decoder of `timestamptz` in asyncpg's `tuple` format (microseconds
+    since 2000-01-01 UTC) that read the values in `tz`.
+
+    The decoder adds the microseconds to the epoch already labelled with `tz`, still
+    holding the UTC wall time, and lets `tz.fromutc` do the conversion: no UTC datetime
+    in between as `astimezone` needs. Fixed offsets (UTC included) need no conversion
+    at all, the epoch is shifted once.
+    """
+
+    def encoder(v: float | str | datetime | None) -> tuple[int]:
+        if isinstance(v, int | float):
+            v = datetime.fromtimestamp(v, tz=tz)
+        elif isinstance(v, str):
+            v = datetime.fromisoformat(v)
+        elif not isinstance(v, datetime):
+            raise ValueError
+
+        if v.tzinfo is None:
+            v = v.astimezone(tz)
+
+        return ((v - _PG_EPOCH) // _MICROSECOND,)
+
+    if isinstance(tz, timezone):
+        epoch = _PG_EPOCH.astimezone(tz)
+
+        def decoder(v: tuple[int]) -> datetime:
+            return epoch + timedelta(0, 0, v[0])
+
+    else:
+        local_epoch = _PG_EPOCH.replace(tzinfo=tz)
+        fromutc = tz.fromutc
+
+        def decoder(v: tuple[int]) -> datetime:
+            return fromutc(local_epoch + timedelta(0, 0, v[0]))
+
+    return encoder, decoder
+
+
+# `TZ` is resolved once, every connection shares the same codec.
+_timestamptz_encoder, _timestamptz_decoder = timestamptz_codec(TZ)
 
 
-@event.listens_for(engine.sync_engine, "connect")
 def _sqla_on_connect(dbapi_connection: Any, _: Any) -> Any:
     """
     Asyncpg always return the binary format of a datetime with timezone that is always in UTC.
     set the type codec to read dates in the desired timezone.
 
+    The codec uses the `tuple` format (microseconds since 2000-01-01 UTC) instead of
+    `text`: binary `COPY` (see `DAO.bulk_create`) refuses types without a binary encoder.
+
     references:
     https://github.com/MagicStack/asyncpg/issues/481 (see @uuip answer)
     https://magicstack.github.io/asyncpg/current/api/index.html#asyncpg.connection.Connection.set_type_codec
     """
-
-    def timestamptz_encoder(v: float | str | datetime | None) -> datetime:
-        if isinstance(v, int | float):
-            return datetime.fromtimestamp(v, tz=TZ).isoformat()
-        if isinstance(v, datetime):
-            return v.astimezone(TZ).isoformat()
-        if isinstance(v, str):
-            return datetime.fromisoformat(v).astimezone(TZ).isoformat()
-
-        raise ValueError
-
     dbapi_connection.await_(
         dbapi_connection.driver_connection.set_type_codec(
             schema="pg_catalog",
             typename="timestamptz",
-            encoder=timestamptz_encoder,
-            decoder=lambda x: datetime.fromisoformat(x).astimezone(TZ),
+            encoder=_timestamptz_encoder,
+            decoder=_timestamptz_decoder,
+            format="tuple",
         ),
     )
+
+
+engine = _create_engine(db_settings.url, "primary")
+replica_engines = [
+    _create_engine(url, f"replica{n}")
+    for n, url in enumerate(db_settings.replica_urls, 1)
+]
+async_session_factory = async_sessionmaker(
+    engine,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+    replicas=[replica.sync_engine for replica in replica_engines],
+    replica_window=db_settings.replica_window,
+)
+AsyncScopedSession = async_scoped_session(async_session_factory, scopefunc=current_task)
+
+
+async def warm_connections() -> None:
+    """
+    Prepare the hottest statements of every DAO on `pool_size` connections of each
+    engine, new connections (overflow, recycled) prepare them when opened.
+    """
+    if not db_settings.statement_warmup:
+        return
+
+    statements = [
+        statement for dao in DAO.instances for statement in dao.warmup_statements()
+    ]
+    # Beyond the cache size they would push each other out.
+    statements = statements[: db_settings.statement_cache_size]
+
+    # The dialect is only fully initialized after the first connection.
+    async with engine.connect():
+        pass
+
+    statement_warmup.compile(engine.dialect, statements)
+
+    for each in (engine, *replica_engines):
+        await statement_warmup.warm_pool(each, db_settings.pool_size)
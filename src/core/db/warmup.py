@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from contextlib import AsyncExitStack
+from itertools import count
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from src.core.metrics import LATENCY_BUCKETS, registry
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Dialect
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.pool import ConnectionPoolEntry, PoolProxiedConnection
+    from sqlalchemy.sql import Executable
+
+
+logger = logging.getLogger(__name__)
+# `ConnectionPoolEntry.info` key of the warmup a connection went through.
+_WARMED = "warmed"
+_names = count()
+
+statements_prepared = registry.counter(
+    "db_statements_prepared",
+    "Statements prepared by Postgres, the ones in the connection caches are reused.",
+)
+warmup_seconds = registry.histogram(
+    "db_statement_warmup_seconds",
+    "Time preparing the warmup statements on a new connection.",
+    LATENCY_BUCKETS,
+)
+
+
+def statement_name() -> str:
+    """
+    `prepared_statement_name_func` of the engines, SQLAlchemy calls it once for every
+    statement it prepares, which is what `statements_prepared` counts.
+    """
+    statements_prepared.inc()
+    return f"__asyncpg_stmt_{next(_names)}__"
+
+
+class StatementWarmup:
+    """
+    SQL of the hottest statements, run on every new pooled connection with parameters
+    that match no rows so they are parsed, planned and kept in the connection's
+    prepared statement cache before the first request needs them.
+
+    `compile` renders them as the engine would (the prepared statement cache is keyed
+    by the SQL string) and `warm` runs them on a DBAPI connection, from the `connect`
+    pool event or `warm_pool` at startup.
+    """
+
+    def __init__(self) -> None:
+        self._statements: list[tuple[str, tuple[Any, ...]]] = []
+        self._version = 0
+
+    def compile(
+        self,
+        dialect: Dialect,
+        statements: Iterable[tuple[Executable, dict[str, Any]]],
+    ) -> None:
+        compiled_statements = []
+
+        for statement, params in statements:
+            compiled = statement.compile(dialect=dialect)
+            values = compiled.construct_params(params)
+            compiled_statements.append(
+                (
+                    compiled.string,
+                    tuple(values[name] for name in compiled.positiontup or ()),
+                )
+            )
+
+        self._statements = compiled_statements
+        self._version += 1
+
+    def warm(
+        self,
+        dbapi_connection: Any,
+        record: ConnectionPoolEntry | PoolProxiedConnection,
+    ) -> None:
+        if not self._statements or record.info.get(_WARMED) == self._version:
+            return
+
+        start = perf_counter()
+        cursor = dbapi_connection.cursor()
+
+        try:
+            for sql, parameters in self._statements:
+                try:
+                    cursor.execute(sql, parameters)
+                except Exception:
+                    # A stale statement must not keep the connection from being used,
+                    # nor the statements after it from being prepared. The failure
+                    # aborts the transaction, the next statement runs in a new one.
+                    logger.warning("Statement warmup failed for %s", sql, exc_info=True)
+                    dbapi_connection.rollback()
+        finally:
+            cursor.close()
+            dbapi_connection.rollback()
+
+        record.info[_WARMED] = self._version
+        warmup_seconds.observe(perf_counter() - start)
+
+    async def warm_pool(self, engine: AsyncEngine, connections: int) -> None:
+        """Open (or check out) `connections` at once and warm every one of them."""
+        async with AsyncExitStack() as stack:
+            for _ in range(connections):
+                connection = await stack.enter_async_context(engine.connect())
+                raw = await connection.get_raw_connection()
+                await connection.run_sync(
+                    lambda _, raw=raw: self.warm(raw.dbapi_connection, raw)
+                )
+
+
+statement_warmup = StatementWarmup()
@@ -0,0 +1,2 @@
+from .client import HTTPClient, http_client
+from .transport import INTEGRATION, CircuitBreaker, CircuitOpenError
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+
+from httpx import AsyncClient, AsyncHTTPTransport, Limits, Request, Timeout
+
+from src.core.metrics import Labels, registry
+from src.settings import http_settings
+from src.settings.http_settings import HTTPSettings
+
+from .transport import INTEGRATION, ResilientTransport
+
+
+class HTTPClient:
+    """
+    Outbound HTTP of the app: a single connection pool (HTTP/2 when available)
+    shared by every integration, behind `ResilientTransport`.
+
+    It's started and closed with the app, `client(integration)` gives the
+    `AsyncClient` of an integration once started, labelling its requests in the
+    metrics. Those clients share the pool, they must not be closed on their own.
+    """
+
+    def __init__(self, settings: HTTPSettings = http_settings) -> None:
+        self.settings = settings
+        self.transport: ResilientTransport | None = None
+        self._clients: dict[str, AsyncClient] = {}
+
+    async def start(self) -> None:
+        if self.transport is not None:
+            return
+
+        settings = self.settings
+        pool = AsyncHTTPTransport(
+            verify=settings.verify,
+            http2=settings.http2 and find_spec("h2") is not None,
+            limits=Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+        )
+        self.transport = ResilientTransport(
+            pool,
+            max_per_host=settings.max_connections_per_host,
+            retries=settings.retries,
+            backoff=settings.backoff,
+            backoff_max=settings.backoff_max,
+            breaker_threshold=settings.breaker_threshold,
+            breaker_reset=settings.breaker_reset,
+        )
+
+    async def close(self) -> None:
+        if self.transport is None:
+            return
+
+        self._clients.clear()
+        await self.transport.aclose()
+        self.transport = None
+
+    def client(self, integration: str) -> AsyncClient:
+        if self.transport is None:
+            raise RuntimeError("The HTTP client isn't started.")
+
+        if (client := self._clients.get(integration)) is None:
+            settings = self.settings
+
+            async def label(request: Request) -> None:
+                request.extensions.setdefault(INTEGRATION, integration)
+
+            client = self._clients[integration] = AsyncClient(
+                transport=self.transport,
+                timeout=Timeout(
+                    settings.read_timeout,
+                    connect=settings.connect_timeout,
+                    pool=settings.pool_timeout,
+                ),
+                event_hooks={"request": [label]},
+            )
+
+        return client
+
+    def circuits_open(self) -> dict[Labels, float]:
+        return {} if self.transport is None else self.transport.circuits_open()
+
+
+http_client = HTTPClient()
+
+registry.gauge(
+    "http_client_circuit_open",
+    "Whether the circuit of each host is open (or half open).",
+    http_client.circuits_open,
+)
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import AsyncIterator, Callable
+from email.utils import parsedate_to_datetime
+from time import monotonic, perf_counter, time
+
+from httpx import AsyncBaseTransport, AsyncByteStream, Request, Response, TransportError
+
+from src.core.metrics import LATENCY_BUCKETS, Labels, registry
+
+
+# `Request.extensions` key with the name requests are labelled with in the metrics.
+INTEGRATION = "integration"
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+request_seconds = registry.histogram(
+    "http_client_request_seconds",
+    "Latency of the outbound requests until the response headers, by integration.",
+    LATENCY_BUCKETS,
+)
+requests_sent = registry.counter(
+    "http_client_requests",
+    "Outbound requests by integration and status, `error` when none came back.",
+)
+retries_made = registry.counter(
+    "http_client_retries", "Outbound requests retried, by integration."
+)
+circuit_rejections = registry.counter(
+    "http_client_circuit_rejections",
+    "Outbound requests refused without being sent because their host circuit is open.",
+)
+
+
+class CircuitOpenError(TransportError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures, refusing every request for
+    `reset_after` seconds. Then a single trial request goes through (half open),
+    closing the circuit if it works or opening it again if it doesn't. Another one is
+    let through if the trial doesn't report back within `reset_after` either.
+    """
+
+    def __init__(self, threshold: int, reset_after: float) -> None:
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if monotonic() - self._opened_at >= self.reset_after:
+            return "half_open"
+
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+
+        if state == "half_open" and (
+            self._trial_at is None or monotonic() - self._trial_at >= self.reset_after
+        ):
+            self._trial_at = monotonic()
+            return True
+
+        return state == "closed"
+
+    def success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._trial_at = None
+
+    def failure(self) -> None:
+        self.failures += 1
+        self._trial_at = None
+
+        if self.failures >= self.threshold:
+            self._opened_at = monotonic()
+
+
+class ResilientTransport(AsyncBaseTransport):
+    """
+    Wraps the transport of the shared client, bounding the requests in flight to
+    each host, retrying idempotent requests with jittered exponential backoff and
+    keeping a circuit breaker per host.
+
+    Transport errors and 5xx responses count as failures of the host. The slot of a
+    host is held until the response is closed, while its body streams.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        *,
+        max_per_host: int,
+        retries: int,
+        backoff: float,
+        backoff_max: float,
+        breaker_threshold: int,
+        breaker_reset: float,
+    ) -> None:
+        self._transport = transport
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self._slots: dict[str, asyncio.Semaphore] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    async def handle_async_request(self, request: Request) -> Response:
+        host = request.url.netloc.decode()
+        integration = request.extensions.get(INTEGRATION) or request.url.host
+        breaker = self._breaker(host)
+        attempts = 1 + (self.retries if request.method in IDEMPOTENT_METHODS else 0)
+
+        for attempt in range(attempts):
+            if not breaker.allow():
+                circuit_rejections.inc(integration=integration)
+                raise CircuitOpenError(f"Circuit open for {host}", request=request)
+
+            if attempt:
+                retries_made.inc(integration=integration)
+
+            last = attempt == attempts - 1
+            slot = self._slot(host)
+            await slot.acquire()
+            start = perf_counter()
+
+            try:
+                response = await self._transport.handle_async_request(request)
+            except TransportError:
+                slot.release()
+                breaker.failure()
+                requests_sent.inc(integration=integration, status="error")
+                if last:
+                    raise
+
+                await asyncio.sleep(self._delay(attempt))
+                continue
+            except BaseException:
+                slot.release()
+                raise
+            finally:
+                request_seconds.observe(perf_counter() - start, integration=integration)
+
+            status = response.status_code
+            requests_sent.inc(integration=integration, status=str(status))
+            if status >= 500:
+                breaker.failure()
+            else:
+                breaker.success()
+
+            if status in RETRY_STATUSES and not last:
+                await response.aclose()
+                slot.release()
+                await asyncio.sleep(self._delay(attempt, response))
+                continue
+
+            if response.is_closed:
+                # Already read, e.g. by `MockTransport`, its stream won't be closed.
+                slot.release()
+            else:
+                response.stream = _ReleasingStream(response.stream, slot.release)
+
+            return response
+
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        if (slot := self._slots.get(host)) is None:
+            slot = self._slots[host] = asyncio.Semaphore(self.max_per_host)
+
+        return slot
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        if (breaker := self.breakers.get(host)) is None:
+            breaker = self.breakers[host] = CircuitBreaker(
+                self.breaker_threshold, self.breaker_reset
+            )
+
+        return breaker
+
+    def _delay(self, attempt: int, response: Response | None = None) -> float:
+        """`Retry-After` when the server sends it, full jitter backoff otherwise."""
+        if response is not None and (after := _retry_after(response)) is not None:
+            return min(after, self.backoff_max)
+
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))
+
+    def circuits_open(self) -> dict[Labels, float]:
+        return {
+            (("host", host),): float(breaker.state != "closed")
+            for host, breaker in self.breakers.items()
+        }
+
+
+class _ReleasingStream(AsyncByteStream):
+    def __init__(self, stream: AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+def _retry_after(response: Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    if value.isdigit():
+        return float(value)
+
+    try:
+        return max(0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from math import inf
+from typing import TypeVar
+
+
+Labels = tuple[tuple[str, str], ...]
+Sample = tuple[str, Labels, float]
+_M = TypeVar("_M", bound="Metric")
+
+
+class Metric(ABC):
+    """
+    Base of the in-process metrics `registry` renders in the Prometheus text format.
+
+    Values are kept per label set, given as keyword arguments, e.g.
+    `requests.inc(route="/assets")`.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        pass
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+
+        for name, labels, value in self.samples():
+            yield f"{name}{_labels(labels)} {_value(value)}"
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def samples(self) -> Iterable[Sample]:
+        name = f"{self.name}_total"
+        return [(name, labels, value) for labels, value in self._values.items()]
+
+
+class Gauge(Metric):
+    """
+    Gauge set by hand, or read when rendered from `collect`, which returns the value
+    or a `{labels: value}` mapping.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], float | dict[Labels, float]] | None = None,
+    ) -> None:
+        super().__init__(name, documentation)
+        self._values: dict[Labels, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[tuple(sorted(labels.items()))] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> Iterable[Sample]:
+        values = self._values
+
+        if self._collect is not None:
+            collected = self._collect()
+            values = collected if isinstance(collected, dict) else {(): collected}
+
+        return [(self.name, labels, value) for labels, value in values.items()]
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Iterable[float]) -> None:
+        super().__init__(name, documentation)
+        self.buckets = (*sorted(buckets), inf)
+        self._values: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+
+        if (data := self._values.get(key)) is None:
+            data = self._values[key] = ([0] * len(self.buckets), [0.0])
+
+        counts, total = data
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> Iterable[Sample]:
+        samples = []
+
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = (*labels, ("le", _value(bound)))
+                samples.append((f"{self.name}_bucket", le, cumulative))
+
+            samples.append((f"{self.name}_sum", labels, total[0]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+
+        return samples
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: _M) -> _M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self.register(Counter(name, documentation))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], float | dict[Labels, float]] | None = None,
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, collect))
+
+    def histogram(
+        self, name: str, documentation: str, buckets: Iterable[float]
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets))
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+# Content type of `Registry.render`.
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+registry = Registry()
+
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{{{pairs}}}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _value(value: float) -> str:
+    if value == inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+
+    return repr(float(value))
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+from time import time
+from typing import TYPE_CHECKING, Any
+
+from litestar.config.response_cache import CACHE_FOREVER, default_cache_key_builder
+from litestar.connection import Request
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware import AbstractMiddleware
+from litestar.status_codes import HTTP_304_NOT_MODIFIED
+
+from src.core.db.cache import table_versions
+
+
+if TYPE_CHECKING:
+    from litestar.handlers import HTTPRouteHandler
+    from litestar.types import Message, Receive, Scope, Send
+
+
+# Route `opt` key with the tables a cached handler reads, e.g.
+# `@get("/", cache=30, opt={CACHE_TABLES: ("investment_assets",)})`.
+CACHE_TABLES = "cache_tables"
+
+
+def versioned_cache_key(request: Request[Any, Any, Any]) -> str:
+    """
+    Response cache key: method, path and query plus the version of the tables the
+    handler reads, so a DAO write on them makes the cached body unreachable.
+    """
+    return f"{default_cache_key_builder(request)}:{_versions(request.route_handler)}"
+
+
+class ETagMiddleware(AbstractMiddleware):
+    """
+    ETags and conditional GETs for handlers with `cache` and `CACHE_TABLES`.
+
+    The ETag is derived from the request and the versions of the tables, known before
+    running anything, so `If-None-Match` hits are answered with a `304` without
+    reaching the response cache or the database.
+
+    NOTE: Table versions are counted per process, the time window of the handler
+    `cache` is part of the ETag so other workers' writes are seen after at most that.
+    """
+
+    scopes = {ScopeType.HTTP}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_handler: HTTPRouteHandler = scope["route_handler"]  # type: ignore[assignment]
+
+        if (
+            scope["method"] != "GET"
+            or not route_handler.cache
+            or not route_handler.opt.get(CACHE_TABLES)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request: Request[Any, Any, Any] = Request(scope)
+        etag = _etag(request, route_handler)
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in {tag.strip() for tag in if_none_match.split(",")}:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": HTTP_304_NOT_MODIFIED,
+                    "headers": [(b"etag", etag.encode())],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                MutableScopeHeaders.from_message(message)["etag"] = etag
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def _versions(route_handler: HTTPRouteHandler) -> str:
+    tables = route_handler.opt.get(CACHE_TABLES, ())
+    return ",".join(f"{table}={table_versions.get(table)}" for table in tables)
+
+
+def _etag(request: Request[Any, Any, Any], route_handler: HTTPRouteHandler) -> str:
+    ttl = route_handler.cache
+    if ttl is True:
+        ttl = request.app.response_cache_config.default_expiration
+
+    window = "" if ttl is CACHE_FOREVER or not ttl else str(int(time() // ttl))
+
+    key = f"{default_cache_key_builder(request)}:{_versions(route_handler)}:{window}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}"'
@@ -1 +1,2 @@
+from .encoder import SchemaEncoder, encoder_for, json_response
 from .schema_base import BaseModel
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from functools import cache
+from types import UnionType
+from typing import Any, Union, get_args, get_origin
+
+from litestar import Response
+from litestar.enums import MediaType
+from litestar.status_codes import HTTP_200_OK
+
+from src.core.utils.serialization import encode_json
+
+from .schema_base import BaseModel
+
+
+_Field = tuple[str, str, Callable[[Any, Any], Any] | None]
+
+
+class SchemaEncoder:
+    """
+    Turns ORM entities, or the rows `DAO.get_multi(..., columns=...)` projects, into
+    what `schema.model_validate(obj).model_dump(mode="json", by_alias=True)` would
+    give, without validating or building the models.
+
+    The field map (attribute, camelCase alias and nested encoder) is computed once
+    per schema, see `encoder_for`. Values are taken as they come from the database,
+    so it is only meant for response schemas whose fields mirror the model columns.
+    Fields missing in `obj` are encoded as `null`.
+
+    Schemas with validators, serializers or computed fields, which may read the
+    `context`, are still validated and dumped by pydantic.
+    """
+
+    __slots__ = ("_fields", "_schema", "_validated")
+
+    def __init__(self, schema: type[BaseModel]) -> None:
+        self._schema = schema
+        self._validated = _has_hooks(schema)
+        self._fields: tuple[_Field, ...] = tuple(
+            (
+                name,
+                field.serialization_alias or field.alias or name,
+                _nested(field.annotation),
+            )
+            for name, field in schema.model_fields.items()
+            if not field.exclude
+        )
+
+    def to_dict(self, obj: Any, context: Any = None) -> dict[str, Any]:
+        if self._validated:
+            return self._schema.model_validate(obj, context=context).model_dump(
+                mode="json", by_alias=True, context=context
+            )
+
+        data = {}
+
+        for name, alias, nested in self._fields:
+            value = getattr(obj, name, None)
+            data[alias] = (
+                nested(value, context) if nested and value is not None else value
+            )
+
+        return data
+
+    def encode(self, obj: Any, context: Any = None) -> bytes:
+        return encode_json(self.to_dict(obj, context))
+
+    def encode_many(self, objs: Iterable[Any], context: Any = None) -> bytes:
+        to_dict = self.to_dict
+        return encode_json([to_dict(obj, context) for obj in objs])
+
+
+@cache
+def encoder_for(schema: type[BaseModel]) -> SchemaEncoder:
+    return SchemaEncoder(schema)
+
+
+def json_response(
+    schema: type[BaseModel],
+    data: Iterable[Any] | Any,
+    *,
+    many: bool = True,
+    context: Any = None,
+    headers: dict[str, str] | None = None,
+    status_code: int = HTTP_200_OK,
+) -> Response[bytes]:
+    """
+    Response with `data` already encoded as JSON following `schema`, Litestar sends
+    the bytes as they are. `context` is passed to the schema validators and
+    serializers, as `model_validate(..., context=...)` does.
+
+    Example:
+        return json_response(
+            AssetPriceResponse, data, context=state.settings, headers=headers
+        )
+    """
+    encoder = encoder_for(schema)
+    content = (
+        encoder.encode_many(data, context) if many else encoder.encode(data, context)
+    )
+
+    return Response(
+        content,
+        headers=headers,
+        media_type=MediaType.JSON,
+        status_code=status_code,
+    )
+
+
+def _has_hooks(schema: type[BaseModel]) -> bool:
+    decorators = schema.__pydantic_decorators__
+
+    return bool(
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.field_serializers
+        or decorators.model_serializers
+        or decorators.model_validators
+        or decorators.computed_fields
+    )
+
+
+def _nested(annotation: Any) -> Callable[[Any, Any], Any] | None:
+    """Encoder for fields holding schemas, `X`, `list[X]` or optional ones."""
+    origin = get_origin(annotation)
+
+    if origin is Union or origin is UnionType:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested(args[0]) if len(args) == 1 else None
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        # Looked up on use, schemas can refer to themselves.
+        return lambda value, context: encoder_for(annotation).to_dict(value, context)
+
+    if origin in (list, tuple, set, frozenset) and (args := get_args(annotation)):
+        item = _nested(args[0])
+        if item is not None:
+            return lambda values, context: [item(value, context) for value in values]
+
+    return None
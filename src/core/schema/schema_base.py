@@ -1,10 +1,15 @@
 from enum import Enum, EnumMeta
+from typing import ClassVar
 
 from pydantic import BaseModel as _BaseModel
 from pydantic.alias_generators import to_camel
 
 
 class BaseModel(_BaseModel):
+    # Model columns the schema reads, the DAO loads only these when given the schema
+    # as `fields`. `None` means the ones named like its fields.
+    __columns__: ClassVar[tuple[str, ...] | None] = None
+
     model_config = {
         "str_strip_whitespace": True,
         "from_attributes": True,
@@ -0,0 +1 @@
+from .guards import API_KEY_HEADER, api_key_guard
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from hmac import compare_digest
+
+from litestar.connection import ASGIConnection
+from litestar.exceptions import NotAuthorizedException
+from litestar.handlers.base import BaseRouteHandler
+
+from src.settings import api_settings
+
+
+API_KEY_HEADER = "X-API-Key"
+
+
+def api_key_guard(connection: ASGIConnection, _: BaseRouteHandler) -> None:
+    """
+    Lets in the requests sending the `API_KEY` in the `X-API-Key` header, none when
+    it isn't set.
+    """
+    api_key = connection.headers.get(API_KEY_HEADER)
+
+    if not api_settings.API_KEY or not compare_digest(
+        (api_key or "").encode(), api_settings.API_KEY.encode()
+    ):
+        raise NotAuthorizedException(detail="Invalid API key")
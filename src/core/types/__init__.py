@@ -1,2 +1,2 @@
 from .sentinels import EMPTY, EMPTY_TYPE, MISSING, MISSING_TYPE
-from .sqlalchemy import Kwargs, StrategyOptions
+from .sqlalchemy import CountStrategy, Kwargs, StrategyOptions
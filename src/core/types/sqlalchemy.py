@@ -21,6 +21,9 @@ StrategyOptions = Literal[
 ]
 
 
+CountStrategy = Literal["exact", "concurrent", "window", "estimated", "skip"]
+
+
 class KnownExecutionOptions(TypedDict, total=False):
     compiled_cache: dict[str, Literal["compiled"]] | None
     logging_token: str
@@ -10,5 +10,6 @@ from .helpers import (
 from .serialization import (
     add_timezone_to_datetime,
     deserialize_object,
+    encode_json,
     serialize_object,
 )
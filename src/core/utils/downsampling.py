@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from operator import itemgetter
+from typing import Any, Generic, TypeVar
+
+
+_T = TypeVar("_T")
+
+
+class LTTB(Generic[_T]):
+    """
+    Largest-Triangle-Three-Buckets downsampling of a line to at most `threshold`
+    points, keeping its visual shape (peaks and drops survive, unlike averaging).
+
+    Points must come ordered by `x`. The buckets split `[start, end]` in equal
+    ranges of `x` instead of equal numbers of points, so points are fed one by one
+    (`add`, `extend`) and only two buckets are kept in memory, e.g. while streaming
+    rows from the database. Empty ranges give no point, so gappy series come back
+    with fewer points than `threshold`.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        start: float,
+        end: float,
+        x: Callable[[_T], float] = itemgetter(0),
+        y: Callable[[_T], float] = itemgetter(1),
+    ) -> None:
+        if threshold < 3:
+            raise ValueError("The threshold must be at least 3 points.")
+
+        self.threshold = threshold
+        self.start = start
+        self.x = x
+        self.y = y
+        # The first and last points are always kept, the rest is one per bucket.
+        self._buckets = threshold - 2
+        self._width = (end - start) / self._buckets or 1
+        self._selected: list[_T] = []
+        self._current: list[_T] = []
+        self._current_index = -1
+        self._next: list[_T] = []
+        self._next_index = -1
+
+    def add(self, point: _T) -> None:
+        if not self._selected:
+            self._selected.append(point)
+            return
+
+        index = min(int((self.x(point) - self.start) / self._width), self._buckets - 1)
+
+        if not self._current or index == self._current_index:
+            self._current.append(point)
+            self._current_index = index
+        elif not self._next or index == self._next_index:
+            self._next.append(point)
+            self._next_index = index
+        else:
+            self._select(self._average(self._next))
+            self._current, self._current_index = self._next, self._next_index
+            self._next, self._next_index = [point], index
+
+    def extend(self, points: Iterable[_T]) -> None:
+        for point in points:
+            self.add(point)
+
+    def result(self) -> list[_T]:
+        selected = self._selected[:]
+        current, following = self._current[:], self._next[:]
+
+        if following:
+            selected.append(
+                self._largest(selected[-1], current, self._average(following))
+            )
+            current = following
+
+        if current:
+            last = current.pop()
+            if current:
+                point = (self.x(last), self.y(last))
+                selected.append(self._largest(selected[-1], current, point))
+
+            selected.append(last)
+
+        return selected
+
+    def _select(self, following: tuple[float, float]) -> None:
+        self._selected.append(
+            self._largest(self._selected[-1], self._current, following)
+        )
+
+    def _largest(
+        self, previous: _T, bucket: list[_T], following: tuple[float, float]
+    ) -> _T:
+        """Point of `bucket` making the largest triangle with its neighbours."""
+        ax, ay = self.x(previous), self.y(previous)
+        cx, cy = following
+        x, y = self.x, self.y
+
+        return max(
+            bucket,
+            key=lambda p: abs((ax - cx) * (y(p) - ay) - (ax - x(p)) * (cy - ay)),
+        )
+
+    def _average(self, bucket: list[Any]) -> tuple[float, float]:
+        return (
+            sum(map(self.x, bucket)) / len(bucket),
+            sum(map(self.y, bucket)) / len(bucket),
+        )
@@ -19,6 +19,8 @@ SEARCH_DEPENDENCY_KEY = "search_filter"
 FIELD_FILTER_DEPENDENCY_KEY = "field_filter"
 MONTH_FILTER_DEPENDENCY_KEY = "month_filter"
 ANY_FILTER_DEPENDENCY_KEY = "any_filter"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
 
 
 @dataclass
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+
+
+class TokenBucket:
+    """
+    Token bucket for asyncio: `rate` tokens per second, bursts of up to `capacity`.
+
+    `acquire` waits until there are enough tokens, waiters are served in order.
+    """
+
+    __slots__ = ("_lock", "_tokens", "_updated_at", "capacity", "rate")
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._tokens = self.capacity
+        self._updated_at = monotonic()
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: int) -> TokenBucket:
+        """Bucket for `requests` per minute, all of them can be spent at once."""
+        return cls(requests / 60, capacity=requests)
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """Take `tokens`, returns the seconds waited for them."""
+        waited = 0.0
+
+        async with self._lock:
+            while (missing := tokens - self._refill()) > 0:
+                delay = missing / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+            self._tokens -= tokens
+
+        return waited
+
+    def _refill(self) -> float:
+        now = monotonic()
+        elapsed = now - self._updated_at
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+        return self._tokens
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any
+from collections.abc import Callable
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Literal
 from uuid import UUID
 
 import orjson
-from asyncpg import pgproto
+from asyncpg.pgproto.pgproto import UUID as PgUUID
 from pydantic import BaseModel
 
 from src.core.constants import TZ
@@ -19,40 +22,82 @@ def add_timezone_to_datetime(dt: datetime) -> str:
     return dt.isoformat().replace("+00:00", "Z")
 
 
-def _serialize(value: Any) -> str:
-    """Specialized serialization function for JSON serialization."""
-    if isinstance(value, BaseModel):
-        return value.model_dump_json(by_alias=True)
+DecimalMode = Literal["str", "float"]
+# Stored JSON keeps "+00:00" offsets, as it was always written. Response bodies print
+# them as "Z", like pydantic does.
+_DB_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+_OPTIONS = _DB_OPTIONS | orjson.OPT_UTC_Z
+
+# orjson's `default` hook only gets what it can't encode natively: `Decimal`, asyncpg's
+# UUID, subclasses of the native types, models... Encoders are looked up by the exact
+# type, the first lookup of a new type walks its MRO and caches what it finds.
+_ENCODERS: dict[type, Callable[[Any], Any]] = {
+    Decimal: str,
     # for some reason asyncpg UUID doesn't equal to Python's UUID so we handle it here.
-    if isinstance(value, pgproto.UUID | UUID):
-        return str(value)
-    if isinstance(value, datetime):
-        return add_timezone_to_datetime(value)
+    PgUUID: str,
+    UUID: str,
+    datetime: add_timezone_to_datetime,
+    date: date.isoformat,
+    Enum: lambda enum: enum.value,
+    BaseModel: lambda model: model.model_dump_json(by_alias=True),
+    set: list,
+    frozenset: list,
+}
+_FLOAT_ENCODERS: dict[type, Callable[[Any], Any]] = {**_ENCODERS, Decimal: float}
+
+
+def _serializer(encoders: dict[type, Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    def serialize(value: Any) -> Any:
+        """Specialized serialization function for JSON serialization."""
+        cls = type(value)
+
+        if (encoder := encoders.get(cls)) is None:
+            encoder = next(
+                (encoders[base] for base in cls.__mro__ if base in encoders), str
+            )
+            encoders[cls] = encoder
+
+        try:
+            return encoder(value)
+        except Exception as exc:
+            raise TypeError from exc
+
+    return serialize
 
-    try:
-        val = str(value)
-    except Exception as exc:
-        raise TypeError from exc
-    else:
-        return val
+
+_DEFAULTS: dict[DecimalMode, Callable[[Any], Any]] = {
+    "str": _serializer(_ENCODERS),
+    "float": _serializer(_FLOAT_ENCODERS),
+}
 
 
 # These functions are mainly used to serialize and deserialize JSON from the database
 # instead of using the default json.dumps and json.loads of SQLAlchemy and Python.
-def serialize_object(obj: Any) -> str:
-    """Encodes a python object to a json string."""
+def serialize_object(obj: Any, *, decimals: DecimalMode = "str") -> str:
+    """
+    Encodes a python object to a json string.
+
+    `Decimal` values are encoded as strings, exact, or as numbers with `decimals="float"`.
+    """
+
+    return orjson.dumps(obj, default=_DEFAULTS[decimals], option=_DB_OPTIONS).decode()
 
-    return orjson.dumps(
-        obj,
-        default=_serialize,
-        option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
-    ).decode()
+
+def encode_json(obj: Any, *, decimals: DecimalMode = "str") -> bytes:
+    """Encodes a python object to json bytes, e.g. for response bodies."""
+
+    return orjson.dumps(obj, default=_DEFAULTS[decimals], option=_OPTIONS)
 
 
 def deserialize_object(
     obj: bytes | bytearray | memoryview | str | dict[str, Any],
 ) -> Any:
-    """Decodes an object to a python datatype."""
+    """
+    Decodes an object to a python datatype.
+
+    orjson reads `bytes`, `bytearray` and `memoryview` buffers in place, they are
+    passed as they come, never copied to a `str` first.
+    """
     if isinstance(obj, dict):
         return obj
 
@@ -1,2 +1,3 @@
 from .api_settings import api_settings, docs_config
 from .db_settings import db_settings
+from .http_settings import http_settings
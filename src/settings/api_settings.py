@@ -15,6 +15,16 @@ docs_config = OpenAPIConfig(
 class APISettings(BaseSettings):
     DEV_MODE: bool = False
     API_KEY: str | None = None
+    # Serve `/metrics` without the `API_KEY`, e.g. when only the scraper can reach it.
+    METRICS_PUBLIC: bool = False
+    # Poll the active price sources in the background, see `PriceIngestionEngine`.
+    PRICE_INGESTION: bool = False
+    # Keep the `asset_prices` partitions in the background, see `PriceMaintenance`.
+    PRICE_MAINTENANCE: bool = False
+    # Monthly `asset_prices` partitions created ahead of time, see `PriceMaintenance`.
+    PRICE_PARTITIONS_AHEAD: int = 3
+    # Months of raw prices kept, older ones only survive as daily candles. 0 keeps all.
+    PRICE_RETENTION_MONTHS: int = 0
 
     model_config: ClassVar[SettingsConfigDict] = {"env_file": ".env", "extra": "ignore"}
 
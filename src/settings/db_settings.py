@@ -5,6 +5,20 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class DatabaseSettings(BaseSettings):
     DSN: str
+    pool_size: int = 10
+    pool_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 1800
+    # Prepared statements each connection keeps, `0` disables the cache, and seconds
+    # asyncpg keeps the ones of its own cache (queries run on the driver directly).
+    statement_cache_size: int = 500
+    statement_cache_lifetime: int = 300
+    # Prepare the hottest DAO statements on every new connection.
+    statement_warmup: bool = True
+    # Read replicas, DAO reads are spread among them, see `RoutingSession`.
+    replica_dsns: list[str] = []
+    # Seconds reads of a table stay on the primary after this process writes to it.
+    replica_window: float = 5
 
     model_config: ClassVar[SettingsConfigDict] = {"env_file": ".env", "extra": "ignore"}
 
@@ -14,5 +28,9 @@ class DatabaseSettings(BaseSettings):
 
         return f"postgresql+asyncpg://{self.DSN}"
 
+    @property
+    def replica_urls(self) -> list[str]:
+        return [f"postgresql+asyncpg://{dsn}" for dsn in self.replica_dsns]
+
 
 db_settings = DatabaseSettings()
@@ -0,0 +1,35 @@
+from typing import ClassVar
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class HTTPSettings(BaseSettings):
+    """Outbound HTTP client shared by the integrations, see `src.core.http`."""
+
+    connect_timeout: float = 5
+    read_timeout: float = 15
+    pool_timeout: float = 10
+    max_connections: int = 100
+    # Requests in flight to a single host, whatever the integration sending them.
+    max_connections_per_host: int = 10
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30
+    # Used when the server supports it and `h2` is installed.
+    http2: bool = True
+    verify: bool = True
+    # Retries of idempotent requests after a transport error, a 429 or a 502-504.
+    retries: int = 2
+    backoff: float = 0.2
+    backoff_max: float = 10
+    # Consecutive failures opening the circuit of a host, and seconds it stays open.
+    breaker_threshold: int = 5
+    breaker_reset: float = 30
+
+    model_config: ClassVar[SettingsConfigDict] = {
+        "env_file": ".env",
+        "env_prefix": "HTTP_",
+        "extra": "ignore",
+    }
+
+
+http_settings = HTTPSettings()
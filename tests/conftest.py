@@ -0,0 +1,86 @@
+import importlib
+import os
+import sys
+from datetime import timezone
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+
+os.environ.setdefault("DSN", "postgres:postgres@localhost:5432/test")
+
+from src.core import constants  # noqa: E402
+
+
+def _import_or_stand_in(name: str, **attrs) -> None:
+    """
+    Import `name`, or put a module with `attrs` in its place when it can't be.
+
+    This checkout misses parts of the investments app (the asset holdings entities
+    and a model mapping the reserved `metadata` attribute, `TZ` is missing too), the
+    modules under test only need the names the tests patch anyway. With a complete
+    tree nothing is replaced.
+    """
+    try:
+        importlib.import_module(name)
+    except Exception:
+        module = ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+
+
+if not hasattr(constants, "TZ"):
+    constants.TZ = timezone.utc
+
+_import_or_stand_in(
+    "src.app.investments.application",
+    __path__=[str(Path(__file__).parents[1] / "src/app/investments/application")],
+)
+_import_or_stand_in(
+    "src.app.investments.domain.repository.daos",
+    dao_assets=SimpleNamespace(stream=None),
+    dao_asset_prices=SimpleNamespace(roll_up_daily=None),
+    dao_price_sources=SimpleNamespace(),
+)
+_import_or_stand_in(
+    "src.app.investments.application.asset_prices_cases",
+    create_asset_prices=None,
+    sync_asset_prices=None,
+)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class Clock:
+    """Fake `monotonic` clock, `sleep` moves it forward instead of waiting."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Runs the `TokenBucket`s on a `Clock`."""
+    import asyncio
+
+    from src.core.utils import rate_limit
+
+    clock = Clock()
+    monkeypatch.setattr(rate_limit, "monotonic", clock.monotonic)
+    monkeypatch.setattr(
+        rate_limit, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep)
+    )
+
+    return clock
@@ -0,0 +1,70 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.utils.downsampling import LTTB
+
+
+def sine(points: int) -> list[tuple[int, float]]:
+    return [(x, math.sin(x / 50)) for x in range(points)]
+
+
+def test_downsamples_to_threshold():
+    sampler = LTTB(10, 0, 999)
+    sampler.extend(sine(1_000))
+
+    result = sampler.result()
+
+    assert len(result) == 10
+    assert result[0] == (0, 0)
+    assert result[-1] == (999, math.sin(999 / 50))
+    assert [x for x, _ in result] == sorted(x for x, _ in result)
+
+
+def test_keeps_peaks():
+    points = sine(1_000)
+    points[500] = (500, 50)
+    sampler = LTTB(10, 0, 999)
+    sampler.extend(points)
+
+    assert (500, 50) in sampler.result()
+
+
+def test_short_series_are_kept():
+    points = [(x, x * x) for x in range(10)]
+    sampler = LTTB(10, 0, 9)
+    sampler.extend(points)
+
+    assert sampler.result() == points
+
+
+def test_gaps_give_fewer_points():
+    sampler = LTTB(12, 0, 99)
+    sampler.extend((x, 1) for x in [*range(10), *range(90, 100)])
+
+    assert len(sampler.result()) < 12
+
+
+def test_empty_and_single_point():
+    sampler = LTTB(5, 0, 9)
+    assert sampler.result() == []
+
+    sampler.add((0, 1))
+    assert sampler.result() == [(0, 1)]
+
+
+def test_accessors():
+    rows = [SimpleNamespace(at=x, price=y) for x, y in sine(100)]
+    sampler = LTTB(5, 0, 99, x=lambda row: row.at, y=lambda row: row.price)
+    sampler.extend(rows)
+
+    result = sampler.result()
+
+    assert len(result) == 5
+    assert result[0] is rows[0] and result[-1] is rows[-1]
+
+
+def test_threshold():
+    with pytest.raises(ValueError):
+        LTTB(2, 0, 1)
@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import orjson
+from pydantic import SerializationInfo, field_serializer
+
+from src.core.schema import BaseModel, encoder_for
+from src.core.utils.serialization import encode_json, serialize_object
+
+
+class Price(BaseModel):
+    asset_id: int
+    price: Decimal
+    price_date: datetime
+
+
+class Asset(BaseModel):
+    asset_name: str
+    prices: list[Price] = []
+
+
+class LocalizedAsset(BaseModel):
+    asset_name: str
+
+    @field_serializer("asset_name")
+    def _localize(self, value: str, info: SerializationInfo) -> str:
+        return f"{value} ({info.context['LANGUAGE']})" if info.context else value
+
+
+PRICE = SimpleNamespace(
+    asset_id=1,
+    price=Decimal("10.50"),
+    price_date=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+)
+
+
+def test_encode_matches_model_dump():
+    asset = SimpleNamespace(asset_name="ACME", prices=[PRICE])
+
+    expected = Asset.model_validate(asset).model_dump(mode="json", by_alias=True)
+
+    assert orjson.loads(encoder_for(Asset).encode(asset)) == expected
+
+
+def test_missing_fields_are_null():
+    data = encoder_for(Price).to_dict(SimpleNamespace(asset_id=1))
+
+    assert data == {"assetId": 1, "price": None, "priceDate": None}
+
+
+def test_context_reaches_serializers():
+    asset = SimpleNamespace(asset_name="ACME")
+
+    content = encoder_for(LocalizedAsset).encode_many([asset], {"LANGUAGE": "es"})
+
+    assert orjson.loads(content) == [{"assetName": "ACME (es)"}]
+
+
+def test_utc_offsets():
+    date = PRICE.price_date
+
+    assert encode_json(date) == b'"2024-01-02T03:04:05Z"'
+    # What is stored in JSONB columns keeps its format.
+    assert serialize_object(date) == '"2024-01-02T03:04:05+00:00"'
@@ -0,0 +1,51 @@
+import pytest
+
+from src.core.metrics import Metric, Registry
+
+
+def test_render():
+    registry = Registry()
+    requests = registry.counter("requests", "Requests served.")
+    latency = registry.histogram("latency_seconds", "Request latency.", (0.1, 1))
+    registry.gauge("pool_size", "Connections.", collect=lambda: 5)
+
+    requests.inc(route="/assets")
+    requests.inc(2, route="/assets")
+    latency.observe(0.1)
+    latency.observe(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests Requests served.",
+        "# TYPE requests counter",
+        'requests_total{route="/assets"} 3',
+        "# HELP latency_seconds Request latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1"} 2',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 0.6",
+        "latency_seconds_count 2",
+        "# HELP pool_size Connections.",
+        "# TYPE pool_size gauge",
+        "pool_size 5",
+    ]
+
+
+def test_labels_are_escaped():
+    registry = Registry()
+    registry.counter("errors", "Errors.").inc(message='say "hi"\n')
+
+    assert 'errors_total{message="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_names_are_unique():
+    registry = Registry()
+    registry.counter("requests", "Requests served.")
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests", "Requests served.")
+
+
+def test_metric_needs_samples():
+    with pytest.raises(TypeError):
+        Metric("requests", "Requests served.")
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from src.core.db.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    keyset_predicate,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Row(_Base):
+    __tablename__ = "rows"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+def sql(clause) -> str:
+    return str(
+        clause.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_cursor_round_trip():
+    date = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    cursor = encode_cursor([date, 7])
+
+    assert decode_cursor(cursor, [Row.date, Row.id]) == [date, 7]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor([1])])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, [Row.date, Row.id])
+
+
+def test_same_direction_uses_row_values():
+    predicate = keyset_predicate([Row.date, Row.id], [True, True], ["2024-01-01", 3])
+
+    assert sql(predicate) == "(rows.date, rows.id) < ('2024-01-01', 3)"
+
+
+def test_nullable_ascending_keeps_nulls_after_values():
+    predicate = keyset_predicate([Row.name, Row.id], [False, False], ["b", 3])
+
+    assert sql(predicate) == (
+        "rows.name > 'b' OR rows.name IS NULL OR rows.name = 'b' AND rows.id > 3"
+    )
+
+
+def test_nullable_after_null():
+    ascending = keyset_predicate([Row.name, Row.id], [False, False], [None, 3])
+    descending = keyset_predicate([Row.name, Row.id], [True, True], [None, 3])
+
+    assert sql(ascending) == "false OR rows.name IS NULL AND rows.id > 3"
+    assert sql(descending) == (
+        "rows.name IS NOT NULL OR rows.name IS NULL AND rows.id < 3"
+    )
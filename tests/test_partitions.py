@@ -0,0 +1,96 @@
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.db.partitions import MonthlyPartitions, month_of
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Session:
+    """Runs `create_monthly_partitions` against a set of existing months."""
+
+    def __init__(self, *months: date, partitioned: bool = True) -> None:
+        self.months = set(months)
+        self.partitioned = partitioned
+        self.calls: list[date] = []
+
+    async def execute(self, statement, params):
+        if "since" not in params:
+            return SimpleNamespace(scalar_one=lambda: self.partitioned)
+
+        since = params["since"]
+        self.calls.append(since)
+        created = since not in self.months
+        self.months.add(since)
+
+        return SimpleNamespace(scalar_one=lambda: int(created))
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def this_month() -> date:
+    return month_of(datetime.now(timezone.utc))
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (utc(2024, 3, 31, 23, 59), date(2024, 3, 1)),
+        (utc(2024, 1, 1), date(2024, 1, 1)),
+        (
+            datetime(2024, 3, 1, 1, tzinfo=timezone(timedelta(hours=2))),
+            date(2024, 2, 1),
+        ),
+    ],
+)
+def test_month_of(value, expected):
+    assert month_of(value) == expected
+
+
+async def test_creates_missing_months():
+    db = Session(date(2024, 2, 1))
+    partitions = MonthlyPartitions("prices")
+
+    dates = [utc(2024, 1, 5), utc(2024, 1, 20), utc(2024, 2, 3), utc(2023, 6, 1)]
+    created = await partitions.ensure(db, dates)
+
+    assert created == 2
+    assert sorted(db.calls) == [date(2023, 6, 1), date(2024, 1, 1), date(2024, 2, 1)]
+
+
+async def test_remembers_recent_months():
+    month = this_month()
+    db = Session(month)
+    partitions = MonthlyPartitions("prices")
+    now = datetime.now(timezone.utc)
+
+    await partitions.ensure(db, [now])
+    await partitions.ensure(db, [now])
+
+    assert db.calls == [month]
+
+
+async def test_checks_new_and_old_months_again():
+    db = Session()
+    partitions = MonthlyPartitions("prices")
+    now, old = datetime.now(timezone.utc), utc(2020, 1, 1)
+
+    # New partitions may still be rolled back, old ones dropped by the retention.
+    assert await partitions.ensure(db, [now, old]) == 2
+    assert await partitions.ensure(db, [now, old]) == 0
+    assert await partitions.ensure(db, [now, old]) == 0
+
+    assert db.calls.count(this_month()) == 2
+    assert db.calls.count(date(2020, 1, 1)) == 3
+
+
+async def test_skips_unpartitioned_tables():
+    db = Session(partitioned=False)
+
+    assert await MonthlyPartitions("prices").ensure(db, [utc(2020, 1, 1)]) == 0
+    assert db.calls == []
@@ -0,0 +1,294 @@
+import json
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+
+from src.app.investments.application import price_ingestion
+from src.app.investments.application.price_ingestion import (
+    PriceIngestionEngine,
+    SourceConfig,
+    _timestamp,
+    ingestion_requests,
+    poll_seconds,
+    prices_ingested,
+)
+from src.core.db.bulk import UpsertResult
+from src.core.db.exceptions import DatabaseConstraintError
+
+
+SYMBOLS = ("BTC", "ETH", "SOL", "ADA", "DOT")
+NOW = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+class PriceServer(ThreadingHTTPServer):
+    """Stub price source, `GET /v1/quotes?symbols=A,B` answers the known symbols."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.prices = {
+            symbol: (n + 1, NOW.timestamp()) for n, symbol in enumerate(SYMBOLS)
+        }
+        self.requests: list[tuple[list[str], str | None]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: PriceServer
+
+    def do_GET(self) -> None:
+        symbols = parse_qs(urlparse(self.path).query)["symbols"][0].split(",")
+        self.server.requests.append((symbols, self.headers.get("X-API-Key")))
+
+        body = json.dumps(
+            {
+                "data": [
+                    {"symbol": symbol, "price": price, "timestamp": timestamp}
+                    for symbol in symbols
+                    if symbol in self.server.prices
+                    for price, timestamp in [self.server.prices[symbol]]
+                ]
+            }
+        ).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class Store:
+    """Stands in for `create_asset_prices` and `sync_asset_prices`."""
+
+    def __init__(self) -> None:
+        self.created: list[list[dict]] = []
+        self.synced: list[list[dict]] = []
+        self.error: Exception | None = None
+
+    async def create(self, db, rows, trusted=False):
+        rows = list(rows)
+        if self.error is not None:
+            raise self.error
+
+        self.created.append(rows)
+        return len(rows)
+
+    async def sync(self, db, rows):
+        self.synced.append(list(rows))
+        return UpsertResult(inserted=1, updated=len(self.synced[-1]) - 1)
+
+
+class Session:
+    def __init__(self) -> None:
+        self.rollbacks = 0
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def server():
+    server = PriceServer()
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = Store()
+    monkeypatch.setattr(price_ingestion, "create_asset_prices", store.create)
+    monkeypatch.setattr(price_ingestion, "sync_asset_prices", store.sync)
+
+    async def stream(db, **kwargs):
+        for n, symbol in enumerate(SYMBOLS):
+            yield SimpleNamespace(
+                id=n + 1, symbol=symbol, asset_type=SimpleNamespace(value="crypto")
+            )
+
+    monkeypatch.setattr(price_ingestion.dao_assets, "stream", stream)
+
+    return store
+
+
+@pytest.fixture
+def db():
+    return Session()
+
+
+@pytest.fixture
+async def engine(db):
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    async with httpx.AsyncClient() as client:
+        yield PriceIngestionEngine(client=client, session_factory=session_factory)
+
+
+def source(server: PriceServer, name: str, **kwargs) -> SimpleNamespace:
+    return SimpleNamespace(
+        **{
+            "id": 1,
+            "name": name,
+            "base_url": server.url,
+            "config": {"endpoint": "/v1/quotes", "batchSize": 2, "itemsPath": "data"},
+            "api_key": "secret",
+            "rate_limit": None,
+            "supported_asset_types": None,
+            "asset_mappings": None,
+            **kwargs,
+        }
+    )
+
+
+async def test_poll(server, store, engine):
+    stored = await engine.poll(source(server, "stub-poll"))
+
+    assert stored == 5
+    assert sorted(symbols for symbols, _ in server.requests) == [
+        ["BTC", "ETH"],
+        ["DOT"],
+        ["SOL", "ADA"],
+    ]
+    assert {api_key for _, api_key in server.requests} == {"secret"}
+
+    [rows] = store.created
+    assert sorted((row["asset_id"], row["price"]) for row in rows) == [
+        (n + 1, Decimal(n + 1)) for n in range(5)
+    ]
+    assert {row["price_date"] for row in rows} == {NOW}
+    assert {row["source"] for row in rows} == {"stub-poll"}
+    assert {row["currency"] for row in rows} == {"USD"}
+
+
+async def test_poll_metrics(server, store, engine):
+    await engine.poll(source(server, "stub-metrics"))
+
+    assert prices_ingested.value(source="stub-metrics") == 5
+    assert ingestion_requests.value(source="stub-metrics", outcome="ok") == 3
+    assert (
+        "price_ingestion_poll_seconds_count",
+        (("source", "stub-metrics"),),
+        1,
+    ) in poll_seconds.samples()
+
+
+async def test_poll_drops_stale_prices(server, store, engine):
+    stub = source(server, "stub-stale")
+    await engine.poll(stub)
+
+    assert await engine.poll(stub) == 0
+    assert len(store.created) == 1
+
+    server.prices["ETH"] = (3, NOW.timestamp() + 60)
+    assert await engine.poll(stub) == 1
+    assert [row["asset_id"] for row in store.created[-1]] == [2]
+
+
+async def test_poll_retries_prices_not_stored(server, store, engine):
+    stub = source(server, "stub-retry")
+    store.error = TimeoutError()
+
+    with pytest.raises(TimeoutError):
+        await engine.poll(stub)
+
+    store.error = None
+    assert await engine.poll(stub) == 5
+
+
+async def test_poll_upserts_prices_already_stored(server, store, engine, db):
+    store.error = DatabaseConstraintError("duplicate key")
+
+    assert await engine.poll(source(server, "stub-upsert")) == 5
+    assert db.rollbacks == 1
+    assert len(store.synced[0]) == 5
+
+
+async def test_poll_rate_limit(server, store, engine, clock):
+    # 2 requests at once, then one every 30 seconds.
+    await engine.poll(source(server, "stub-rate", rate_limit=2))
+
+    assert len(server.requests) == 3
+    assert clock.sleeps == [pytest.approx(30)]
+
+
+async def test_poll_errors(server, store, engine):
+    stub = source(server, "stub-errors", base_url="http://127.0.0.1:1")
+
+    assert await engine.poll(stub) == 0
+    assert ingestion_requests.value(source="stub-errors", outcome="error") == 3
+    assert store.created == []
+
+
+def test_source_config():
+    config = SourceConfig.from_source(
+        SimpleNamespace(
+            config={"batchSize": 50, "fields": {"price": "last"}, "unknown": 1}
+        )
+    )
+
+    assert config.batch_size == 50
+    assert config.fields["price"] == "last"
+    assert config.fields["symbol"] == "symbol"
+
+
+def test_source_config_items():
+    config = SourceConfig(items_path="data.quotes")
+    payload = {"data": {"quotes": [{"symbol": "BTC"}, "junk", {"symbol": "ETH"}]}}
+
+    assert list(config.items(payload)) == [{"symbol": "BTC"}, {"symbol": "ETH"}]
+    assert list(config.items({"data": None})) == []
+
+
+def test_source_config_items_by_symbol():
+    config = SourceConfig()
+    payload = {"BTC": {"price": 1}, "ETH": {"price": 2}, "status": "ok"}
+
+    assert list(config.items(payload)) == [
+        {"symbol": "BTC", "price": 1},
+        {"symbol": "ETH", "price": 2},
+    ]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ("", None),
+        (NOW.timestamp(), NOW),
+        (NOW.timestamp() * 1000, NOW),
+        ("2024-01-02T03:04:05Z", NOW),
+        ("2024-01-02T03:04:05", NOW),
+        ("2024-01-02T05:04:05+02:00", NOW),
+    ],
+)
+def test_timestamp(value, expected):
+    assert _timestamp(value) == expected
+
+
+def test_bad_timestamp():
+    with pytest.raises(ValueError):
+        _timestamp("yesterday")
@@ -0,0 +1,179 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.investments.application import price_maintenance
+from src.app.investments.application.price_maintenance import (
+    TRY_LOCK,
+    UNLOCK,
+    PriceMaintenance,
+    retention_cutoff,
+)
+from src.core.db.partitions import Partition
+from src.settings import api_settings
+
+
+NOW = datetime(2024, 3, 15, 12, tzinfo=timezone.utc)
+
+
+class Connection:
+    """Autocommit connection of the advisory lock, `locked` when another holds it."""
+
+    def __init__(self, locked: bool = False) -> None:
+        self.locked = locked
+        self.executed = []
+
+    async def execution_options(self, **options):
+        return self
+
+    async def execute(self, statement):
+        self.executed.append(statement)
+        return SimpleNamespace(scalar=lambda: not self.locked)
+
+
+class Engine:
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+
+    @asynccontextmanager
+    async def connect(self):
+        yield self.connection
+
+
+class Session:
+    def __init__(self) -> None:
+        self.commits = 0
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def partition(month: int) -> Partition:
+    return Partition(
+        name=f"asset_prices_2024_{month:02}",
+        lower=datetime(2024, month, 1, tzinfo=timezone.utc),
+        upper=datetime(2024, month + 1, 1, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = Session()
+    db.partitioned = True
+    db.rolled_up = []
+    db.dropped = []
+
+    async def is_partitioned(db, parent):
+        return db.partitioned
+
+    async def create_partitions(db, parent, since, months):
+        return 0
+
+    async def get_partitions(db, parent):
+        return [partition(1), partition(2), partition(3)]
+
+    async def drop_partition(engine, parent, name):
+        db.dropped.append(name)
+
+    async def roll_up_daily(db, since, until):
+        db.rolled_up.append((since, until))
+        return 1
+
+    monkeypatch.setattr(price_maintenance, "is_partitioned", is_partitioned)
+    monkeypatch.setattr(price_maintenance, "create_partitions", create_partitions)
+    monkeypatch.setattr(price_maintenance, "get_partitions", get_partitions)
+    monkeypatch.setattr(price_maintenance, "drop_partition", drop_partition)
+    monkeypatch.setattr(
+        price_maintenance.dao_asset_prices, "roll_up_daily", roll_up_daily
+    )
+
+    return db
+
+
+def maintenance(db, connection: Connection, retention_months: int = 0):
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    return PriceMaintenance(
+        session_factory=session_factory,
+        db_engine=Engine(connection),
+        ahead=1,
+        retention_months=retention_months,
+    )
+
+
+@pytest.mark.parametrize(
+    ("months", "expected"),
+    [
+        (1, datetime(2024, 2, 1, tzinfo=timezone.utc)),
+        (2, datetime(2024, 1, 1, tzinfo=timezone.utc)),
+        (3, datetime(2023, 12, 1, tzinfo=timezone.utc)),
+        (15, datetime(2022, 12, 1, tzinfo=timezone.utc)),
+        (24, datetime(2022, 3, 1, tzinfo=timezone.utc)),
+    ],
+)
+def test_retention_cutoff(months, expected):
+    assert retention_cutoff(months, NOW) == expected
+
+
+def test_retention_cutoff_keeps_everything():
+    assert retention_cutoff(0, NOW) is None
+
+
+def test_retention_cutoff_setting(monkeypatch):
+    monkeypatch.setattr(api_settings, "PRICE_RETENTION_MONTHS", 0)
+    assert retention_cutoff(now=NOW) is None
+
+    monkeypatch.setattr(api_settings, "PRICE_RETENTION_MONTHS", 1)
+    assert retention_cutoff(now=NOW) == datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.anyio
+async def test_run_once_holds_the_lock(db):
+    connection = Connection()
+
+    assert await maintenance(db, connection).run_once()
+    assert connection.executed == [TRY_LOCK, UNLOCK]
+    assert db.commits == 1
+
+
+@pytest.mark.anyio
+async def test_run_once_skips_when_locked(db):
+    connection = Connection(locked=True)
+
+    assert not await maintenance(db, connection).run_once()
+    assert connection.executed == [TRY_LOCK]
+    assert db.commits == 0
+
+
+@pytest.mark.anyio
+async def test_run_once_skips_unpartitioned_table(db):
+    db.partitioned = False
+    connection = Connection()
+
+    assert await maintenance(db, connection, retention_months=1).run_once()
+    assert connection.executed == [TRY_LOCK, UNLOCK]
+    assert db.rolled_up == db.dropped == []
+
+
+@pytest.mark.anyio
+async def test_drops_expired_partitions(db):
+    # The months of 2024 are past the retention of the last month.
+    expired = [partition(1), partition(2), partition(3)]
+
+    await maintenance(db, Connection(), retention_months=1).run_once()
+
+    assert db.dropped == [p.name for p in expired]
+    # Every expired month is rolled up again right before it's dropped.
+    assert db.rolled_up[1:] == [(p.lower, p.upper) for p in expired]
+
+
+@pytest.mark.anyio
+async def test_keeps_partitions_without_retention(db):
+    await maintenance(db, Connection()).run_once()
+
+    assert db.dropped == []
+    assert len(db.rolled_up) == 1
@@ -0,0 +1,44 @@
+import pytest
+
+from src.core.utils.rate_limit import TokenBucket
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_bursts_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1, capacity=3)
+
+    assert [await bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert clock.sleeps == []
+
+
+async def test_waits_for_missing_tokens(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    await bucket.acquire(2)
+
+    assert await bucket.acquire() == 0.5
+    assert clock.sleeps == [0.5]
+
+
+async def test_refills_over_time(clock):
+    bucket = TokenBucket(rate=1, capacity=2)
+    await bucket.acquire(2)
+    clock.now += 10
+
+    # Never more than the capacity.
+    assert await bucket.acquire(2) == 0
+    assert await bucket.acquire() == 1
+
+
+async def test_per_minute(clock):
+    bucket = TokenBucket.per_minute(30)
+
+    assert bucket.capacity == 30
+    await bucket.acquire(30)
+    assert await bucket.acquire() == 2
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, select
+
+from src.core.db.routing import REPLICA, RoutingSession
+
+
+prices = Table("prices", MetaData(), Column("id", Integer, primary_key=True))
+
+
+@pytest.fixture
+def primary():
+    return create_engine("sqlite://")
+
+
+@pytest.fixture
+def replica():
+    return create_engine("sqlite://")
+
+
+@pytest.fixture
+def db(primary, replica):
+    with RoutingSession(bind=primary, replicas=[replica]) as db:
+        yield db
+
+
+def read(db, statement=select(prices)):
+    return db.get_bind(clause=statement, **{REPLICA: "prices"})
+
+
+def test_marked_reads_go_to_replicas(db, primary, replica):
+    assert read(db) is replica
+    assert db.get_bind(clause=select(prices)) is primary
+
+
+def test_reads_after_a_write(db, primary):
+    db.get_bind(clause=prices.delete())
+
+    assert read(db) is primary
+
+
+def test_locking_reads(db, primary, replica):
+    assert read(db, select(prices).with_for_update()) is primary
+    assert read(db) is primary
+
+
+def test_explicit_transactions(db, primary):
+    with db.begin():
+        assert read(db) is primary
+
+
+def test_nested_transactions(db, primary, replica):
+    db.connection()
+    assert read(db) is replica
+
+    with db.begin_nested():
+        assert read(db) is primary
+
+
+def test_primary_info(db, primary):
+    db.info["primary"] = True
+
+    assert read(db) is primary
@@ -0,0 +1,31 @@
+import pytest
+from litestar import Litestar, get
+from litestar.testing import TestClient
+
+from src.core.security import API_KEY_HEADER, api_key_guard
+from src.settings import api_settings
+
+
+@get("/internal", guards=[api_key_guard])
+async def internal() -> str:
+    return "ok"
+
+
+@pytest.fixture
+def client():
+    with TestClient(Litestar(route_handlers=[internal])) as client:
+        yield client
+
+
+def test_api_key(client, monkeypatch):
+    monkeypatch.setattr(api_settings, "API_KEY", "secret")
+
+    assert client.get("/internal", headers={API_KEY_HEADER: "secret"}).text == "ok"
+    assert client.get("/internal", headers={API_KEY_HEADER: "other"}).status_code == 401
+    assert client.get("/internal").status_code == 401
+
+
+def test_without_api_key(client, monkeypatch):
+    monkeypatch.setattr(api_settings, "API_KEY", None)
+
+    assert client.get("/internal", headers={API_KEY_HEADER: ""}).status_code == 401
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from src.core.db.dao import DAO
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Ticker(_Base):
+    __tablename__ = "tickers"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String)
+
+
+class Session:
+    def __init__(self) -> None:
+        self.statements = []
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.statements.append(statement)
+        result = SimpleNamespace(all=list, scalars=lambda: SimpleNamespace(all=list))
+        return SimpleNamespace(unique=lambda: result)
+
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_ordered_pages_are_cached():
+    dao, db = DAO(Ticker), Session()
+
+    for _ in range(2):
+        await dao.get_multi(
+            db, where={"symbol": "BTC"}, ordering=[("id", False)], count_strategy="skip"
+        )
+
+    first, second = db.statements
+    assert first is second
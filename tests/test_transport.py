@@ -0,0 +1,196 @@
+import anyio
+import httpx
+import pytest
+
+from src.core.http import transport as transport_module
+from src.core.http.transport import (
+    INTEGRATION,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientTransport,
+    requests_sent,
+    retries_made,
+)
+
+
+pytestmark = pytest.mark.anyio
+
+
+class Chunks(httpx.AsyncByteStream):
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def __aiter__(self):
+        yield b"chunk"
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class Replies(httpx.AsyncBaseTransport):
+    """Answers with `replies` in turn, raising the exceptions among them."""
+
+    def __init__(self, *replies) -> None:
+        self.replies = list(replies)
+        self.requests: list[httpx.Request] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        reply = self.replies.pop(0) if len(self.replies) > 1 else self.replies[0]
+
+        if isinstance(reply, Exception):
+            raise reply
+        if isinstance(reply, httpx.Response):
+            return reply
+
+        return httpx.Response(reply)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(transport_module, "monotonic", lambda: now[0])
+    return now
+
+
+def resilient(transport, **kwargs) -> ResilientTransport:
+    return ResilientTransport(
+        transport,
+        **{
+            "max_per_host": 1,
+            "retries": 2,
+            "backoff": 0,
+            "backoff_max": 0,
+            "breaker_threshold": 3,
+            "breaker_reset": 30,
+            **kwargs,
+        },
+    )
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(threshold=2, reset_after=30)
+
+    breaker.failure()
+    assert breaker.allow()
+
+    breaker.failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_trial(clock):
+    breaker = CircuitBreaker(threshold=1, reset_after=30)
+    breaker.failure()
+    clock[0] = 30
+
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    # A single trial at a time, another one once it's overdue.
+    assert not breaker.allow()
+    clock[0] = 60
+    assert breaker.allow()
+
+
+def test_breaker_trial_outcome(clock):
+    breaker = CircuitBreaker(threshold=1, reset_after=30)
+    breaker.failure()
+    clock[0] = 30
+    breaker.allow()
+
+    breaker.failure()
+    assert breaker.state == "open"
+
+    clock[0] = 60
+    breaker.allow()
+    breaker.success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+async def test_read_responses_free_their_slot():
+    mock = httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True}))
+
+    async with httpx.AsyncClient(transport=resilient(mock)) as client:
+        with anyio.fail_after(1):
+            for _ in range(3):
+                assert (await client.get("https://prices.test/")).json() == {"ok": True}
+
+
+async def test_streamed_responses_hold_their_slot():
+    stream = Chunks()
+    transport = resilient(Replies(httpx.Response(200, stream=stream)))
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("GET", "https://prices.test/") as response:
+            assert transport._slots["prices.test"].locked()
+            assert [chunk async for chunk in response.aiter_raw()] == [b"chunk"]
+
+    assert stream.closed
+    assert not transport._slots["prices.test"].locked()
+
+
+async def test_retries_idempotent_requests():
+    replies = Replies(503, httpx.ConnectError("refused"), 200)
+    extensions = {INTEGRATION: "test-retries"}
+
+    async with httpx.AsyncClient(transport=resilient(replies)) as client:
+        response = await client.get("https://prices.test/", extensions=extensions)
+
+    assert response.status_code == 200
+    assert len(replies.requests) == 3
+    assert retries_made.value(integration="test-retries") == 2
+    assert requests_sent.value(integration="test-retries", status="503") == 1
+    assert requests_sent.value(integration="test-retries", status="error") == 1
+
+
+async def test_does_not_retry_posts():
+    replies = Replies(503, 200)
+
+    async with httpx.AsyncClient(transport=resilient(replies)) as client:
+        response = await client.post("https://prices.test/")
+
+    assert response.status_code == 503
+    assert len(replies.requests) == 1
+
+
+async def test_raises_after_the_last_retry():
+    replies = Replies(httpx.ConnectError("refused"))
+
+    async with httpx.AsyncClient(transport=resilient(replies)) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("https://prices.test/")
+
+    assert len(replies.requests) == 3
+
+
+async def test_open_circuit_refuses_requests():
+    replies = Replies(500)
+    transport = resilient(replies, retries=0, breaker_threshold=2)
+
+    with anyio.fail_after(1):
+        async with httpx.AsyncClient(transport=transport) as client:
+            for _ in range(2):
+                assert (await client.get("https://prices.test/")).status_code == 500
+
+            with pytest.raises(CircuitOpenError):
+                await client.get("https://prices.test/")
+
+            # Other hosts have their own circuit.
+            assert (await client.get("https://other.test/")).status_code == 500
+
+    assert len(replies.requests) == 3
+    assert transport.circuits_open() == {
+        (("host", "prices.test"),): 1.0,
+        (("host", "other.test"),): 0.0,
+    }
+
+
+def test_retry_after():
+    transport = resilient(Replies(200), backoff_max=60)
+    response = httpx.Response(429, headers={"Retry-After": "5"})
+
+    assert transport._delay(0, response) == 5
+    assert (
+        transport._delay(0, httpx.Response(429, headers={"Retry-After": "600"})) == 60
+    )
@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from src.core.db import dao as dao_module
+from src.core.db.dao import DAO
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Quote(_Base):
+    __tablename__ = "quotes"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    symbol: Mapped[str] = mapped_column(String, unique=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Python side default, bound for the rows that leave it out.
+    source: Mapped[str] = mapped_column(String, default="manual")
+    date_added: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class Session:
+    """Records the statements and their bound values."""
+
+    def __init__(self) -> None:
+        self.statements: list[tuple[str, dict]] = []
+
+    async def execute(self, statement):
+        compiled = statement.compile(dialect=postgresql.dialect())
+        self.statements.append((str(compiled), compiled.params))
+        return SimpleNamespace(all=list)
+
+    async def commit(self) -> None:
+        pass
+
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def dao(monkeypatch):
+    monkeypatch.setattr(dao_module, "MAX_PARAMETERS", 10)
+    return DAO(Quote)
+
+
+async def test_upsert_groups_rows_by_keys(dao):
+    db = Session()
+    rows = [
+        {"symbol": "BTC", "name": "Bitcoin"},
+        {"symbol": "ETH"},
+        {"symbol": "SOL", "name": "Solana"},
+    ]
+
+    await dao.upsert_many(db, objs_in=rows, conflict_columns=["symbol"], validate=False)
+
+    assert len(db.statements) == 2
+    named, unnamed = (sql for sql, _ in db.statements)
+    assert "name = excluded.name" in named
+    # Rows without `name` don't overwrite the stored one.
+    assert "name" not in unnamed.split("ON CONFLICT")[1]
+
+
+async def test_upsert_counts_python_defaults(dao):
+    db = Session()
+    # `symbol` plus the `source` and `date_added` defaults: 3 values per row.
+    rows = [{"symbol": f"S{n}"} for n in range(7)]
+
+    await dao.upsert_many(db, objs_in=rows, conflict_columns=["symbol"], validate=False)
+
+    assert [len(params) for _, params in db.statements] == [9, 9, 3]
+    assert all(len(params) <= 10 for _, params in db.statements)
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+from sqlalchemy import Column, Integer, MetaData, Table, select
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+from src.core.db.warmup import StatementWarmup
+
+
+prices = Table(
+    "prices",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("asset_id", Integer),
+)
+
+
+class Connection:
+    """DBAPI connection recording what runs, failing the statements in `broken`."""
+
+    def __init__(self, broken: tuple[str, ...] = ()) -> None:
+        self.broken = broken
+        self.executed: list[tuple[str, tuple]] = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return SimpleNamespace(execute=self.execute, close=lambda: None)
+
+    def execute(self, sql, parameters):
+        if any(part in sql for part in self.broken):
+            raise RuntimeError("column does not exist")
+
+        self.executed.append((sql, parameters))
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def warmup() -> StatementWarmup:
+    warmup = StatementWarmup()
+    warmup.compile(
+        PGDialect_asyncpg(),
+        [
+            (select(prices).where(prices.c.id == 0), {}),
+            (select(prices.c.asset_id).where(prices.c.asset_id == 0), {}),
+            (select(prices.c.id).where(prices.c.id > 0).limit(1), {}),
+        ],
+    )
+    return warmup
+
+
+def test_warm():
+    connection = Connection()
+    record = SimpleNamespace(info={})
+
+    warmup().warm(connection, record)
+
+    assert [parameters for _, parameters in connection.executed] == [
+        (0,),
+        (0,),
+        (0, 1),
+    ]
+    assert "$1" in connection.executed[0][0]
+    assert connection.rollbacks == 1
+
+
+def test_warm_once_per_version():
+    statements = warmup()
+    connection = Connection()
+    record = SimpleNamespace(info={})
+
+    statements.warm(connection, record)
+    statements.warm(connection, record)
+
+    assert len(connection.executed) == 3
+
+
+def test_failed_statements_are_skipped():
+    connection = Connection(broken=("WHERE prices.asset_id",))
+
+    warmup().warm(connection, SimpleNamespace(info={}))
+
+    assert len(connection.executed) == 2
+    assert connection.rollbacks == 2